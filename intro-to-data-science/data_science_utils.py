@@ -8,11 +8,38 @@ import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
+import plotly
+import plotly.offline
 import plotly.graph_objects as go
 import plotly.express as px
-from typing import Dict, List, Tuple, Any
+import plotly.io as pio
+from typing import Dict, List, Tuple, Any, Callable
 import random
+import ast
+import base64
+import contextlib
+import copy
+import functools
+import glob
+import hashlib
+import inspect
+import io
+import json
+import operator
+import os
+import pickle
+import re
+import shutil
+import sqlite3
+import stat
+import tempfile
+import tokenize
 from datetime import datetime, timedelta
+from html import escape as escape_html
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import sys
+import threading
+from collections import OrderedDict, deque
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -52,7 +79,190 @@ class DataScienceKit:
 
 class InteractiveVisualizer:
     """Create interactive visualizations for the notebook"""
-    
+
+    # Above this many points per trace, switch from SVG to WebGL rendering
+    WEBGL_THRESHOLD = 5000
+    # Points kept per series when a time series is downsampled for display
+    LTTB_TARGET_POINTS = 2000
+    # Typed-array codes understood by plotly.js for binary ("bdata") arrays
+    _BINARY_DTYPES = {
+        'float64': 'f8', 'float32': 'f4',
+        'int32': 'i4', 'int16': 'i2', 'int8': 'i1',
+        'uint32': 'u4', 'uint16': 'u2', 'uint8': 'u1'
+    }
+    # plotly.js decodes "bdata" arrays from 2.28 on, first bundled with
+    # plotly.py 5.19; older bundles get plain lists
+    BINARY_ARRAYS = tuple(int(part) for part in
+                          re.findall(r'\d+', plotly.offline.get_plotlyjs_version())[:2]) >= (2, 28)
+
+    @staticmethod
+    def scatter_trace(x, y, **kwargs):
+        """Build a Scatter trace, using WebGL (Scattergl) for large inputs"""
+        if len(x) > InteractiveVisualizer.WEBGL_THRESHOLD:
+            return go.Scattergl(x=x, y=y, **kwargs)
+        return go.Scatter(x=x, y=y, **kwargs)
+
+    @staticmethod
+    def lttb_downsample(x, y, n_out: int):
+        """
+        Largest-Triangle-Three-Buckets downsampling.
+
+        Returns the indices of the ``n_out`` points that best preserve the
+        visual shape of the (x, y) series. ``x`` must be sorted; datetimes
+        are supported.
+        """
+        x = np.asarray(x)
+        y = np.asarray(y, dtype='float64')
+        n = len(x)
+        if n_out >= n or n_out < 3:
+            return np.arange(n)
+
+        if np.issubdtype(x.dtype, np.datetime64):
+            x = x.astype('datetime64[ns]').astype('int64')
+        x = x.astype('float64')
+
+        # First and last points are always kept; the rest is split into buckets
+        edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+        selected = np.empty(n_out, dtype=np.int64)
+        selected[0] = 0
+        selected[-1] = n - 1
+
+        prev = 0
+        for i in range(n_out - 2):
+            start, end = edges[i], edges[i + 1]
+            # Average of the next bucket is the third triangle vertex
+            next_start = end
+            next_end = edges[i + 2] if i + 2 < len(edges) else n
+            avg_x = x[next_start:next_end].mean()
+            avg_y = y[next_start:next_end].mean()
+
+            area = np.abs(
+                (x[prev] - avg_x) * (y[start:end] - y[prev])
+                - (x[prev] - x[start:end]) * (avg_y - y[prev])
+            )
+            prev = start + int(np.nanargmax(area)) if not np.all(np.isnan(area)) else start
+            selected[i + 1] = prev
+
+        return selected
+
+    @staticmethod
+    def _encode_array(values):
+        """Encode a numeric array as a plotly.js typed array (a list before plotly 5.19), or return None"""
+        if not isinstance(values, np.ndarray) or values.dtype.kind not in 'biuf':
+            return None
+        if not InteractiveVisualizer.BINARY_ARRAYS:
+            return values.tolist()
+        if values.dtype.kind == 'b':
+            values = values.astype('uint8')
+        elif values.dtype == np.int64 or values.dtype == np.uint64:
+            # plotly.js has no 64-bit integer arrays
+            if len(values) and values.min() >= np.iinfo('int32').min and values.max() <= np.iinfo('int32').max:
+                values = values.astype('int32')
+            else:
+                values = values.astype('float64')
+        code = InteractiveVisualizer._BINARY_DTYPES.get(str(values.dtype))
+        if code is None:
+            values = values.astype('float64')
+            code = 'f8'
+        encoded = {
+            'dtype': code,
+            'bdata': base64.b64encode(np.ascontiguousarray(values).tobytes()).decode('ascii')
+        }
+        if values.ndim > 1:
+            encoded['shape'] = ','.join(str(s) for s in values.shape)
+        return encoded
+
+    @staticmethod
+    def encode_figure(fig):
+        """
+        Return the figure as a dict with numeric trace data base64-encoded.
+
+        Binary typed arrays are far smaller than JSON float lists, which keeps
+        notebook files small. The result can be passed to ``show_figure``.
+        """
+        def encode(node):
+            if isinstance(node, dict):
+                return {key: encode(value) for key, value in node.items()}
+            if isinstance(node, (list, tuple)):
+                return [encode(value) for value in node]
+            encoded = InteractiveVisualizer._encode_array(node)
+            return node if encoded is None else encoded
+
+        fig_dict = fig.to_dict() if hasattr(fig, 'to_dict') else fig
+        return {
+            'data': [encode(trace) for trace in fig_dict.get('data', [])],
+            'layout': fig_dict.get('layout', {})
+        }
+
+    @staticmethod
+    def show_figure(fig, **kwargs):
+        """Display a figure using binary-encoded trace data"""
+        pio.show(InteractiveVisualizer.encode_figure(fig), validate=False, **kwargs)
+
+    @staticmethod
+    def create_time_series(df, x: str, y: str, color: str = None, title: str = None,
+                           max_points: int = None):
+        """
+        Create a zoomable time-series chart that stays responsive on large data.
+
+        Each series is downsampled with LTTB to ``max_points`` for display.
+        Zooming re-runs the downsampling on the visible window, so detail
+        reappears as you zoom in. Returns a ``go.FigureWidget``.
+        """
+        if max_points is None:
+            max_points = InteractiveVisualizer.LTTB_TARGET_POINTS
+
+        x_values = df[x]
+        if x_values.dtype == object:
+            x_values = pd.to_datetime(x_values, errors='coerce')
+
+        if color is None:
+            groups = [(y, x_values, df[y])]
+        else:
+            groups = [(str(name), x_values.loc[part.index], part[y])
+                      for name, part in df.groupby(color, sort=True)]
+
+        # Keep sorted full-resolution copies for re-sampling on zoom
+        series = []
+        for name, xs, ys in groups:
+            order = np.argsort(xs.values, kind='stable')
+            series.append((name, xs.values[order], ys.values[order]))
+
+        def window(xs, ys, lo=None, hi=None):
+            start = 0 if lo is None else np.searchsorted(xs, lo, side='left')
+            end = len(xs) if hi is None else np.searchsorted(xs, hi, side='right')
+            xs, ys = xs[start:end], ys[start:end]
+            keep = InteractiveVisualizer.lttb_downsample(xs, ys, max_points)
+            return xs[keep], ys[keep]
+
+        traces = []
+        for name, xs, ys in series:
+            wx, wy = window(xs, ys)
+            traces.append(InteractiveVisualizer.scatter_trace(wx, wy, mode='lines', name=name))
+
+        fig = go.FigureWidget(data=traces)
+        fig.update_layout(
+            title=title or f'{y} over {x}',
+            xaxis_title=x,
+            yaxis_title=y,
+            showlegend=color is not None
+        )
+
+        def on_zoom(layout, x_range):
+            if x_range is None or fig.layout.xaxis.autorange:
+                lo = hi = None
+            else:
+                lo, hi = x_range
+                if np.issubdtype(series[0][1].dtype, np.datetime64):
+                    lo, hi = np.datetime64(pd.Timestamp(lo)), np.datetime64(pd.Timestamp(hi))
+            with fig.batch_update():
+                for trace, (name, xs, ys) in zip(fig.data, series):
+                    wx, wy = window(xs, ys, lo, hi)
+                    trace.x, trace.y = wx, wy
+
+        fig.layout.xaxis.on_change(on_zoom, 'range')
+        return fig
+
     @staticmethod
     def create_word_cloud_data(words: List[str], frequencies: List[int]):
         """Generate data for word cloud visualization"""
@@ -235,62 +445,584 @@ class DataGenerator:
 class ExerciseValidator:
     """Validate student exercise submissions"""
     
+    # Parsed submissions keyed by source hash: facts found in the AST plus the
+    # code's token text without comments and strings
+    PARSE_CACHE_SIZE = 4096
+    _parse_cache = OrderedDict()
+    _parse_lock = threading.Lock()
+    
+    # Mime type of plotly figures in notebook output cells
+    PLOTLY_MIME = 'application/vnd.plotly.v1+json'
+    
+    # Statement/expression keywords a requirement can name directly
+    CONSTRUCTS = {
+        ast.For: 'for', ast.AsyncFor: 'for', ast.comprehension: 'for', ast.While: 'while',
+        ast.If: 'if', ast.IfExp: 'if', ast.Try: 'try', ast.With: 'with', ast.AsyncWith: 'with',
+        ast.Lambda: 'lambda', ast.Return: 'return', ast.Yield: 'yield', ast.YieldFrom: 'yield',
+        ast.Await: 'await', ast.Assert: 'assert', ast.Raise: 'raise', ast.Global: 'global',
+        ast.ListComp: 'comprehension', ast.SetComp: 'comprehension',
+        ast.DictComp: 'comprehension', ast.GeneratorExp: 'comprehension',
+        ast.FunctionDef: 'def', ast.AsyncFunctionDef: 'def', ast.ClassDef: 'class',
+    }
+    
     @staticmethod
-    def check_answer(student_answer: Any, correct_answer: Any, tolerance: float = 0.01):
+    def check_answer(student_answer: Any, correct_answer: Any, tolerance: float = 0.01, correct_hash: str = None):
         """Check if student's answer is correct"""
-        if isinstance(correct_answer, (int, float)):
+        if isinstance(correct_answer, (pd.DataFrame, pd.Series, np.ndarray)):
+            return ExerciseValidator.compare_answer(student_answer, correct_answer, tolerance,
+                                                    correct_hash=correct_hash)[0]
+        if isinstance(correct_answer, (int, float, np.number)):
             return abs(student_answer - correct_answer) < tolerance
         else:
             return student_answer == correct_answer
     
+    @staticmethod
+    def content_hash(answer: Any):
+        """
+        Hash of an array/Series/DataFrame's values, dtypes, shape and labels.
+        
+        Compute it once for an answer key and pass it to check_answer as
+        correct_hash: identical student outputs are then accepted after
+        hashing alone. Returns None for answers that can't be hashed.
+        """
+        h = hashlib.blake2b(digest_size=16)
+        try:
+            if isinstance(answer, pd.DataFrame):
+                h.update(repr(('DataFrame', answer.shape, list(answer.columns),
+                               [str(d) for d in answer.dtypes])).encode())
+                h.update(pd.util.hash_pandas_object(answer, index=True).to_numpy())
+            elif isinstance(answer, pd.Series):
+                h.update(repr(('Series', answer.shape, answer.name, str(answer.dtype))).encode())
+                h.update(pd.util.hash_pandas_object(answer, index=True).to_numpy())
+            elif isinstance(answer, np.ndarray) and answer.dtype.kind != 'O':
+                h.update(repr(('ndarray', answer.shape, answer.dtype.str)).encode())
+                h.update(np.ascontiguousarray(answer).reshape(-1).view(np.uint8))
+            else:
+                return None
+        except TypeError:
+            # Unhashable cells such as lists inside an object column
+            return None
+        return h.hexdigest()
+    
+    @staticmethod
+    def _values_match(actual: np.ndarray, expected: np.ndarray, tolerance: float, rtol: float) -> np.ndarray:
+        """Elementwise match mask: within tolerance for numbers, equal otherwise, NaN matching NaN"""
+        if actual.dtype.kind in 'iuf' and expected.dtype.kind in 'iuf':
+            return np.isclose(actual, expected, rtol=rtol, atol=tolerance, equal_nan=True)
+        missing = pd.isna(actual) & pd.isna(expected)
+        try:
+            return np.asarray(actual == expected, dtype=bool) | missing
+        except (TypeError, ValueError):
+            return np.fromiter((bool(a == b) if not m else True
+                                for a, b, m in zip(actual.ravel(), expected.ravel(), missing.ravel())),
+                               dtype=bool, count=actual.size).reshape(actual.shape)
+    
+    @staticmethod
+    def _column_values(series: pd.Series) -> np.ndarray:
+        if pd.api.types.is_numeric_dtype(series.dtype) and not pd.api.types.is_bool_dtype(series.dtype):
+            return series.to_numpy(dtype=float, na_value=np.nan)
+        return series.to_numpy(dtype=object)
+    
+    @staticmethod
+    def _same_kind(a, b) -> bool:
+        """Same dtype family (signed and unsigned ints count as one); extension dtypes must be equal"""
+        def kind(dtype):
+            if not isinstance(dtype, np.dtype):
+                return str(dtype)
+            return 'i' if dtype.kind == 'u' else dtype.kind
+        return kind(a) == kind(b)
+    
+    @staticmethod
+    def compare_answer(student_answer: Any, correct_answer: Any, tolerance: float = 0.01, rtol: float = 0.0,
+                       check_dtype: bool = False, check_order: bool = True, check_names: bool = False,
+                       correct_hash: str = None, max_report: int = 5) -> Tuple[bool, str]:
+        """
+        Compare arrays, Series and DataFrames value by value (np.allclose
+        style, |got - expected| <= tolerance + rtol * |expected|) and report
+        where they differ.
+        
+        By default only values count, so [1, 2, 3] matches [1.0, 2.0, 3.001].
+        check_dtype=True also flags int/float/str mismatches, check_names=True
+        requires equal Series names, and check_order=False aligns DataFrame
+        columns by name and rows by index label before comparing. With a
+        precomputed correct_hash, exact matches skip the comparison.
+        """
+        if correct_hash is not None and ExerciseValidator.content_hash(student_answer) == correct_hash:
+            return True, "✅ Correct! Exact match."
+        
+        if isinstance(correct_answer, (pd.DataFrame, pd.Series)):
+            kind = type(correct_answer).__name__
+            if not isinstance(student_answer, type(correct_answer)):
+                return False, f"❌ Expected a {kind}, got {type(student_answer).__name__}"
+            if check_names and kind == 'Series' and student_answer.name != correct_answer.name:
+                return False, f"❌ Series name differs: expected {correct_answer.name!r}, got {student_answer.name!r}"
+            expected = correct_answer.to_frame() if kind == 'Series' else correct_answer
+            actual = student_answer.to_frame() if kind == 'Series' else student_answer
+            if kind == 'Series':
+                actual.columns = expected.columns
+            if not check_order:
+                if set(actual.columns) == set(expected.columns):
+                    actual = actual[list(expected.columns)]
+                if (actual.index.is_unique and expected.index.is_unique
+                        and set(actual.index) == set(expected.index)):
+                    actual = actual.reindex(expected.index)
+            if list(actual.columns) != list(expected.columns):
+                return False, (f"❌ Columns differ: expected {list(expected.columns)}, "
+                               f"got {list(actual.columns)}")
+            if actual.shape != expected.shape:
+                return False, f"❌ Shape differs: expected {expected.shape}, got {actual.shape}"
+            if check_dtype:
+                wrong = [f"{col} ({actual[col].dtype}, expected {expected[col].dtype})"
+                         for col in expected.columns
+                         if not ExerciseValidator._same_kind(actual[col].dtype, expected[col].dtype)]
+                if wrong:
+                    return False, f"❌ Wrong dtype: {', '.join(wrong)}"
+            labels = expected.index
+            if check_order and not actual.index.equals(expected.index):
+                return False, "❌ Row order or index labels differ from the expected answer"
+            
+            total, locations = 0, []
+            for position, col in enumerate(expected.columns):
+                got = ExerciseValidator._column_values(actual.iloc[:, position])
+                want = ExerciseValidator._column_values(expected.iloc[:, position])
+                bad = np.flatnonzero(~ExerciseValidator._values_match(got, want, tolerance, rtol))
+                total += len(bad)
+                for row in bad[:max_report - len(locations)]:
+                    where = f"[{labels[row]!r}]" if kind == 'Series' else f"[{labels[row]!r}, {col!r}]"
+                    locations.append(f"{where} expected {want[row]!r}, got {got[row]!r}")
+            size = expected.size
+        
+        elif isinstance(correct_answer, np.ndarray):
+            actual = np.asarray(student_answer)
+            if actual.shape != correct_answer.shape:
+                return False, f"❌ Shape differs: expected {correct_answer.shape}, got {actual.shape}"
+            if check_dtype and not ExerciseValidator._same_kind(actual.dtype, correct_answer.dtype):
+                return False, f"❌ Wrong dtype: expected {correct_answer.dtype}, got {actual.dtype}"
+            match = ExerciseValidator._values_match(actual, correct_answer, tolerance, rtol)
+            bad = np.argwhere(~match)
+            total = len(bad)
+            locations = [f"{list(map(int, idx))} expected {correct_answer[tuple(idx)]!r}, "
+                         f"got {actual[tuple(idx)]!r}" for idx in bad[:max_report]]
+            size = correct_answer.size
+        
+        else:
+            correct = ExerciseValidator.check_answer(student_answer, correct_answer, tolerance)
+            return correct, "✅ Correct!" if correct else f"❌ Expected {correct_answer!r}, got {student_answer!r}"
+        
+        if total == 0:
+            return True, "✅ Correct!"
+        more = f"; ... and {total - len(locations):,} more" if total > len(locations) else ""
+        return False, f"❌ {total:,} of {size:,} values differ: " + "; ".join(locations) + more
+    
+    @staticmethod
+    def _dotted(node) -> str:
+        """'pd.read_csv' for Name/Attribute chains, the last attribute for anything else"""
+        parts = []
+        while isinstance(node, ast.Attribute):
+            parts.append(node.attr)
+            node = node.value
+        if isinstance(node, ast.Name):
+            parts.append(node.id)
+        return '.'.join(reversed(parts))
+    
+    @staticmethod
+    def _suffixes(dotted: str) -> List[str]:
+        parts = dotted.split('.')
+        return ['.'.join(parts[i:]) for i in range(len(parts))] if dotted else []
+    
+    @staticmethod
+    def _code_tokens(code_string: str) -> str:
+        """
+        Source tokens joined by spaces, without comments or string literals.
+        
+        Expressions inside f-strings are kept, and code that stops
+        mid-statement (e.g. the fragment 'df[') yields the tokens read before
+        the tokenizer gave up.
+        """
+        skip = {tokenize.COMMENT, tokenize.NL, tokenize.NEWLINE, tokenize.INDENT,
+                tokenize.DEDENT, tokenize.ENDMARKER, tokenize.ERRORTOKEN}
+        # Python 3.12+ tokenizes f-strings itself: keep only their expression tokens
+        skip.update(getattr(tokenize, name) for name in ('FSTRING_START', 'FSTRING_MIDDLE', 'FSTRING_END')
+                    if hasattr(tokenize, name))
+        parts = []
+        try:
+            for token in tokenize.generate_tokens(io.StringIO(code_string).readline):
+                if token.type == tokenize.STRING:
+                    parts.extend(ExerciseValidator._fstring_tokens(token.string))
+                elif token.type not in skip:
+                    parts.append(token.string)
+        except (tokenize.TokenError, IndentationError, SyntaxError):
+            pass
+        return ' ' + ' '.join(parts) + ' '
+    
+    @staticmethod
+    def _fstring_tokens(literal: str) -> List[str]:
+        """Tokens of the replacement-field expressions of an f-string literal (none for other strings)"""
+        if 'f' not in re.match(r'[A-Za-z]*', literal).group().lower():
+            return []
+        try:
+            joined = ast.parse(literal, mode='eval').body
+        except SyntaxError:
+            return []
+        
+        def expressions(node):
+            for value in node.values:
+                if isinstance(value, ast.FormattedValue):
+                    yield value.value
+                    if value.format_spec is not None:
+                        yield from expressions(value.format_spec)
+        
+        return [token for expression in expressions(joined)
+                for token in ExerciseValidator._code_tokens(ast.unparse(expression)).split()]
+    
+    @staticmethod
+    def _collect_facts(tree) -> frozenset:
+        """One walk over the AST recording calls, references, imports, definitions and constructs"""
+        facts = set()
+        suffixes = ExerciseValidator._suffixes
+        for node in ast.walk(tree):
+            construct = ExerciseValidator.CONSTRUCTS.get(type(node))
+            if construct is not None:
+                facts.add(('node', construct))
+            if isinstance(node, ast.Call):
+                facts.update(('call', s) for s in suffixes(ExerciseValidator._dotted(node.func)))
+            elif isinstance(node, (ast.Attribute, ast.Name)):
+                facts.update(('ref', s) for s in suffixes(ExerciseValidator._dotted(node)))
+                if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Store):
+                    facts.add(('store', node.id))
+            elif isinstance(node, ast.keyword) and node.arg:
+                facts.add(('keyword', node.arg))
+            elif isinstance(node, ast.Import):
+                for alias in node.names:
+                    parts = alias.name.split('.')
+                    facts.update(('import', '.'.join(parts[:i + 1])) for i in range(len(parts)))
+                    facts.add(('ref', alias.asname or parts[0]))
+            elif isinstance(node, ast.ImportFrom) and node.module:
+                facts.add(('import', node.module))
+                for alias in node.names:
+                    facts.add(('import', f"{node.module}.{alias.name}"))
+                    facts.add(('ref', alias.asname or alias.name))
+            elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                facts.add(('def' if not isinstance(node, ast.ClassDef) else 'class', node.name))
+        return frozenset(facts)
+    
+    @staticmethod
+    def parse_submission(code_string: str):
+        """
+        (facts, token text, syntax error) for a submission, parsed once and
+        cached by the hash of its source.
+        """
+        key = hashlib.blake2b(code_string.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+        cache = ExerciseValidator._parse_cache
+        with ExerciseValidator._parse_lock:
+            if key in cache:
+                cache.move_to_end(key)
+                return cache[key]
+        try:
+            facts, error = ExerciseValidator._collect_facts(ast.parse(code_string)), None
+        except SyntaxError as e:
+            facts, error = frozenset(), e
+        parsed = (facts, ExerciseValidator._code_tokens(code_string), error)
+        with ExerciseValidator._parse_lock:
+            cache[key] = parsed
+            while len(cache) > ExerciseValidator.PARSE_CACHE_SIZE:
+                cache.popitem(last=False)
+        return parsed
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def compile_requirement(element: str) -> Tuple[frozenset, str]:
+        """
+        Translate a required element into the AST facts that satisfy it
+        (any one is enough) plus a token-text fallback:
+        'import pandas', 'from sklearn import metrics', 'def', 'def clean',
+        'class', 'for'/'while'/'if'/'lambda'/..., 'groupby(' or 'df.groupby()'
+        for calls, 'figsize=' for a keyword or assignment, and 'pd.DataFrame'
+        or 'groupby' for any reference. Anything else is matched against the
+        code's tokens, ignoring comments and strings.
+        """
+        text = element.strip()
+        m = re.fullmatch(r'import\s+([\w.]+)', text)
+        if m:
+            return frozenset({('import', m.group(1))}), ''
+        m = re.fullmatch(r'from\s+([\w.]+)(?:\s+import\s+(\w+))?', text)
+        if m:
+            module = m.group(1) if m.group(2) is None else f"{m.group(1)}.{m.group(2)}"
+            return frozenset({('import', module)}), ''
+        m = re.fullmatch(r'(def|class)(?:\s+(\w+))?\s*(?:\(.*)?:?', text)
+        if m:
+            kind, name = m.groups()
+            return frozenset({(kind, name) if name else ('node', kind)}), ''
+        if text in set(ExerciseValidator.CONSTRUCTS.values()):
+            return frozenset({('node', text)}), ''
+        m = re.fullmatch(r'\.?([A-Za-z_][\w.]*)\s*\(\s*\)?', text)
+        if m:
+            return frozenset({('call', m.group(1))}), ''
+        m = re.fullmatch(r'([A-Za-z_]\w*)\s*=', text)
+        if m:
+            return frozenset({('keyword', m.group(1)), ('store', m.group(1))}), ''
+        m = re.fullmatch(r'\.?([A-Za-z_][\w.]*)', text)
+        if m:
+            name = m.group(1)
+            return frozenset({('ref', name), ('call', name), ('import', name), ('def', name), ('class', name)}), ''
+        return frozenset(), ExerciseValidator._code_tokens(text).strip()
+    
     @staticmethod
     def validate_code(code_string: str, required_elements: List[str]):
         """Check if code contains required elements"""
-        missing = [elem for elem in required_elements if elem not in code_string]
+        facts, tokens, error = ExerciseValidator.parse_submission(code_string)
+        if error is not None:
+            return False, f"❌ Syntax error on line {error.lineno}: {error.msg}"
+        missing = []
+        for elem in required_elements:
+            wanted, fallback = ExerciseValidator.compile_requirement(elem)
+            found = not wanted.isdisjoint(facts) if wanted else f" {fallback} " in tokens
+            if not found:
+                missing.append(elem)
         if not missing:
             return True, "✅ Great! Your code contains all required elements."
         else:
             return False, f"❌ Missing elements: {', '.join(missing)}"
     
     @staticmethod
-    def grade_visualization(fig):
-        """Grade a plotly figure based on best practices"""
+    def _read_submission(path: str) -> str:
+        """Source of a .py file, or the code cells of a notebook"""
+        with open(path, encoding='utf-8') as f:
+            if not path.endswith('.ipynb'):
+                return f.read()
+            notebook = json.load(f)
+        cells = []
+        for cell in notebook.get('cells', []):
+            if cell.get('cell_type') == 'code':
+                source = cell.get('source', '')
+                source = ''.join(source) if isinstance(source, list) else source
+                # IPython magics and shell escapes aren't Python
+                cells.append('\n'.join(line for line in source.splitlines()
+                                       if not line.lstrip().startswith(('%', '!'))))
+        return '\n\n'.join(cells)
+    
+    @staticmethod
+    def _validate_file(path: str, required_elements: Tuple[str, ...]) -> Tuple[str, bool, str]:
+        try:
+            passed, message = ExerciseValidator.validate_code(
+                ExerciseValidator._read_submission(path), list(required_elements))
+        except (OSError, UnicodeDecodeError, ValueError) as e:
+            passed, message = False, f"❌ Could not read submission: {e}"
+        return path, passed, message
+    
+    @staticmethod
+    def _submission_paths(folder: str, patterns: Tuple[str, ...]) -> List[str]:
+        return sorted({p for pattern in patterns
+                       for p in glob.glob(os.path.join(folder, '**', pattern), recursive=True)})
+    
+    @staticmethod
+    def _map_files(func: Callable, paths: List[str], workers: int = None, *args) -> List[Any]:
+        """func(path, *args) for every path, in a process pool when there's more than one"""
+        workers = workers or os.cpu_count() or 1
+        if workers == 1 or len(paths) < 2:
+            return [func(p, *args) for p in paths]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(func, paths, *[[arg] * len(paths) for arg in args],
+                                     chunksize=max(1, len(paths) // (workers * 4))))
+    
+    @staticmethod
+    def validate_folder(folder: str, required_elements: List[str], patterns: Tuple[str, ...] = ('*.py', '*.ipynb'),
+                        workers: int = None) -> pd.DataFrame:
+        """Validate every submission in a folder (recursively) in a process pool"""
+        rows = ExerciseValidator._map_files(ExerciseValidator._validate_file,
+                                            ExerciseValidator._submission_paths(folder, patterns),
+                                            workers, tuple(required_elements))
+        return pd.DataFrame(rows, columns=['file', 'passed', 'message'])
+    
+    @staticmethod
+    def _grade_parts(title: str, xlabel: str, ylabel: str, n_traces: int):
+        """The rubric shared by live figures and saved figure JSON"""
         score = 0
         feedback = []
         
-        if fig.layout.title.text:
+        if title:
             score += 25
             feedback.append("✓ Has title")
         else:
             feedback.append("✗ Missing title")
             
-        if fig.layout.xaxis.title.text:
+        if xlabel:
             score += 25
             feedback.append("✓ Has x-axis label")
         else:
             feedback.append("✗ Missing x-axis label")
             
-        if fig.layout.yaxis.title.text:
+        if ylabel:
             score += 25
             feedback.append("✓ Has y-axis label")
         else:
             feedback.append("✗ Missing y-axis label")
             
-        if len(fig.data) > 0:
+        if n_traces > 0:
             score += 25
             feedback.append("✓ Contains data")
         else:
             feedback.append("✗ No data plotted")
             
         return score, feedback
+    
+    @staticmethod
+    def grade_visualization(fig):
+        """Grade a plotly figure based on best practices"""
+        return ExerciseValidator._grade_parts(fig.layout.title.text, fig.layout.xaxis.title.text,
+                                              fig.layout.yaxis.title.text, len(fig.data))
+    
+    @staticmethod
+    def _title_text(title) -> str:
+        """Plotly JSON allows both "title": "..." and "title": {"text": "..."}"""
+        return title.get('text') if isinstance(title, dict) else title
+    
+    @staticmethod
+    def _json_part(container: Dict, key: str, kind: type):
+        """container[key] if present, checked to be a dict/list as plotly requires"""
+        value = container.get(key)
+        if value is None:
+            return kind()
+        if not isinstance(value, kind):
+            raise ValueError(f"'{key}' must be a JSON {'object' if kind is dict else 'array'}, "
+                             f"not {type(value).__name__}")
+        return value
+    
+    @staticmethod
+    def grade_figure_json(spec: Dict) -> Tuple[int, List[str]]:
+        """
+        grade_visualization for a figure dict ({"data": [...], "layout": {...}})
+        without building a go.Figure. Raises ValueError for malformed figures.
+        """
+        part = ExerciseValidator._json_part
+        if not isinstance(spec, dict):
+            raise ValueError(f"A figure must be a JSON object, not {type(spec).__name__}")
+        layout = part(spec, 'layout', dict)
+        title = ExerciseValidator._title_text
+        return ExerciseValidator._grade_parts(title(layout.get('title')),
+                                              title(part(layout, 'xaxis', dict).get('title')),
+                                              title(part(layout, 'yaxis', dict).get('title')),
+                                              len(part(spec, 'data', list)))
+    
+    @staticmethod
+    def _figure_specs(path: str) -> List[Dict]:
+        """Figures in a saved figure JSON file, or every plotly output of a notebook"""
+        with open(path, encoding='utf-8') as f:
+            document = json.load(f)
+        if not isinstance(document, dict):
+            return []
+        if 'cells' not in document:
+            return [document] if 'data' in document or 'layout' in document else []
+        return [output['data'][ExerciseValidator.PLOTLY_MIME]
+                for cell in document['cells'] if cell.get('cell_type') == 'code'
+                for output in cell.get('outputs', [])
+                if ExerciseValidator.PLOTLY_MIME in (output.get('data') or {})]
+    
+    @staticmethod
+    def _grade_figure_file(path: str) -> List[Tuple[str, int, int, List[str]]]:
+        # One malformed submission must never abort the whole batch
+        try:
+            specs = ExerciseValidator._figure_specs(path)
+        except (OSError, UnicodeDecodeError, ValueError, TypeError, AttributeError, KeyError) as e:
+            return [(path, 0, 0, [f"✗ Could not read figure: {e}"])]
+        if not specs:
+            return [(path, 0, 0, ["✗ No figure found"])]
+        rows = []
+        for i, spec in enumerate(specs):
+            try:
+                rows.append((path, i, *ExerciseValidator.grade_figure_json(spec)))
+            except (ValueError, TypeError, AttributeError, KeyError) as e:
+                rows.append((path, i, 0, [f"✗ Could not read figure: {e}"]))
+        return rows
+    
+    @staticmethod
+    def grade_visualizations(folder: str, patterns: Tuple[str, ...] = ('*.json', '*.ipynb'),
+                             workers: int = None) -> pd.DataFrame:
+        """
+        Grade every saved figure (fig.write_json output) and every plotly
+        output cell of the notebooks in a folder, in a process pool.
+        One row per figure: file, figure (position within the file), score
+        and feedback.
+        """
+        results = ExerciseValidator._map_files(ExerciseValidator._grade_figure_file,
+                                               ExerciseValidator._submission_paths(folder, patterns), workers)
+        return pd.DataFrame([row for rows in results for row in rows],
+                            columns=['file', 'figure', 'score', 'feedback'])
+
+
+class _TrackedList(list):
+    """List that counts its own mutations, so derived caches know when to refresh"""
+    
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.version = 0
+
+
+def _counting(method):
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        self.version += 1
+        return method(self, *args, **kwargs)
+    return wrapper
+
+
+for _name in ('append', 'extend', 'insert', 'pop', 'remove', 'clear', 'sort', 'reverse',
+              '__setitem__', '__delitem__', '__iadd__', '__imul__'):
+    setattr(_TrackedList, _name, _counting(getattr(list, _name)))
+del _name
 
 
 class QuizGenerator:
     """Generate interactive quizzes"""
     
+    # Templates are plain str.format strings, parsed once at class creation;
+    # every interpolated value is HTML-escaped before it is formatted in
+    QUESTION_HTML = (
+        '<div style="border: 1px solid #ddd; padding: 15px; border-radius: 5px; margin-bottom: 10px;">'
+        '<h4>Question {number}: {question}</h4>'
+        '<form id="quiz_{index}">{options}</form>'
+        '{footer}'
+        '</div>'
+    )
+    OPTION_HTML = (
+        '<label style="display: block; margin: 10px 0;">'
+        '<input type="radio" name="q{index}" value="{value}"> {text}'
+        '</label>'
+    )
+    # Options are rendered once per bank up to the per-position radio name
+    _OPTION_HEAD, _OPTION_TAIL = OPTION_HTML.split('{index}')
+    SUBMIT_HTML = (
+        '<button onclick="checkAnswer()" style="margin-top: 10px; padding: 5px 15px;">Submit</button>'
+        '<div id="feedback" style="margin-top: 10px;"></div>'
+    )
+    PAGE_HTML = (
+        '<!DOCTYPE html><html><head><meta charset="utf-8"><title>{title}</title></head>'
+        '<body><h2>{title}</h2>{questions}{answers}</body></html>'
+    )
+    # Rendered banks kept across instances, keyed by bank hash and options
+    BANK_CACHE_SIZE = 32
+    _bank_cache = OrderedDict()
+    
     def __init__(self):
+        self._version = 0
         self.questions = []
         self.scores = []
+        self._hash = None
+        self._prepared = None
+    
+    @property
+    def questions(self) -> List[Dict[str, Any]]:
+        """The question bank; adding, removing or replacing questions is tracked"""
+        return self._questions
+    
+    @questions.setter
+    def questions(self, questions: List[Dict[str, Any]]):
+        self._questions = _TrackedList(questions)
+        self._version += 1
+    
+    def touch(self):
+        """Mark the bank as changed after editing a question dict in place"""
+        self._version += 1
         
     def add_question(self, question: str, options: List[str], correct_answer: int):
         """Add a multiple choice question"""
@@ -300,32 +1032,400 @@ class QuizGenerator:
             'correct': correct_answer
         })
     
-    def create_quiz_widget(self, question_index: int):
-        """Create an interactive quiz widget (returns HTML)"""
-        q = self.questions[question_index]
+    def bank_hash(self, questions: List[Dict[str, Any]] = None) -> str:
+        """
+        Content hash of a question bank (defaults to this generator's questions).
         
-        html = f"""
-        <div style="border: 1px solid #ddd; padding: 15px; border-radius: 5px;">
-            <h4>Question {question_index + 1}: {q['question']}</h4>
-            <form id="quiz_{question_index}">
+        This generator's own hash is only recomputed after the bank changed.
+        """
+        if questions is None:
+            version = (self._version, self._questions.version)
+            if self._hash is None or self._hash[0] != version:
+                self._hash = (version, self.bank_hash(self._questions))
+            return self._hash[1]
+        payload = json.dumps(questions, sort_keys=True, default=str).encode()
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+    
+    def _prepare(self, questions: List[Dict[str, Any]] = None, bank_hash: str = None):
         """
+        Escape the bank and pre-render the position-independent part of
+        every option once: [(question, [option tails], [options], correct), ...]
         
-        for i, option in enumerate(q['options']):
-            html += f"""
-                <label style="display: block; margin: 10px 0;">
-                    <input type="radio" name="q{question_index}" value="{i}">
-                    {option}
-                </label>
-            """
+        This generator's own bank is kept prepared under its content hash.
+        Adding, removing or replacing questions in ``self.questions`` is
+        picked up; after editing a question dict in place, call ``touch()``.
+        """
+        if questions is not None:
+            prepared = []
+            for q in questions:
+                options = [escape_html(str(o)) for o in q['options']]
+                tails = [self._OPTION_TAIL.format(value=i, text=text) for i, text in enumerate(options)]
+                prepared.append((escape_html(str(q['question'])), tails, options, q['correct']))
+            return prepared
+        bank_hash = bank_hash or self.bank_hash()
+        if self._prepared is None or self._prepared[0] != bank_hash:
+            self._prepared = (bank_hash, self._prepare(self.questions))
+        return self._prepared[1]
+    
+    @classmethod
+    def _render_question(cls, position: int, prepared_question, order=None, footer: str = '') -> str:
+        question, tails, _, _ = prepared_question
+        # Only the radio group name depends on the position; the radio value
+        # stays the original option index, so answers can be checked against
+        # the bank whatever the display order
+        head = cls._OPTION_HEAD + str(position)
+        parts = tails if order is None else [tails[i] for i in order]
+        options = head + head.join(parts) if parts else ''
+        return cls.QUESTION_HTML.format(number=position + 1, question=question, index=position,
+                                        options=options, footer=footer)
+    
+    @classmethod
+    def _render_page(cls, prepared, seed: int = None, title: str = "Quiz",
+                     include_answers: bool = False) -> str:
+        if seed is None:
+            order, option_orders = range(len(prepared)), [None] * len(prepared)
+        else:
+            rng = np.random.default_rng(seed)
+            order = rng.permutation(len(prepared))
+            # Shuffle every question's options with one argsort of random keys
+            counts = np.array([len(prepared[q][1]) for q in order])
+            keys = rng.random((len(order), counts.max(initial=0)))
+            keys[np.arange(keys.shape[1]) >= counts[:, None]] = np.inf
+            option_orders = [row[:n] for row, n in zip(keys.argsort(axis=1).tolist(), counts.tolist())]
+        parts = []
+        answers = []
+        for position, (q, option_order) in enumerate(zip(order, option_orders)):
+            parts.append(cls._render_question(position, prepared[q], option_order))
+            answers.append(prepared[q][2][prepared[q][3]])
+        answer_key = f"<h3>Answer key</h3><ol><li>{'</li><li>'.join(answers)}</li></ol>" if include_answers else ''
+        return cls.PAGE_HTML.format(title=escape_html(title), questions=''.join(parts), answers=answer_key)
+    
+    def render_bank(self, questions: List[Dict[str, Any]] = None, seed: int = None,
+                    title: str = "Quiz", include_answers: bool = False) -> str:
+        """
+        Render a whole question bank as one static HTML page.
         
-        html += """
-            </form>
-            <button onclick="checkAnswer()" style="margin-top: 10px; padding: 5px 15px;">Submit</button>
-            <div id="feedback" style="margin-top: 10px;"></div>
-        </div>
+        With ``seed`` the question and option order is shuffled
+        reproducibly. Pages are cached by bank hash and options, so
+        re-rendering an unchanged bank is a dictionary lookup.
+        """
+        bank_hash = self.bank_hash(questions)
+        key = (bank_hash, seed, title, include_answers)
+        cache = QuizGenerator._bank_cache
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+        prepared = self._prepare(questions) if questions is not None else self._prepare(bank_hash=bank_hash)
+        page = self._render_page(prepared, seed, title, include_answers)
+        cache[key] = page
+        while len(cache) > self.BANK_CACHE_SIZE:
+            cache.popitem(last=False)
+        return page
+    
+    def render_handouts(self, students: List[str], seed: int = 0, title: str = "Quiz",
+                        include_answers: bool = False) -> Dict[str, str]:
+        """
+        Per-student shuffled handouts of this bank, reproducible from
+        ``seed`` and the student name. The bank is escaped once and shared.
+        """
+        prepared = self._prepare()
+        handouts = {}
+        for student in students:
+            digest = hashlib.blake2b(f"{seed}:{student}".encode(), digest_size=8).digest()
+            student_seed = int.from_bytes(digest, 'little')
+            handouts[student] = self._render_page(prepared, student_seed, f"{title} - {student}", include_answers)
+        return handouts
+    
+    def create_quiz_widget(self, question_index: int):
+        """Create an interactive quiz widget (returns HTML)"""
+        return self._render_question(question_index, self._prepare()[question_index], footer=self.SUBMIT_HTML)
+
+
+class QuizStore:
+    """
+    SQLite-backed question bank and attempt store.
+    
+    Questions, assembled quizzes and student attempts persist across kernel
+    restarts in a single local database file. The database runs in WAL mode
+    so analytics can read while attempts are being written, and is indexed
+    on topic/difficulty and on student, question and quiz for attempts.
+    Attempts are graded as they are inserted (an unanswered attempt counts
+    as wrong) and written in batches; a batch with attempts for question ids
+    that are not in the bank is rejected as a whole with a ValueError naming
+    them. The database defaults to a per-user data directory rather than
+    the notebook's working directory.
+    """
+    
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS questions (
+        id INTEGER PRIMARY KEY,
+        topic TEXT NOT NULL,
+        difficulty INTEGER NOT NULL DEFAULT 1,
+        question TEXT NOT NULL,
+        options TEXT NOT NULL,
+        correct INTEGER NOT NULL,
+        explanation TEXT NOT NULL DEFAULT ''
+    );
+    CREATE INDEX IF NOT EXISTS idx_questions_topic ON questions (topic, difficulty);
+    CREATE INDEX IF NOT EXISTS idx_questions_difficulty ON questions (difficulty);
+    CREATE TABLE IF NOT EXISTS quizzes (
+        id INTEGER PRIMARY KEY,
+        title TEXT NOT NULL,
+        created TEXT NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS quiz_questions (
+        quiz_id INTEGER NOT NULL REFERENCES quizzes (id),
+        position INTEGER NOT NULL,
+        question_id INTEGER NOT NULL REFERENCES questions (id),
+        PRIMARY KEY (quiz_id, position)
+    ) WITHOUT ROWID;
+    CREATE TABLE IF NOT EXISTS attempts (
+        id INTEGER PRIMARY KEY,
+        quiz_id INTEGER,
+        student TEXT NOT NULL,
+        question_id INTEGER NOT NULL REFERENCES questions (id),
+        answer INTEGER,
+        correct INTEGER NOT NULL,
+        created TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_attempts_student ON attempts (student, quiz_id);
+    CREATE INDEX IF NOT EXISTS idx_attempts_question ON attempts (question_id, correct);
+    CREATE INDEX IF NOT EXISTS idx_attempts_quiz ON attempts (quiz_id);
+    """
+    # Graded at insert time against the stored answer key
+    INSERT_ATTEMPT = """
+    INSERT INTO attempts (quiz_id, student, question_id, answer, correct, created)
+    SELECT ?, ?, id, ?, COALESCE(correct = ?, 0), ? FROM questions WHERE id = ?
+    """
+    
+    def __init__(self, path: str = None, batch_size: int = 1000):
+        if path is None:
+            path = QuizStore.default_path()
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.batch_size = batch_size
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(self.SCHEMA)
+        self._pending = []
+    
+    @staticmethod
+    def default_path() -> str:
+        """ds_bootcamp/quiz_bank.db in the user's data dir ($XDG_DATA_HOME or ~/.local/share)"""
+        base = os.environ.get('XDG_DATA_HOME') or os.path.join(os.path.expanduser('~'), '.local', 'share')
+        return os.path.join(base, 'ds_bootcamp', 'quiz_bank.db')
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def close(self):
+        """Write pending attempts and close the database"""
+        try:
+            self.flush()
+        except ValueError:
+            # The rejected attempts have left the queue; still write the rest
+            self.flush()
+            raise
+        finally:
+            self.conn.close()
+    
+    @contextlib.contextmanager
+    def _transaction(self):
         """
+        Write transaction that takes the database write lock up front, so
+        reads inside it see no concurrent writers (sqlite3 would otherwise
+        only begin the transaction at the first INSERT)
+        """
+        self.conn.execute("BEGIN IMMEDIATE")
+        with self.conn:
+            yield self.conn
+    
+    @staticmethod
+    def _row_to_question(row) -> Dict[str, Any]:
+        question = dict(row)
+        question['options'] = json.loads(question['options'])
+        return question
+    
+    def import_questions(self, questions, topic: str = None, difficulty: int = 1) -> List[int]:
+        """
+        Bulk-insert questions in one transaction and return their ids.
         
-        return html
+        Accepts dicts as kept by InteractiveQuiz/QuizGenerator ('question',
+        'options', 'correct', optional 'explanation', 'topic', 'difficulty');
+        ``topic`` and ``difficulty`` fill in missing fields.
+        """
+        rows = []
+        for q in questions:
+            q_topic = q.get('topic', topic)
+            if q_topic is None:
+                raise ValueError(f"No topic given for question: {q['question']!r}")
+            rows.append((q_topic, int(q.get('difficulty', difficulty)), q['question'],
+                         json.dumps(list(q['options'])), int(q['correct']), q.get('explanation', '')))
+        insert = ("INSERT INTO questions (topic, difficulty, question, options, correct, explanation) "
+                  "VALUES (?, ?, ?, ?, ?, ?)")
+        with self._transaction() as conn:
+            # Ids as actually assigned, whatever other writers of a shared store do
+            return [conn.execute(insert, row).lastrowid for row in rows]
+    
+    def topics(self) -> pd.DataFrame:
+        """Question counts per topic and difficulty"""
+        return pd.read_sql_query(
+            "SELECT topic, difficulty, COUNT(*) AS questions FROM questions "
+            "GROUP BY topic, difficulty ORDER BY topic, difficulty", self.conn)
+    
+    def get_questions(self, ids: List[int]) -> List[Dict[str, Any]]:
+        """Questions by id, in the order given"""
+        found = {}
+        # Stay below SQLite's bound-parameter limit
+        for start in range(0, len(ids), 500):
+            chunk = list(ids[start:start + 500])
+            placeholders = ','.join('?' * len(chunk))
+            for row in self.conn.execute(f"SELECT * FROM questions WHERE id IN ({placeholders})", chunk):
+                found[row['id']] = self._row_to_question(row)
+        return [found[i] for i in ids if i in found]
+    
+    def sample_questions(self, topic: str, n: int, difficulty: int = None,
+                         seed: int = None) -> List[Dict[str, Any]]:
+        """
+        Up to ``n`` random questions from a topic (optionally one difficulty).
+        Candidate ids come from an index-only scan of the topic index and
+        are sampled in NumPy, avoiding ORDER BY RANDOM() over whole rows.
+        """
+        if difficulty is None:
+            cursor = self.conn.execute("SELECT id FROM questions WHERE topic = ?", (topic,))
+        else:
+            cursor = self.conn.execute("SELECT id FROM questions WHERE topic = ? AND difficulty = ?",
+                                       (topic, difficulty))
+        ids = np.fromiter((row[0] for row in cursor), dtype=np.int64)
+        if len(ids) > n:
+            ids = np.random.default_rng(seed).choice(ids, n, replace=False)
+        return self.get_questions(ids.tolist())
+    
+    def create_quiz(self, title: str, per_topic: Dict[str, int] = None,
+                    question_ids: List[int] = None, seed: int = None) -> int:
+        """Assemble a quiz from explicit question ids and/or N random questions per topic"""
+        ids = list(question_ids or [])
+        for topic, n in (per_topic or {}).items():
+            ids += [q['id'] for q in self.sample_questions(topic, n, seed=seed)]
+        with self.conn:
+            quiz_id = self.conn.execute("INSERT INTO quizzes (title, created) VALUES (?, ?)",
+                                        (title, datetime.now().isoformat())).lastrowid
+            self.conn.executemany("INSERT INTO quiz_questions (quiz_id, position, question_id) VALUES (?, ?, ?)",
+                                  [(quiz_id, position, qid) for position, qid in enumerate(ids)])
+        return quiz_id
+    
+    def quiz_questions(self, quiz_id: int) -> List[Dict[str, Any]]:
+        """Questions of a quiz in position order"""
+        rows = self.conn.execute(
+            "SELECT q.* FROM quiz_questions qq JOIN questions q ON q.id = qq.question_id "
+            "WHERE qq.quiz_id = ? ORDER BY qq.position", (quiz_id,))
+        return [self._row_to_question(row) for row in rows]
+    
+    def load_into(self, target, quiz_id: int) -> List[int]:
+        """
+        Add a stored quiz's questions to an InteractiveQuiz or QuizGenerator
+        (anything with ``add_question``) and return their ids by position.
+        """
+        with_explanation = 'explanation' in inspect.signature(target.add_question).parameters
+        questions = self.quiz_questions(quiz_id)
+        for q in questions:
+            extra = [q['explanation']] if with_explanation else []
+            target.add_question(q['question'], q['options'], q['correct'], *extra)
+        return [q['id'] for q in questions]
+    
+    def add_attempt(self, student: str, question_id: int, answer: int = None, quiz_id: int = None):
+        """Queue one attempt; attempts are written every ``batch_size`` calls"""
+        self._pending.append((quiz_id, student, answer, answer, datetime.now().isoformat(), question_id))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+    
+    def _unknown_questions(self, question_ids) -> List[int]:
+        """Ids among question_ids that are not in the bank"""
+        ids = sorted(set(question_ids))
+        known = set()
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            known.update(row[0] for row in self.conn.execute(
+                f"SELECT id FROM questions WHERE id IN ({placeholders})", chunk))
+        return [i for i in ids if i not in known]
+    
+    def record_attempts(self, attempts) -> int:
+        """
+        Write (student, question_id, answer[, quiz_id]) tuples in one batched
+        transaction. Nothing is written if any question id is unknown.
+        """
+        created = datetime.now().isoformat()
+        rows = [(a[3] if len(a) > 3 else None, a[0], a[2], a[2], created, a[1]) for a in attempts]
+        with self._transaction() as conn:
+            unknown = self._unknown_questions(row[5] for row in rows)
+            if unknown:
+                raise ValueError(f"Unknown question id(s): {unknown}; no attempts were recorded")
+            conn.executemany(self.INSERT_ATTEMPT, rows)
+        return len(rows)
+    
+    def record_answers(self, quiz_id: int, student: str, answers: Dict[int, int]) -> int:
+        """Record a student's answers to a stored quiz, keyed by question position (e.g. InteractiveQuiz.user_answers)"""
+        positions = dict(self.conn.execute(
+            "SELECT position, question_id FROM quiz_questions WHERE quiz_id = ?", (quiz_id,)).fetchall())
+        return self.record_attempts((student, positions[p], a, quiz_id) for p, a in answers.items() if p in positions)
+    
+    def flush(self):
+        """
+        Write queued attempts in one transaction. If any queued attempt
+        names an unknown question id, nothing is written: those attempts
+        are dropped from the queue, the valid ones stay queued for the next
+        flush, and a ValueError names the unknown ids.
+        """
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        try:
+            with self._transaction() as conn:
+                unknown = set(self._unknown_questions(row[5] for row in pending))
+                if not unknown:
+                    conn.executemany(self.INSERT_ATTEMPT, pending)
+        except sqlite3.Error:
+            # e.g. the database is locked: keep the batch for the next flush
+            self._pending = pending + self._pending
+            raise
+        if unknown:
+            kept = [row for row in pending if row[5] not in unknown]
+            self._pending = kept + self._pending
+            raise ValueError(f"Unknown question id(s): {sorted(unknown)}; no attempts were written "
+                             f"and {len(kept)} valid attempt(s) remain queued")
+    
+    def student_scores(self, quiz_id: int = None, student: str = None) -> pd.DataFrame:
+        """Attempts, correct answers and score (%) per student"""
+        self.flush()
+        where, params = self._where(quiz_id=quiz_id, student=student)
+        return pd.read_sql_query(
+            "SELECT student, COUNT(*) AS attempts, SUM(correct) AS correct, "
+            f"100.0 * AVG(correct) AS score FROM attempts {where} "
+            "GROUP BY student ORDER BY student", self.conn, params=params)
+    
+    def question_stats(self, quiz_id: int = None) -> pd.DataFrame:
+        """Attempts and share answered correctly per question, hardest first"""
+        self.flush()
+        where, params = self._where(quiz_id=quiz_id)
+        return pd.read_sql_query(
+            "SELECT a.question_id, q.topic, q.difficulty, COUNT(*) AS attempts, "
+            "AVG(a.correct) AS p_correct "
+            f"FROM attempts a JOIN questions q ON q.id = a.question_id {where} "
+            "GROUP BY a.question_id ORDER BY p_correct, a.question_id", self.conn, params=params)
+    
+    @staticmethod
+    def _where(**filters) -> Tuple[str, list]:
+        clauses = [(f"{column} = ?", value) for column, value in filters.items() if value is not None]
+        if not clauses:
+            return '', []
+        return 'WHERE ' + ' AND '.join(c for c, _ in clauses), [v for _, v in clauses]
 
 
 def create_environment_checker():
@@ -422,6 +1522,198 @@ class MyDataScienceKit:
             return f"❌ Error: Please provide numeric data. {str(e)}"
 
 
+class FigureCache:
+    """
+    Disk-backed cache of rendered figures.
+
+    Entries are keyed on a fingerprint of the plotted data plus the chart
+    parameters, so re-running a cell with unchanged data returns the stored
+    figure instead of rebuilding it. Plotly figures are stored as JSON and
+    matplotlib figures as PNG images; the least recently used entries are
+    evicted once the cache grows past ``max_bytes``.
+
+    The cache is opt-in (``enabled = True``). Nothing is ever unpickled, and
+    ``cache_dir`` (a per-user directory under ``~/.cache`` by default) is
+    only read or written while it is owned by the current user and closed
+    to everyone else. A matplotlib hit returns a new ``(fig, ax)`` showing
+    the stored image, so later edits to ``ax`` do not re-plot the data.
+    """
+
+    PNG_DPI = 100
+
+    def __init__(self, cache_dir: str = None, max_bytes: int = 200 * 1024 * 1024, enabled: bool = False):
+        self.cache_dir = cache_dir or FigureCache.default_dir()
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def default_dir() -> str:
+        """ds_bootcamp/figures in the user's cache dir ($XDG_CACHE_HOME or ~/.cache)"""
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+        return os.path.join(base, 'ds_bootcamp', 'figures')
+
+    def _secure_dir(self, create: bool = False) -> bool:
+        """True if cache_dir is a real directory owned by this user with mode 0o700"""
+        if create:
+            try:
+                os.makedirs(self.cache_dir, mode=0o700, exist_ok=True)
+            except OSError:
+                return False
+        try:
+            info = os.lstat(self.cache_dir)
+        except OSError:
+            return False
+        # lstat: a symlink planted in place of the directory is refused too
+        secure = stat.S_ISDIR(info.st_mode)
+        if secure and hasattr(os, 'getuid'):
+            secure = info.st_uid == os.getuid() and stat.S_IMODE(info.st_mode) == 0o700
+        if not secure and create:
+            warnings.warn(f"Figure cache disabled: {self.cache_dir} must be a directory "
+                          f"owned by the current user with mode 0o700")
+        return secure
+
+    @staticmethod
+    def fingerprint(data) -> str:
+        """Fast content hash of a DataFrame, Series, array or plain value"""
+        digest = hashlib.blake2b(digest_size=16)
+        if isinstance(data, pd.DataFrame):
+            digest.update(repr((data.shape, list(data.columns), [str(t) for t in data.dtypes])).encode())
+            digest.update(pd.util.hash_pandas_object(data, index=True).values.tobytes())
+        elif isinstance(data, pd.Series):
+            digest.update(repr((data.shape, data.name, str(data.dtype))).encode())
+            digest.update(pd.util.hash_pandas_object(data, index=True).values.tobytes())
+        elif isinstance(data, np.ndarray):
+            digest.update(repr((data.shape, str(data.dtype))).encode())
+            digest.update(np.ascontiguousarray(data).tobytes() if data.dtype != object else repr(data.tolist()).encode())
+        else:
+            digest.update(repr(data).encode())
+        return digest.hexdigest()
+
+    def make_key(self, chart: str, data, **params) -> str:
+        """Combine the data fingerprint and chart parameters into a cache key"""
+        fingerprints = [self.fingerprint(d) for d in (data if isinstance(data, tuple) else (data,))]
+        payload = json.dumps({'chart': chart, 'data': fingerprints, 'params': params},
+                             sort_keys=True, default=repr)
+        return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+    def _path(self, key: str, kind: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.{kind}")
+
+    @staticmethod
+    def _image_figure(payload: bytes):
+        """Rebuild a (fig, ax) pair that displays a stored PNG"""
+        image = plt.imread(io.BytesIO(payload), format='png')
+        height, width = image.shape[:2]
+        fig = plt.figure(figsize=(width / FigureCache.PNG_DPI, height / FigureCache.PNG_DPI),
+                         dpi=FigureCache.PNG_DPI)
+        ax = fig.add_axes([0, 0, 1, 1])
+        ax.imshow(image)
+        ax.set_axis_off()
+        return fig, ax
+
+    def get(self, key: str):
+        """Return the cached figure for ``key``, or None on a miss"""
+        if not self.enabled:
+            return None
+        if self._secure_dir():
+            for kind in ('json', 'png'):
+                path = self._path(key, kind)
+                try:
+                    with open(path, 'rb') as f:
+                        payload = f.read()
+                except OSError:
+                    continue
+                try:
+                    result = pio.from_json(payload.decode('utf-8')) if kind == 'json' else self._image_figure(payload)
+                except Exception:
+                    # Corrupt or incompatible entry: drop it and rebuild
+                    os.remove(path)
+                    break
+                # Touch the entry so eviction sees it as recently used
+                os.utime(path)
+                self.hits += 1
+                return result
+        self.misses += 1
+        return None
+
+    def put(self, key: str, figure):
+        """Store a plotly figure or a matplotlib (fig, ax) result"""
+        if not self.enabled:
+            return
+        if isinstance(figure, go.Figure):
+            kind, payload = 'json', figure.to_json().encode('utf-8')
+        elif isinstance(figure, tuple) and figure and isinstance(figure[0], plt.Figure):
+            buffer = io.BytesIO()
+            figure[0].savefig(buffer, format='png', dpi=self.PNG_DPI)
+            kind, payload = 'png', buffer.getvalue()
+        else:
+            return
+        if not self._secure_dir(create=True):
+            return
+        path = self._path(key, kind)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+        self._evict()
+
+    def _evict(self):
+        """Remove least recently used entries until the cache fits in max_bytes"""
+        entries = []
+        total = 0
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_file() and not entry.name.endswith('.tmp'):
+                info = entry.stat()
+                entries.append((info.st_mtime, info.st_size, entry.path))
+                total += info.st_size
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+
+    def clear(self):
+        """Delete every cached figure"""
+        if self._secure_dir():
+            for entry in os.scandir(self.cache_dir):
+                if entry.is_file():
+                    os.remove(entry.path)
+        self.hits = self.misses = 0
+
+
+def cached_figure(chart: str):
+    """Decorator that serves a plotting helper's result from PlottingUtils.figure_cache"""
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            cache = PlottingUtils.figure_cache
+            if cache is None or not cache.enabled:
+                return func(*args, **kwargs)
+            # Cached results skip the helper body; keep its global styling side effect
+            PlottingUtils.setup_plot_style()
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            params = dict(bound.arguments)
+            data = tuple(params.pop(name) for name in list(params)
+                         if isinstance(params[name], (pd.DataFrame, pd.Series, np.ndarray, dict, list)))
+            key = cache.make_key(chart, data, **params)
+            result = cache.get(key)
+            if result is None:
+                result = func(*args, **kwargs)
+                cache.put(key, result)
+            return result
+        return wrapper
+    return decorator
+
+
 class PlottingUtils:
     """Professional plotting utilities with bootcamp styling"""
     
@@ -438,6 +1730,10 @@ class PlottingUtils:
         'palette': ['#6C63FF', '#00D084', '#FFB800', '#4ECDC4', '#FF5E5B', '#9B59B6', '#3498DB', '#E67E22', '#1ABC9C', '#34495E']
     }
     
+    # Opt in with figure_cache.enabled = True to reuse stored figures when a
+    # cell is re-run with unchanged data.
+    figure_cache = FigureCache()
+    
     @staticmethod
     def setup_plot_style():
         """Set bootcamp plot styling"""
@@ -454,6 +1750,7 @@ class PlottingUtils:
         plt.rcParams['ytick.labelsize'] = 11
         
     @staticmethod
+    @cached_figure('bar')
     def create_bar_chart(data, title="Bar Chart", xlabel="Categories", ylabel="Values", 
                         color_palette=None, figsize=(10, 6)):
         """Create a professional bar chart"""
@@ -489,6 +1786,7 @@ class PlottingUtils:
         return fig, ax
     
     @staticmethod
+    @cached_figure('scatter')
     def create_scatter_plot(x, y, title="Scatter Plot", xlabel="X Values", ylabel="Y Values",
                            color=None, size=50, alpha=0.7, figsize=(10, 6)):
         """Create a professional scatter plot"""
@@ -510,6 +1808,7 @@ class PlottingUtils:
         return fig, ax
     
     @staticmethod
+    @cached_figure('pie')
     def create_pie_chart(data, title="Pie Chart", figsize=(8, 8), autopct='%1.1f%%'):
         """Create a professional pie chart"""
         PlottingUtils.setup_plot_style()
@@ -539,6 +1838,7 @@ class PlottingUtils:
         return fig, ax
     
     @staticmethod
+    @cached_figure('heatmap')
     def create_correlation_heatmap(df, title="Correlation Matrix", figsize=(10, 8)):
         """Create a correlation heatmap with professional styling"""
         PlottingUtils.setup_plot_style()
@@ -570,37 +1870,1809 @@ class PlottingUtils:
         return fig, ax
 
 
-class DataAnalysisUtils:
-    """Utility functions for common data analysis tasks"""
+class ProfileCache:
+    """
+    Process-wide, memory-bounded cache of profiling results.
+    
+    Results are keyed on a cheap fingerprint of the frame (object identity,
+    shape, column names, dtypes and a hash of ``sample_rows`` evenly spaced
+    rows) plus the operation and its parameters, so a lookup costs far less
+    than the profiling it saves. Replacing a frame or adding columns gives a
+    new fingerprint, but in-place edits to unsampled rows do not: call
+    ``invalidate(df)`` after modifying a frame in place, or pass
+    ``full_hash=True`` to hash every row on every lookup. Least recently
+    used results are evicted once their estimated size passes ``max_bytes``.
+    """
+    
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, sample_rows: int = 1024,
+                 full_hash: bool = False):
+        self.max_bytes = max_bytes
+        self.sample_rows = sample_rows
+        self.full_hash = full_hash
+        self.enabled = True
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+    
+    def fingerprint(self, df) -> str:
+        """Identity, schema and sampled-row fingerprint of a DataFrame or Series"""
+        if self.full_hash:
+            return FigureCache.fingerprint(df)
+        digest = hashlib.blake2b(digest_size=16)
+        if isinstance(df, pd.Series):
+            digest.update(repr((id(df), df.shape, df.name, str(df.dtype))).encode())
+        else:
+            digest.update(repr((id(df), df.shape, list(df.columns), [str(t) for t in df.dtypes])).encode())
+        if len(df):
+            positions = np.unique(np.linspace(0, len(df) - 1, self.sample_rows).astype(np.int64))
+            digest.update(pd.util.hash_pandas_object(df.iloc[positions], index=True).values.tobytes())
+        return digest.hexdigest()
     
     @staticmethod
-    def create_data_dictionary(df):
-        """Create a data dictionary for a DataFrame"""
-        data_dict = []
-        for col in df.columns:
-            dtype = str(df[col].dtype)
-            null_count = df[col].isnull().sum()
-            unique_count = df[col].nunique()
-            
-            if df[col].dtype in ['int64', 'float64']:
-                stats = f"Mean: {df[col].mean():.2f}, Std: {df[col].std():.2f}"
-            else:
-                top_value = df[col].mode().iloc[0] if len(df[col].mode()) > 0 else "N/A"
+    def _size_of(value) -> int:
+        """Rough in-memory size of a cached result"""
+        if isinstance(value, (pd.DataFrame, pd.Series)):
+            usage = value.memory_usage(deep=True)
+            return int(usage.sum() if isinstance(value, pd.DataFrame) else usage)
+        if isinstance(value, dict):
+            return sum(ProfileCache._size_of(v) for v in value.values()) + sys.getsizeof(value)
+        return sys.getsizeof(value)
+    
+    def get_or_compute(self, df, name: str, compute: Callable, **params):
+        """Return the cached result of ``name`` for this frame, computing it on a miss"""
+        key = (self.fingerprint(df), name, repr(sorted(params.items())))
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                # Hand out a copy so callers can't mutate the cached result
+                return copy.deepcopy(self._entries[key][0])
+        
+        result = compute()
+        size = self._size_of(result)
+        with self._lock:
+            self.misses += 1
+            if size <= self.max_bytes:
+                if key in self._entries:
+                    self._bytes -= self._entries.pop(key)[1]
+                self._entries[key] = (copy.deepcopy(result), size)
+                self._bytes += size
+                while self._bytes > self.max_bytes:
+                    _, (_, evicted_size) = self._entries.popitem(last=False)
+                    self._bytes -= evicted_size
+        return result
+    
+    def invalidate(self, df=None):
+        """Drop cached results for ``df`` (or everything when df is None)"""
+        with self._lock:
+            if df is None:
+                self._entries.clear()
+                self._bytes = 0
+                return
+            fingerprint = self.fingerprint(df)
+            for key in [k for k in self._entries if k[0] == fingerprint]:
+                self._bytes -= self._entries.pop(key)[1]
+    
+    def clear(self):
+        """Drop every cached result and reset the hit counters"""
+        self.invalidate()
+        self.hits = self.misses = 0
+
+
+class ColumnProfiler:
+    """
+    Vectorized per-column profiling engine.
+    
+    Columns are grouped into work units by dtype. Numeric columns sharing a
+    dtype are reduced together as one 2-D NumPy block; every other column is
+    factorized once and its null count, cardinality and mode are all derived
+    from the integer codes. This replaces one full scan per statistic per
+    column with a handful of batched passes.
+    
+    Work units are independent and NumPy reductions release the GIL, so on
+    large frames they are spread over a thread pool (``workers``).
+    """
+    
+    # Default thread count (None = one per CPU core)
+    WORKERS = None
+    # Frames with fewer cells than this are profiled on the calling thread
+    PARALLEL_MIN_CELLS = 1_000_000
+    # Repeat profiling of unchanged data is served from here (None disables)
+    cache = ProfileCache()
+    
+    @staticmethod
+    def is_numeric(dtype) -> bool:
+        """True for numeric dtypes of any width (int32, float32, Int64, ...); bool is not numeric"""
+        return pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+    
+    @staticmethod
+    def plan(df, unit_columns: int = None) -> List[Tuple[str, List[int]]]:
+        """
+        Split column positions into ('numeric', [...]) and ('categorical', [pos])
+        work units; numeric units hold at most ``unit_columns`` columns.
+        """
+        numeric_groups = {}
+        categorical_units = []
+        for pos, dtype in enumerate(df.dtypes):
+            if ColumnProfiler.is_numeric(dtype):
+                # Extension dtypes (Int64, Float64) are profiled as float64 together
+                key = str(dtype) if isinstance(dtype, np.dtype) else 'extension'
+                numeric_groups.setdefault(key, []).append(pos)
+            else:
+                categorical_units.append(('categorical', [pos]))
+        numeric_units = []
+        for positions in numeric_groups.values():
+            step = unit_columns or len(positions)
+            numeric_units.extend(('numeric', positions[i:i + step]) for i in range(0, len(positions), step))
+        return numeric_units + categorical_units
+    
+    @staticmethod
+    def _resolve_workers(df, workers: int = None) -> int:
+        """Thread count to use for ``df``: 1 for small frames, else workers/WORKERS/CPU count"""
+        if workers is None:
+            if df.size < ColumnProfiler.PARALLEL_MIN_CELLS:
+                return 1
+            workers = ColumnProfiler.WORKERS or os.cpu_count() or 1
+        return max(1, min(workers, df.shape[1]))
+    
+    @staticmethod
+    def _map(func, items, workers: int) -> List[Any]:
+        """Apply ``func`` to each item, on a thread pool when workers > 1, keeping input order"""
+        if workers <= 1 or len(items) <= 1:
+            return [func(item) for item in items]
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(func, items))
+    
+    @staticmethod
+    def cached(df, name: str, compute: Callable, **params):
+        """Serve ``compute()`` for this frame from ColumnProfiler.cache when enabled"""
+        cache = ColumnProfiler.cache
+        if cache is None or not cache.enabled:
+            return compute()
+        return cache.get_or_compute(df, name, compute, **params)
+    
+    @staticmethod
+    def _profile_numeric(df, positions: List[int]) -> List[Dict[str, Any]]:
+        """Null count, distinct count, mean and std for a block of same-dtype numeric columns"""
+        block_df = df.iloc[:, positions]
+        if all(isinstance(dtype, np.dtype) for dtype in block_df.dtypes.tolist()):
+            block = block_df.to_numpy()
+        else:
+            block = block_df.to_numpy(dtype='float64', na_value=np.nan)
+        # One row per column; pandas stores blocks this way, so .T is usually a free view
+        block = np.ascontiguousarray(block.T)
+        n_rows = block.shape[1]
+        
+        missing = np.isnan(block) if block.dtype.kind == 'f' else None
+        if missing is not None and missing.any():
+            valid_counts = n_rows - missing.sum(axis=1)
+            means = np.nanmean(block, axis=1, dtype=np.float64)
+            stds = np.nanstd(block, axis=1, dtype=np.float64, ddof=1)
+        else:
+            missing = None
+            valid_counts = np.full(block.shape[0], n_rows)
+            means = block.mean(axis=1, dtype=np.float64)
+            stds = block.std(axis=1, dtype=np.float64, ddof=1)
+        null_counts = n_rows - valid_counts
+        
+        # Distinct values: sort every column at once and count value changes (NaNs sort last)
+        ordered = np.sort(block, axis=1)
+        changes = ordered[:, 1:] != ordered[:, :-1]
+        if missing is not None:
+            changes &= ~np.isnan(ordered[:, 1:])
+        unique_counts = changes.sum(axis=1) + (valid_counts > 0)
+        
+        stds = np.where(valid_counts > 1, stds, np.nan)
+        return [{
+            'position': pos,
+            'null_count': int(null_counts[i]),
+            'unique_count': int(unique_counts[i]),
+            'numeric': True,
+            'mean': float(means[i]),
+            'std': float(stds[i]),
+            'top_value': None,
+            'has_top_value': False
+        } for i, pos in enumerate(positions)]
+    
+    @staticmethod
+    def factorize(series: pd.Series) -> Tuple[np.ndarray, Any]:
+        """Integer codes (-1 for missing) and unique values of a column, in one hashing pass"""
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            # Already factorized: reuse the stored codes
+            return series.cat.codes.to_numpy(), series.cat.categories
+        return pd.factorize(series)
+    
+    @staticmethod
+    def mode_from_counts(uniques, counts: np.ndarray, is_categorical: bool = False):
+        """Most frequent value given per-code counts, resolving ties like Series.mode()"""
+        if not len(counts) or counts.max() == 0:
+            return None, False
+        tied = uniques[np.flatnonzero(counts == counts.max())]
+        if is_categorical:
+            # Categories are already in their declared order
+            return tied[0], True
+        # Match Series.mode(), which returns tied modes sorted
+        try:
+            return sorted(tied)[0], True
+        except TypeError:
+            return tied[0], True
+    
+    @staticmethod
+    def _profile_categorical(df, positions: List[int]) -> List[Dict[str, Any]]:
+        """Null count, distinct count and mode from a single factorization per column"""
+        results = []
+        for pos in positions:
+            series = df.iloc[:, pos]
+            codes, uniques = ColumnProfiler.factorize(series)
+            
+            null_count = int((codes < 0).sum())
+            counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+            unique_count = int((counts > 0).sum())
+            top_value, has_top_value = ColumnProfiler.mode_from_counts(
+                uniques, counts, isinstance(series.dtype, pd.CategoricalDtype))
+            
+            results.append({
+                'position': pos,
+                'null_count': null_count,
+                'unique_count': unique_count,
+                'numeric': False,
+                'mean': np.nan,
+                'std': np.nan,
+                'top_value': top_value,
+                'has_top_value': has_top_value
+            })
+        return results
+    
+    @staticmethod
+    def _run_unit(df, unit: Tuple[str, List[int]]) -> List[Dict[str, Any]]:
+        kind, positions = unit
+        if kind == 'numeric':
+            return ColumnProfiler._profile_numeric(df, positions)
+        return ColumnProfiler._profile_categorical(df, positions)
+    
+    @staticmethod
+    def profile(df, workers: int = None) -> pd.DataFrame:
+        """
+        Profile every column of ``df``.
+        
+        Returns one row per column, in the original column order, with
+        column, dtype, null_count, unique_count, numeric, mean, std,
+        top_value and has_top_value. ``workers`` overrides the thread count.
+        Results for unchanged data come from ColumnProfiler.cache.
+        """
+        return ColumnProfiler.cached(df, 'profile', lambda: ColumnProfiler._compute_profile(df, workers))
+    
+    @staticmethod
+    def _compute_profile(df, workers: int = None) -> pd.DataFrame:
+        workers = ColumnProfiler._resolve_workers(df, workers)
+        # Split numeric blocks so every thread gets a share of the columns
+        unit_columns = -(-df.shape[1] // workers) if workers > 1 else None
+        units = ColumnProfiler.plan(df, unit_columns)
+        
+        results = []
+        for unit_results in ColumnProfiler._map(lambda unit: ColumnProfiler._run_unit(df, unit), units, workers):
+            results.extend(unit_results)
+        results.sort(key=lambda r: r['position'])
+        
+        dtypes = list(df.dtypes)
+        for r in results:
+            r['column'] = df.columns[r['position']]
+            r['dtype'] = str(dtypes[r['position']])
+        
+        columns = ['column', 'dtype', 'null_count', 'unique_count', 'numeric',
+                   'mean', 'std', 'top_value', 'has_top_value']
+        return pd.DataFrame(results, columns=columns)
+    
+    @staticmethod
+    def null_counts(df, workers: int = None) -> pd.Series:
+        """Per-column missing-value counts (like df.isnull().sum()), computed in parallel"""
+        # Not cached: counting nulls is about as cheap as fingerprinting the frame
+        workers = ColumnProfiler._resolve_workers(df, workers)
+        step = -(-df.shape[1] // workers) if df.shape[1] else 1
+        slices = [slice(i, i + step) for i in range(0, df.shape[1], step)]
+        parts = ColumnProfiler._map(lambda cols: df.iloc[:, cols].isnull().sum(), slices, workers)
+        return pd.concat(parts) if parts else df.isnull().sum()
+    
+    @staticmethod
+    def describe(df, workers: int = None) -> pd.DataFrame:
+        """
+        Equivalent of ``df.describe()`` for numeric columns, computed in
+        parallel over column blocks with NumPy (which releases the GIL).
+        Frames without numeric columns fall back to ``df.describe()``.
+        """
+        return ColumnProfiler.cached(df, 'describe', lambda: ColumnProfiler._compute_describe(df, workers))
+    
+    @staticmethod
+    def _compute_describe(df, workers: int = None) -> pd.DataFrame:
+        positions = [pos for pos, dtype in enumerate(df.dtypes)
+                     if pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)]
+        if not positions:
+            return df.describe()
+        workers = ColumnProfiler._resolve_workers(df, workers)
+        step = -(-len(positions) // workers)
+        
+        def describe_block(block_positions):
+            block = df.iloc[:, block_positions].to_numpy(dtype='float64', na_value=np.nan).T
+            counts = (~np.isnan(block)).sum(axis=1)
+            return np.vstack([
+                counts,
+                np.nanmean(block, axis=1),
+                np.nanstd(block, axis=1, ddof=1),
+                np.nanmin(block, axis=1),
+                np.nanquantile(block, [0.25, 0.5, 0.75], axis=1),
+                np.nanmax(block, axis=1)
+            ])
+        
+        blocks = [positions[i:i + step] for i in range(0, len(positions), step)]
+        stats = np.hstack(ColumnProfiler._map(describe_block, blocks, workers))
+        return pd.DataFrame(stats, index=['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max'],
+                            columns=df.columns[positions])
+
+
+def iter_chunks(source, chunksize: int = 100_000, columns: List[str] = None):
+    """
+    Yield DataFrame chunks from a DataFrame, a CSV/Parquet path or an
+    iterable of DataFrames, so large files never have to fit in memory.
+    """
+    if isinstance(source, pd.DataFrame):
+        frame = source if columns is None else source[columns]
+        for start in range(0, max(len(frame), 1), chunksize):
+            yield frame.iloc[start:start + chunksize]
+    elif isinstance(source, (str, os.PathLike)):
+        path = os.fspath(source)
+        if path.endswith(('.parquet', '.pq')):
+            try:
+                import pyarrow.parquet as pq
+            except ImportError:
+                raise ImportError("Reading Parquet files in chunks requires pyarrow: pip install pyarrow")
+            for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize, columns=columns):
+                yield batch.to_pandas()
+        else:
+            yield from pd.read_csv(path, chunksize=chunksize, usecols=columns)
+    else:
+        for chunk in source:
+            yield chunk if columns is None else chunk[columns]
+
+
+class ChunkedSource:
+    """
+    Chunk source that can be scanned more than once.
+    
+    DataFrames and CSV/Parquet paths are simply read again on every scan. A
+    one-shot iterable of chunks is spilled to pickle files in a temporary
+    directory as it is first read, and later scans replay those files, so
+    the data can be rescanned without ever being held in memory. ``rows`` is
+    known once a scan has completed.
+    """
+    
+    def __init__(self, source, chunksize: int = 100_000, spill_dir: str = None):
+        self.source = source
+        self.chunksize = chunksize
+        self.spill_dir = spill_dir
+        self.rereadable = isinstance(source, (pd.DataFrame, str, os.PathLike))
+        self.rows = len(source) if isinstance(source, pd.DataFrame) else None
+        self._spilled = None
+        self._owns_spill_dir = False
+    
+    def _spill(self, chunk, paths: List[str]):
+        path = os.path.join(self.spill_dir, f"chunk{len(paths):06d}.pkl")
+        with open(path, 'wb') as f:
+            pickle.dump(chunk, f, protocol=pickle.HIGHEST_PROTOCOL)
+        paths.append(path)
+        return len(chunk)
+    
+    def scan(self, columns: List[str] = None):
+        """Yield the chunks of one full pass over the data"""
+        if self.rereadable:
+            rows = 0
+            for chunk in iter_chunks(self.source, self.chunksize, columns):
+                rows += len(chunk)
+                yield chunk
+            self.rows = rows
+        elif self._spilled is not None:
+            for path in self._spilled:
+                with open(path, 'rb') as f:
+                    chunk = pickle.load(f)
+                yield chunk if columns is None else chunk[columns]
+        else:
+            if self.spill_dir is None:
+                self.spill_dir = tempfile.mkdtemp(prefix='chunked_source_')
+                self._owns_spill_dir = True
+            chunks = iter_chunks(self.source, self.chunksize)
+            paths = []
+            rows = 0
+            try:
+                for chunk in chunks:
+                    rows += self._spill(chunk, paths)
+                    yield chunk if columns is None else chunk[columns]
+            finally:
+                # A scan abandoned part way still spills the rest, since the
+                # iterable can't be restarted
+                for chunk in chunks:
+                    rows += self._spill(chunk, paths)
+                self._spilled = paths
+                self.rows = rows
+    
+    def close(self):
+        """Delete spilled chunks"""
+        for path in self._spilled or []:
+            if os.path.exists(path):
+                os.remove(path)
+        if self._owns_spill_dir and os.path.isdir(self.spill_dir):
+            os.rmdir(self.spill_dir)
+            self.spill_dir = None
+        self._spilled = None
+
+
+class HyperLogLog:
+    """
+    Mergeable distinct-count sketch.
+    
+    Uses 2**precision one-byte registers (16 KB at the default precision of
+    14) regardless of how many values are added. The relative standard error
+    of ``count()`` is about 1.04 / sqrt(2**precision), i.e. ~0.8%.
+    """
+    
+    def __init__(self, precision: int = 14):
+        if not 4 <= precision <= 18:
+            raise ValueError("precision must be between 4 and 18")
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+    
+    def update(self, values):
+        """Add non-null values (array-like) to the sketch"""
+        values = np.asarray(values)
+        if len(values):
+            self.update_hashes(pd.util.hash_array(values))
+    
+    def update_hashes(self, hashes):
+        """Add precomputed 64-bit hashes to the sketch"""
+        index, rank = HyperLogLog.register_ranks(hashes, self.precision)
+        np.maximum.at(self.registers, index, rank)
+    
+    @staticmethod
+    def register_ranks(hashes, precision: int):
+        """Register index and rank for each 64-bit hash"""
+        bits = 64 - precision
+        index = (hashes >> np.uint64(bits)).astype(np.int64)
+        rest = hashes & np.uint64((1 << bits) - 1)
+        # Rank = position of the leftmost 1-bit in the remaining bits
+        highest = np.floor(np.log2(np.maximum(rest, 1).astype(np.float64)))
+        rank = np.where(rest > 0, bits - highest, bits + 1).astype(np.uint8)
+        return index, rank
+    
+    @staticmethod
+    def estimate(registers):
+        """Distinct-count estimate(s) from a register array (one sketch per row if 2-D)"""
+        registers = np.asarray(registers)
+        m = registers.shape[-1]
+        alpha = {16: 0.673, 32: 0.697, 64: 0.709}.get(m, 0.7213 / (1 + 1.079 / m))
+        estimate = alpha * m * m / np.sum(np.exp2(-registers.astype(np.float64)), axis=-1)
+        zeros = np.count_nonzero(registers == 0, axis=-1)
+        # Linear counting is more accurate for small cardinalities
+        small = (estimate <= 2.5 * m) & (zeros > 0)
+        linear = m * np.log(m / np.maximum(zeros, 1))
+        return np.where(small, linear, estimate)
+    
+    def merge(self, other: 'HyperLogLog'):
+        """Fold another sketch of the same precision into this one"""
+        if other.precision != self.precision:
+            raise ValueError("Can only merge HyperLogLog sketches with the same precision")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+    
+    def count(self) -> float:
+        """Estimated number of distinct values"""
+        return float(HyperLogLog.estimate(self.registers))
+
+
+class TDigest:
+    """
+    Mergeable quantile sketch (merging t-digest).
+    
+    Keeps at most about ``compression`` weighted centroids, with small
+    centroids near the tails, so memory is constant. Quantile estimates are
+    typically within 1% in rank (much better near 0 and 1) at the default
+    compression of 200; min and max are exact.
+    """
+    
+    def __init__(self, compression: int = 200):
+        self.compression = compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.count = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+    
+    def update(self, values):
+        """Add numeric values (NaNs are ignored)"""
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values):
+            self.min = min(self.min, float(values.min()))
+            self.max = max(self.max, float(values.max()))
+            self._merge(values, np.ones(len(values)))
+    
+    def merge(self, other: 'TDigest'):
+        """Fold another digest into this one"""
+        if other.count:
+            self.min = min(self.min, other.min)
+            self.max = max(self.max, other.max)
+            self._merge(other.means, other.weights)
+        return self
+    
+    def _merge(self, means, weights):
+        means = np.concatenate([self.means, means])
+        weights = np.concatenate([self.weights, weights])
+        order = np.argsort(means, kind='mergesort')
+        means, weights = means[order], weights[order]
+        total = weights.sum()
+        
+        # k1 scale function: each centroid may span at most one unit of k
+        q_left = (np.cumsum(weights) - weights) / total
+        k = self.compression / (2 * np.pi) * np.arcsin(np.clip(2 * q_left - 1, -1, 1))
+        bucket = np.floor(k - k[0]).astype(np.int64)
+        starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+        
+        self.weights = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / self.weights
+        self.count = float(total)
+    
+    def quantile(self, q):
+        """Estimated quantile(s) for q in [0, 1]"""
+        if not self.count:
+            return np.full(np.shape(q), np.nan) if np.ndim(q) else np.nan
+        centers = np.cumsum(self.weights) - self.weights / 2
+        positions = np.concatenate([[0.0], centers, [self.count]])
+        values = np.concatenate([[self.min], self.means, [self.max]])
+        result = np.interp(np.asarray(q, dtype=np.float64) * self.count, positions, values)
+        return result if np.ndim(q) else float(result)
+
+
+class MisraGries:
+    """
+    Mergeable heavy-hitters sketch for top values.
+    
+    Keeps at most ``k`` counters. Every value occurring more than
+    N / (k + 1) times is guaranteed to be kept, and each reported count
+    underestimates the true count by at most ``error_bound()``.
+    """
+    
+    def __init__(self, k: int = 64):
+        self.k = k
+        self.counters = pd.Series(dtype=np.int64)
+        self.total = 0
+    
+    def update(self, values):
+        """Add non-null values (array-like) to the sketch"""
+        counts = pd.Series(values).value_counts(dropna=True)
+        self.total += int(counts.sum())
+        self._merge_counts(counts)
+    
+    def merge(self, other: 'MisraGries'):
+        """Fold another sketch into this one"""
+        self.total += other.total
+        self._merge_counts(other.counters)
+        return self
+    
+    def _merge_counts(self, counts):
+        if len(self.counters):
+            counts = self.counters.add(counts, fill_value=0).astype(np.int64)
+        if len(counts) > self.k:
+            # Subtract the (k+1)-th largest count and drop what falls to zero
+            threshold = counts.nlargest(self.k + 1).iloc[-1]
+            counts = counts[counts > threshold] - threshold
+        self.counters = counts
+    
+    def error_bound(self) -> float:
+        """Maximum undercount of any reported value"""
+        return (self.total - int(self.counters.sum())) / (self.k + 1)
+    
+    def top(self, n: int = None):
+        """Most frequent values and their (lower-bound) counts, largest first"""
+        top = self.counters.sort_values(ascending=False, kind='mergesort')
+        return top if n is None else top.head(n)
+
+
+class ReservoirSampler:
+    """
+    Fixed-size uniform random sample of a stream of chunks.
+    
+    Reservoir sampling (Algorithm R), vectorized per chunk: after any number
+    of rows every row seen has the same chance of being in the sample. Only
+    sampled rows are retained, and a fixed seed makes the sample
+    reproducible.
+    """
+    
+    def __init__(self, size: int = 10_000, seed: int = 0):
+        self.size = size
+        self.seen = 0
+        self._rng = np.random.default_rng(seed)
+        self._empty = None
+        # Sample slot -> (piece, row within piece); a piece holds the
+        # sampled rows of one chunk
+        self._pieces = {}
+        self._next_piece = 0
+        self._slot_piece = np.full(size, -1, dtype=np.int64)
+        self._slot_row = np.full(size, -1, dtype=np.int64)
+    
+    def update(self, chunk: pd.DataFrame):
+        """Add one chunk of rows"""
+        if self._empty is None:
+            self._empty = chunk.iloc[:0]
+        n = len(chunk)
+        fill = min(max(self.size - self.seen, 0), n)
+        slots = np.arange(self.seen, self.seen + fill)
+        rows = np.arange(fill)
+        if fill < n:
+            rest = np.arange(fill, n)
+            # Stream row i takes a random slot with probability size / (i + 1)
+            targets = (self._rng.random(n - fill) * (self.seen + rest + 1)).astype(np.int64)
+            hit = targets < self.size
+            targets, rest = targets[hit], rest[hit]
+            # When several rows of the chunk land on one slot, the last wins
+            _, last = np.unique(targets[::-1], return_index=True)
+            keep = len(targets) - 1 - last
+            slots = np.concatenate([slots, targets[keep]])
+            rows = np.concatenate([rows, rest[keep]])
+        self.seen += n
+        
+        if len(slots):
+            kept = np.unique(rows)
+            number = self._next_piece
+            self._next_piece += 1
+            self._pieces[number] = chunk.iloc[kept]
+            self._slot_piece[slots] = number
+            self._slot_row[slots] = np.searchsorted(kept, rows)
+            live = set(np.unique(self._slot_piece).tolist())
+            for stale in [p for p in self._pieces if p not in live]:
+                del self._pieces[stale]
+        return self
+    
+    def observe(self, chunks):
+        """Pass chunks through unchanged while sampling them"""
+        for chunk in chunks:
+            self.update(chunk)
+            yield chunk
+    
+    def sample(self) -> pd.DataFrame:
+        """The sampled rows, in stream order"""
+        filled = min(self.seen, self.size)
+        pieces, rows = self._slot_piece[:filled], self._slot_row[:filled]
+        parts = [self._pieces[p].iloc[np.sort(rows[pieces == p])] for p in sorted(self._pieces)]
+        if not parts:
+            return self._empty if self._empty is not None else pd.DataFrame()
+        return pd.concat(parts)
+
+
+class StratifiedSampler:
+    """
+    Stratified sample of a stream of chunks: one seeded reservoir per value
+    of ``by``, so small groups stay visible next to large ones. Exact group
+    sizes are counted along the way. Memory grows with the number of
+    groups, so stratify by low-cardinality columns.
+    """
+    
+    def __init__(self, by: str, size: int = 10_000, seed: int = 0):
+        self.by = by
+        self.size = size
+        self.seed = seed
+        self.counts = {}
+        self._samplers = {}
+    
+    def update(self, chunk: pd.DataFrame):
+        """Add one chunk of rows"""
+        for key, group in chunk.groupby(self.by, sort=False, dropna=False, observed=True):
+            if key not in self._samplers:
+                self._samplers[key] = ReservoirSampler(self.size, seed=self.seed + len(self._samplers))
+                self.counts[key] = 0
+            self._samplers[key].update(group)
+            self.counts[key] += len(group)
+        return self
+    
+    def sample(self, total: int = None) -> pd.DataFrame:
+        """
+        Sampled rows of every group. With ``total`` each group keeps at
+        most total // groups rows (a seeded uniform subset of its
+        reservoir, so still a uniform sample of the group).
+        """
+        per_group = max(1, total // len(self._samplers)) if total and self._samplers else None
+        rng = np.random.default_rng(self.seed)
+        parts = []
+        for sampler in self._samplers.values():
+            sample = sampler.sample()
+            if per_group is not None and len(sample) > per_group:
+                sample = sample.iloc[np.sort(rng.choice(len(sample), per_group, replace=False))]
+            parts.append(sample)
+        return pd.concat(parts) if parts else pd.DataFrame()
+
+
+class ColumnSketch:
+    """
+    Constant-memory summary of one column, built from chunks and mergeable.
+    
+    Row and null counts, mean and std are exact; distinct counts, quantiles
+    and top values come from HyperLogLog, TDigest and MisraGries sketches.
+    Top values are tracked for non-numeric columns unless ``track_top`` says
+    otherwise; distinct counts and quantiles can be switched off when only
+    moments or bounds are needed.
+    """
+    
+    def __init__(self, precision: int = 14, compression: int = 200, top_k: int = 64,
+                 track_top: bool = None, track_distinct: bool = True,
+                 track_quantiles: bool = True):
+        self.track_top = track_top
+        self.track_distinct = track_distinct
+        self.track_quantiles = track_quantiles
+        self.dtype = None
+        self.numeric = None
+        self.count = 0
+        self.null_count = 0
+        self.distinct = HyperLogLog(precision)
+        self.quantiles = TDigest(compression)
+        self.top = MisraGries(top_k)
+        # Running moments of the non-null numeric values (Chan et al.)
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+    
+    def _observe_dtype(self, dtype):
+        numeric = ColumnProfiler.is_numeric(dtype)
+        if self.dtype is None:
+            self.dtype, self.numeric = dtype, numeric
+        elif dtype != self.dtype:
+            if self.numeric and numeric and isinstance(dtype, np.dtype) and isinstance(self.dtype, np.dtype):
+                self.dtype = np.result_type(self.dtype, dtype)
+            else:
+                self.dtype = np.dtype(object)
+            self.numeric = self.numeric and numeric
+    
+    def _add_moments(self, n, mean, m2):
+        if not n:
+            return
+        total = self.n + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += m2 + delta * delta * self.n * n / total
+        self.n = total
+    
+    def update(self, series: pd.Series):
+        """Add one chunk of the column"""
+        self._observe_dtype(series.dtype)
+        missing = series.isnull().to_numpy()
+        self.count += len(series)
+        self.null_count += int(missing.sum())
+        values = series.to_numpy()[~missing] if missing.any() else series.to_numpy()
+        
+        if self.numeric:
+            values = np.asarray(values, dtype=np.float64)
+            if self.track_distinct:
+                self.distinct.update(values)
+            if self.track_quantiles:
+                self.quantiles.update(values)
+            if len(values):
+                mean = values.mean()
+                self._add_moments(len(values), mean, float(((values - mean) ** 2).sum()))
+        elif self.track_distinct:
+            self.distinct.update(values)
+        
+        if self.track_top or (self.track_top is None and not self.numeric):
+            self.top.update(values)
+        return self
+    
+    def merge(self, other: 'ColumnSketch'):
+        """Fold another sketch of the same column into this one"""
+        if other.dtype is not None:
+            self._observe_dtype(other.dtype)
+        self.count += other.count
+        self.null_count += other.null_count
+        self.distinct.merge(other.distinct)
+        self.quantiles.merge(other.quantiles)
+        self.top.merge(other.top)
+        self._add_moments(other.n, other.mean, other.m2)
+        return self
+    
+    @property
+    def std(self) -> float:
+        """Sample standard deviation (ddof=1), exact"""
+        return float(np.sqrt(self.m2 / (self.n - 1))) if self.n > 1 else np.nan
+    
+    def unique_count(self) -> int:
+        """Estimated number of distinct non-null values"""
+        return int(round(self.distinct.count())) if self.count > self.null_count else 0
+    
+    def summary(self) -> Dict[str, Any]:
+        """Summary in the same layout as a ColumnProfiler.profile row"""
+        top = self.top.top(1)
+        return {
+            'dtype': str(self.dtype),
+            'null_count': self.null_count,
+            'unique_count': self.unique_count(),
+            'numeric': bool(self.numeric),
+            'mean': self.mean if self.numeric and self.n else np.nan,
+            'std': self.std if self.numeric else np.nan,
+            'top_value': top.index[0] if len(top) else None,
+            'has_top_value': bool(len(top)) and not self.numeric
+        }
+
+
+class StreamingProfiler:
+    """
+    Approximate, constant-memory profiling over chunks.
+    
+    Accepts anything ``iter_chunks`` does (a DataFrame, a CSV/Parquet path
+    or an iterable of chunks) and makes a single pass. Per-column sketches
+    are mergeable, so partial results from separate files or workers can be
+    combined with ``merge``.
+    """
+    
+    @staticmethod
+    def sketch(source, chunksize: int = 100_000, columns: List[str] = None,
+               **sketch_options) -> Dict[str, ColumnSketch]:
+        """Build a ColumnSketch per column in one streaming pass"""
+        sketches = {}
+        for chunk in iter_chunks(source, chunksize, columns):
+            for col in chunk.columns:
+                if col not in sketches:
+                    sketches[col] = ColumnSketch(**sketch_options)
+                sketches[col].update(chunk[col])
+        return sketches
+    
+    @staticmethod
+    def merge(*sketch_sets: Dict[str, ColumnSketch]) -> Dict[str, ColumnSketch]:
+        """Combine per-column sketches built over different parts of the data"""
+        merged = {}
+        for sketches in sketch_sets:
+            for col, sketch in sketches.items():
+                if col in merged:
+                    merged[col].merge(sketch)
+                else:
+                    merged[col] = copy.deepcopy(sketch)
+        return merged
+    
+    @staticmethod
+    def profile(source, chunksize: int = 100_000, sketches: Dict[str, ColumnSketch] = None) -> pd.DataFrame:
+        """Approximate equivalent of ColumnProfiler.profile for any chunk source"""
+        if sketches is None:
+            sketches = StreamingProfiler.sketch(source, chunksize)
+        rows = [dict(column=col, **sketch.summary()) for col, sketch in sketches.items()]
+        columns = ['column', 'dtype', 'null_count', 'unique_count', 'numeric',
+                   'mean', 'std', 'top_value', 'has_top_value']
+        return pd.DataFrame(rows, columns=columns)
+    
+    @staticmethod
+    def describe(sketches: Dict[str, ColumnSketch]) -> pd.DataFrame:
+        """Approximate ``df.describe()`` for the numeric columns (quartiles from the digests)"""
+        stats = {}
+        for col, sketch in sketches.items():
+            if not sketch.numeric:
+                continue
+            quartiles = sketch.quantiles.quantile([0.25, 0.5, 0.75])
+            stats[col] = [sketch.n, sketch.mean if sketch.n else np.nan, sketch.std,
+                          sketch.quantiles.min if sketch.n else np.nan, *quartiles,
+                          sketch.quantiles.max if sketch.n else np.nan]
+        return pd.DataFrame(stats, index=['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max'])
+    
+    @staticmethod
+    def histogram(source, column, bins: int = 50, value_range: Tuple[float, float] = None,
+                  chunksize: int = 100_000) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Exact histogram (counts, edges) of a numeric column in one pass.
+        Without ``value_range`` the column is scanned once more for its
+        bounds, so pass them when they are already known from a sketch.
+        """
+        if value_range is None:
+            low, high = np.inf, -np.inf
+            for chunk in iter_chunks(source, chunksize, [column]):
+                values = chunk[column].to_numpy(dtype=np.float64, na_value=np.nan)
+                if len(values) and not np.isnan(values).all():
+                    low, high = min(low, np.nanmin(values)), max(high, np.nanmax(values))
+            value_range = (low, high) if low <= high else (0.0, 1.0)
+        edges = np.histogram_bin_edges([], bins=bins, range=value_range)
+        counts = np.zeros(bins, dtype=np.int64)
+        for chunk in iter_chunks(source, chunksize, [column]):
+            values = chunk[column].to_numpy(dtype=np.float64, na_value=np.nan)
+            counts += np.histogram(values[~np.isnan(values)], bins=edges)[0]
+        return counts, edges
+    
+    @staticmethod
+    def value_counts(source, column, chunksize: int = 100_000) -> pd.Series:
+        """Exact value counts of a column in one pass, largest first"""
+        counts = pd.Series(dtype=np.int64)
+        for chunk in iter_chunks(source, chunksize, [column]):
+            counts = counts.add(chunk[column].value_counts(), fill_value=0)
+        return counts.astype(np.int64).sort_values(ascending=False, kind='mergesort')
+    
+    @staticmethod
+    def pair_stats(source, x, y, chunksize: int = 100_000) -> Dict[str, float]:
+        """
+        Exact moments, Pearson r and least-squares line of y on x over the
+        rows where both are present, in one pass.
+        """
+        n = 0
+        sx = sy = sxx = syy = sxy = 0.0
+        low, high = np.inf, -np.inf
+        shift = None
+        for chunk in iter_chunks(source, chunksize, [x, y]):
+            xs = chunk[x].to_numpy(dtype=np.float64, na_value=np.nan)
+            ys = chunk[y].to_numpy(dtype=np.float64, na_value=np.nan)
+            both = ~(np.isnan(xs) | np.isnan(ys))
+            xs, ys = xs[both], ys[both]
+            if not len(xs):
+                continue
+            low, high = min(low, xs.min()), max(high, xs.max())
+            if shift is None:
+                # Centre on the first chunk so the sums of squares don't cancel
+                shift = (xs.mean(), ys.mean())
+            xs, ys = xs - shift[0], ys - shift[1]
+            n += len(xs)
+            sx += xs.sum()
+            sy += ys.sum()
+            sxx += xs @ xs
+            syy += ys @ ys
+            sxy += xs @ ys
+        if n < 2:
+            return {'n': n, 'mean_x': np.nan, 'mean_y': np.nan, 'std_x': np.nan, 'std_y': np.nan,
+                    'r': np.nan, 'slope': np.nan, 'intercept': np.nan, 'min_x': low, 'max_x': high}
+        var_x = (sxx - sx * sx / n) / (n - 1)
+        var_y = (syy - sy * sy / n) / (n - 1)
+        cov = (sxy - sx * sy / n) / (n - 1)
+        mean_x, mean_y = sx / n + shift[0], sy / n + shift[1]
+        slope = cov / var_x if var_x > 0 else np.nan
+        return {
+            'n': n, 'mean_x': mean_x, 'mean_y': mean_y,
+            'std_x': np.sqrt(var_x), 'std_y': np.sqrt(var_y),
+            'r': cov / np.sqrt(var_x * var_y) if var_x > 0 and var_y > 0 else np.nan,
+            'slope': slope, 'intercept': mean_y - slope * mean_x,
+            'min_x': low, 'max_x': high
+        }
+    
+    @staticmethod
+    def sketch_by(source, column, by: str = None, chunksize: int = 100_000) -> Dict[Any, ColumnSketch]:
+        """Per-group sketches (moments and quantiles) of a numeric column in one pass"""
+        sketches = {}
+        columns = [column] if by is None or by == column else [column, by]
+        for chunk in iter_chunks(source, chunksize, columns):
+            groups = [(column, chunk)] if by is None else chunk.groupby(by, sort=False, dropna=False, observed=True)
+            for key, group in groups:
+                if key not in sketches:
+                    sketches[key] = ColumnSketch(track_top=False, track_distinct=False)
+                sketches[key].update(group[column])
+        return sketches
+    
+    @staticmethod
+    def corr(source, columns: List[str], chunksize: int = 100_000) -> pd.DataFrame:
+        """
+        Pearson correlation matrix in one pass, over pairwise complete
+        observations like ``df.corr()``, from accumulated cross products.
+        """
+        k = len(columns)
+        n = np.zeros((k, k))
+        sx = np.zeros((k, k))
+        sxx = np.zeros((k, k))
+        sxy = np.zeros((k, k))
+        shift = None
+        for chunk in iter_chunks(source, chunksize, columns):
+            block = chunk[columns].to_numpy(dtype=np.float64, na_value=np.nan)
+            if shift is None:
+                # Correlation is shift invariant; centring on the first
+                # chunk keeps the sums of squares from cancelling
+                with warnings.catch_warnings():
+                    warnings.simplefilter('ignore', RuntimeWarning)
+                    shift = np.nan_to_num(np.nanmean(block, axis=0)) if len(block) else np.zeros(k)
+            block = block - shift
+            valid = (~np.isnan(block)).astype(np.float64)
+            values = np.where(valid > 0, block, 0.0)
+            # [i, j] entries sum over rows where both column i and j are present
+            n += valid.T @ valid
+            sx += values.T @ valid
+            sxx += (values * values).T @ valid
+            sxy += values.T @ values
+        with np.errstate(invalid='ignore', divide='ignore'):
+            covariance = n * sxy - sx * sx.T
+            variance = n * sxx - sx * sx
+            result = covariance / np.sqrt(variance * variance.T)
+        return pd.DataFrame(np.clip(result, -1, 1), index=columns, columns=columns)
+
+
+class ChunkedGroupBy:
+    """
+    Out-of-core hash aggregation for files that don't fit in memory.
+    
+    Each chunk is reduced to partial aggregates per key (sums, counts,
+    min/max and small per-key HyperLogLog registers for approximate
+    distinct counts), and partials are merged as they accumulate. When the
+    merged key set grows past ``max_keys`` it is hash-partitioned and
+    spilled to a fresh temporary directory (inside ``spill_dir`` when given)
+    that is removed when the run ends; each partition is merged and finalized on its
+    own at the end, so memory stays bounded by ``max_keys`` rather than by
+    the number of customers or cards. With ``workers > 1`` the per-chunk
+    reductions run in a process pool.
+    
+    Supported functions: 'sum', 'count', 'mean', 'min', 'max', 'nunique'
+    ('nunique' is approximate: about 1.04 / sqrt(2**distinct_precision)
+    relative error, ~9% at the default precision of 7, using 128 bytes per
+    key and column).
+    
+    Example (RFM-style summary per customer):
+    
+        ChunkedGroupBy('customer_id', {
+            'date': ['max'],
+            'transaction_id': ['count'],
+            'total_amount': ['sum', 'mean'],
+            'category': ['nunique'],
+        }).run('retail_transactions_data.csv')
+    """
+    
+    FUNCTIONS = ('sum', 'count', 'mean', 'min', 'max', 'nunique')
+    
+    def __init__(self, by, aggregations: Dict[str, List[str]], max_keys: int = 1_000_000,
+                 spill_dir: str = None, partitions: int = 16, workers: int = 1,
+                 distinct_precision: int = 7):
+        for col, funcs in aggregations.items():
+            unknown = set(funcs) - set(self.FUNCTIONS)
+            if unknown:
+                raise ValueError(f"Unsupported aggregation(s) for {col}: {', '.join(sorted(unknown))}")
+        self.by = by
+        self.aggregations = aggregations
+        self.max_keys = max_keys
+        self.spill_dir = spill_dir
+        self.partitions = partitions
+        self.workers = workers
+        self.distinct_precision = distinct_precision
+        self.spilled = False
+        self._run_dir = None
+    
+    @staticmethod
+    def _partial(chunk, by, aggregations: Dict[str, List[str]], precision: int) -> pd.DataFrame:
+        """Reduce one chunk to mergeable partial aggregates per key"""
+        grouped = chunk.groupby(by, sort=False)
+        parts = []
+        for col, funcs in aggregations.items():
+            funcs = set(funcs)
+            column = grouped[col]
+            if funcs & {'sum', 'mean'}:
+                parts.append(column.sum().rename(f'{col}__sum'))
+            if funcs & {'count', 'mean'}:
+                parts.append(column.count().rename(f'{col}__count'))
+            if 'min' in funcs:
+                parts.append(column.min().rename(f'{col}__min'))
+            if 'max' in funcs:
+                parts.append(column.max().rename(f'{col}__max'))
+            if 'nunique' in funcs:
+                # Rows with a missing key are numbered NaN; they belong to no group
+                codes = grouped.ngroup().fillna(-1).to_numpy().astype(np.int64)
+                values = chunk[col].to_numpy()
+                valid = (codes >= 0) & ~pd.isnull(values)
+                registers = np.zeros((grouped.ngroups, 1 << precision), dtype=np.uint8)
+                if valid.any():
+                    index, rank = HyperLogLog.register_ranks(pd.util.hash_array(values[valid]), precision)
+                    np.maximum.at(registers, (codes[valid], index), rank)
+                parts.append(pd.DataFrame(
+                    registers,
+                    index=grouped.size().index,
+                    columns=[f'{col}__hll{i}' for i in range(registers.shape[1])]
+                ))
+        return pd.concat(parts, axis=1)
+    
+    @staticmethod
+    def _merge(partials: List[pd.DataFrame]) -> pd.DataFrame:
+        """Combine partial aggregates that may share keys"""
+        combined = pd.concat(partials)
+        if combined.index.is_unique:
+            return combined
+        grouped = combined.groupby(level=list(range(combined.index.nlevels)), sort=False)
+        by_suffix = {'sum': [], 'min': [], 'max': []}
+        for name in combined.columns:
+            suffix = name.rsplit('__', 1)[1]
+            if suffix in ('sum', 'count'):
+                by_suffix['sum'].append(name)
+            elif suffix == 'min':
+                by_suffix['min'].append(name)
+            else:
+                # max and HyperLogLog registers both merge by maximum
+                by_suffix['max'].append(name)
+        merged = [getattr(grouped[cols], func)() for func, cols in by_suffix.items() if cols]
+        return pd.concat(merged, axis=1)[combined.columns]
+    
+    def _finalize(self, state: pd.DataFrame) -> pd.DataFrame:
+        """Turn merged partial aggregates into '<column>_<function>' results"""
+        result = {}
+        for col, funcs in self.aggregations.items():
+            for func in funcs:
+                if func == 'mean':
+                    result[f'{col}_mean'] = state[f'{col}__sum'] / state[f'{col}__count']
+                elif func == 'nunique':
+                    registers = state[[f'{col}__hll{i}' for i in range(1 << self.distinct_precision)]]
+                    result[f'{col}_nunique'] = np.round(HyperLogLog.estimate(registers.to_numpy())).astype(np.int64)
+                else:
+                    result[f'{col}_{func}'] = state[f'{col}__{func}']
+        return pd.DataFrame(result, index=state.index)
+    
+    def _partition_of(self, state: pd.DataFrame) -> np.ndarray:
+        index_frame = state.index.to_frame(index=False)
+        return (pd.util.hash_pandas_object(index_frame, index=False).to_numpy() % self.partitions).astype(np.int64)
+    
+    def _spill(self, state: pd.DataFrame):
+        """Append the state, hash-partitioned by key, to the spill files"""
+        if self._run_dir is None:
+            if self.spill_dir is not None:
+                os.makedirs(self.spill_dir, exist_ok=True)
+            self._run_dir = tempfile.mkdtemp(prefix='groupby_spill_', dir=self.spill_dir)
+        partition = self._partition_of(state)
+        for p in range(self.partitions):
+            piece = state[partition == p]
+            if len(piece):
+                with open(os.path.join(self._run_dir, f'part{p:03d}.pkl'), 'ab') as f:
+                    pickle.dump(piece, f, protocol=pickle.HIGHEST_PROTOCOL)
+        self.spilled = True
+    
+    def _load_partition(self, p: int) -> List[pd.DataFrame]:
+        pieces = []
+        path = os.path.join(self._run_dir, f'part{p:03d}.pkl')
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                while True:
+                    try:
+                        pieces.append(pickle.load(f))
+                    except EOFError:
+                        break
+            os.remove(path)
+        return pieces
+    
+    def _partials(self, source, chunksize: int):
+        """Partial aggregates per chunk, computed in a process pool when workers > 1"""
+        columns = list(dict.fromkeys(([self.by] if isinstance(self.by, str) else list(self.by))
+                                     + list(self.aggregations)))
+        chunks = iter_chunks(source, chunksize, columns)
+        args = (self.by, self.aggregations, self.distinct_precision)
+        if self.workers <= 1:
+            for chunk in chunks:
+                yield ChunkedGroupBy._partial(chunk, *args)
+            return
+        
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            # Keep a bounded number of chunks in flight
+            pending = deque()
+            for chunk in chunks:
+                pending.append(pool.submit(ChunkedGroupBy._partial, chunk, *args))
+                if len(pending) >= 2 * self.workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+    
+    def run(self, source, chunksize: int = 500_000, output_path: str = None) -> pd.DataFrame:
+        """
+        Aggregate ``source`` (a CSV/Parquet path, DataFrame or iterable of chunks).
+        
+        Returns the aggregated DataFrame indexed by key. With ``output_path``
+        the result is written to CSV partition by partition instead, and
+        None is returned, so not even the final result has to fit in memory.
+        """
+        self.spilled = False
+        try:
+            state = None
+            buffered = []
+            buffered_rows = 0
+            for partial in self._partials(source, chunksize):
+                buffered.append(partial)
+                buffered_rows += len(partial)
+                # Merging is amortized: only when the buffer outgrows the key budget
+                if buffered_rows >= self.max_keys:
+                    state = self._merge(([state] if state is not None else []) + buffered)
+                    buffered, buffered_rows = [], 0
+                    if len(state) > self.max_keys:
+                        self._spill(state)
+                        state = None
+            
+            pieces = ([state] if state is not None else []) + buffered
+            if not self.spilled:
+                result = self._finalize(self._merge(pieces)) if pieces else pd.DataFrame()
+                if output_path is not None:
+                    result.to_csv(output_path)
+                    return None
+                return result
+            
+            if pieces:
+                self._spill(self._merge(pieces))
+            results = []
+            for p in range(self.partitions):
+                partition = self._load_partition(p)
+                if not partition:
+                    continue
+                result = self._finalize(self._merge(partition))
+                if output_path is not None:
+                    result.to_csv(output_path, mode='w' if not results else 'a', header=not results)
+                    results.append(None)
+                else:
+                    results.append(result)
+            if output_path is not None:
+                return None
+            return pd.concat(results) if results else pd.DataFrame()
+        finally:
+            # Spill files never outlive the run, even when it fails
+            if self._run_dir is not None:
+                shutil.rmtree(self._run_dir, ignore_errors=True)
+                self._run_dir = None
+
+
+class ColumnIndex:
+    """
+    Lazily built lookup index for filtering a single column.
+    
+    Numeric columns keep their row positions in value order, so a range query
+    is two binary searches and a slice. Other columns are factorized once and
+    rows are grouped by code; a case-insensitive substring query is matched
+    against the distinct values through a trigram inverted index and expanded
+    back to rows; text with regex metacharacters is matched as a
+    case-insensitive regular expression instead, like ``str.contains``.
+    Queries return row positions in frame order.
+    
+    An index is a snapshot of the column it was built from; FilterEngine
+    rebuilds it when the column's contents change.
+    """
+    
+    NGRAM = 3
+    # Characters that make a contains() query a regular expression
+    REGEX_CHARS = frozenset('.^$*+?{}[]\\|()')
+    RANGE_PATTERN = re.compile(r'^\s*(?:(<=|>=|==|=|<|>)\s*(\S+)|(\S+)\s*\.\.\s*(\S+))\s*$')
+    
+    def __init__(self, series: pd.Series):
+        self.numeric = ColumnProfiler.is_numeric(series.dtype)
+        self.size = len(series)
+        if self.numeric:
+            values = series.to_numpy(dtype=float, na_value=np.nan)
+            # NaN sorts last; it never matches a range
+            valid = int(np.count_nonzero(~np.isnan(values)))
+            self.order = np.argsort(values, kind='stable')[:valid]
+            self.sorted_values = values[self.order]
+        else:
+            codes, uniques = ColumnProfiler.factorize(series)
+            self.codes = np.asarray(codes, dtype=np.int64)
+            self.order = np.argsort(self.codes, kind='stable')
+            # Rows holding distinct value i are order[offsets[i]:offsets[i + 1]]
+            self.offsets = np.searchsorted(self.codes[self.order], np.arange(len(uniques) + 1))
+            self.keys = [str(value).lower() for value in uniques]
+            self._grams = None
+    
+    def _frame_order(self, rows: np.ndarray) -> np.ndarray:
+        """Sort matched positions, via a mask when the match is a large share of the column"""
+        if len(rows) * 16 > self.size:
+            mask = np.zeros(self.size, dtype=bool)
+            mask[rows] = True
+            return np.flatnonzero(mask)
+        return np.sort(rows)
+    
+    @classmethod
+    def parse_range(cls, text: str) -> Tuple[float, float, bool, bool]:
+        """Parse '5', '>5', '<=5', '10..20' into (low, high, include_low, include_high)"""
+        match = cls.RANGE_PATTERN.match(str(text))
+        if match is None:
+            value = float(text)
+            return value, value, True, True
+        op, value, low, high = match.groups()
+        if op is None:
+            return float(low), float(high), True, True
+        value = float(value)
+        if op in ('=', '=='):
+            return value, value, True, True
+        if op[0] == '>':
+            return value, None, op == '>=', True
+        return None, value, True, op == '<='
+    
+    def between(self, low: float = None, high: float = None,
+                include_low: bool = True, include_high: bool = True) -> np.ndarray:
+        """Row positions with low <= value <= high (bounds optional)"""
+        start = 0 if low is None else np.searchsorted(self.sorted_values, low, side='left' if include_low else 'right')
+        stop = len(self.sorted_values) if high is None else np.searchsorted(self.sorted_values, high, side='right' if include_high else 'left')
+        return self._frame_order(self.order[start:max(start, stop)])
+    
+    def _build_grams(self):
+        n = self.NGRAM
+        grams = {}
+        for code, key in enumerate(self.keys):
+            for gram in {key[i:i + n] for i in range(len(key) - n + 1)}:
+                grams.setdefault(gram, []).append(code)
+        self._grams = {gram: np.array(codes, dtype=np.int64) for gram, codes in grams.items()}
+    
+    def _rows(self, codes: List[int]) -> np.ndarray:
+        """Row positions, in frame order, of the given distinct-value codes"""
+        if len(codes) > 64:
+            hit = np.zeros(len(self.keys) + 1, dtype=bool)
+            hit[np.asarray(codes)] = True
+            # Missing values have code -1 and land on the last, unset slot
+            return np.flatnonzero(hit[self.codes])
+        if not len(codes):
+            return np.empty(0, dtype=np.int64)
+        return self._frame_order(np.concatenate([self.order[self.offsets[c]:self.offsets[c + 1]] for c in codes]))
+    
+    @classmethod
+    def pattern(cls, text: str):
+        """Compiled case-insensitive regex for text with metacharacters, None for plain text"""
+        text = str(text)
+        if cls.REGEX_CHARS.isdisjoint(text):
+            return None
+        try:
+            return re.compile(text, re.IGNORECASE)
+        except re.error as e:
+            raise ValueError(f"Invalid pattern {text!r}: {e}") from None
+    
+    def contains(self, text: str) -> np.ndarray:
+        """Row positions whose value contains text (or matches it as a regex), ignoring case"""
+        pattern = self.pattern(text)
+        if pattern is not None:
+            return self._rows([c for c, key in enumerate(self.keys) if pattern.search(key)])
+        text = str(text).lower()
+        n = self.NGRAM
+        if len(text) < n:
+            candidates = range(len(self.keys))
+        else:
+            if self._grams is None:
+                self._build_grams()
+            postings = [self._grams.get(text[i:i + n]) for i in range(len(text) - n + 1)]
+            if any(p is None for p in postings):
+                return np.empty(0, dtype=np.int64)
+            postings.sort(key=len)
+            candidates = functools.reduce(
+                lambda a, b: np.intersect1d(a, b, assume_unique=True), postings)
+        return self._rows([c for c in candidates if text in self.keys[c]])
+    
+    @staticmethod
+    def match(series: pd.Series, text: str) -> np.ndarray:
+        """
+        Boolean mask with the same meaning as ``query``, computed directly
+        for one-off scans (e.g. over chunks) where building an index would
+        not pay off.
+        """
+        if ColumnProfiler.is_numeric(series.dtype):
+            low, high, include_low, include_high = ColumnIndex.parse_range(text)
+            values = series.to_numpy(dtype=float, na_value=np.nan)
+            mask = ~np.isnan(values)
+            if low is not None:
+                mask &= (values >= low) if include_low else (values > low)
+            if high is not None:
+                mask &= (values <= high) if include_high else (values < high)
+            return mask
+        # Search the distinct values only, then map back through the codes
+        codes, uniques = ColumnProfiler.factorize(series)
+        pattern = ColumnIndex.pattern(text)
+        if pattern is not None:
+            hits = [pattern.search(str(value)) is not None for value in uniques]
+        else:
+            text = str(text).lower()
+            hits = [text in str(value).lower() for value in uniques]
+        return np.array(hits + [False], dtype=bool)[np.asarray(codes)]
+    
+    def query(self, text: str) -> np.ndarray:
+        """Range query for numeric columns, substring search for the rest"""
+        if self.numeric:
+            return self.between(*self.parse_range(text))
+        return self.contains(text)
+
+
+class FilterEngine:
+    """
+    Compound filter expressions over a DataFrame, compiled to boolean masks.
+    
+    Expressions use Python syntax, e.g.
+    ``amount > 500 and location_risk == 'High' and hour in [2, 3, 4]``.
+    Bare names refer to columns (quote other column names in backticks);
+    ``contains(column, 'text')``, ``isna(column)`` and ``notna(column)`` are
+    also available; like ``str.contains``, ``contains`` treats text with
+    regex metacharacters as a case-insensitive regular expression. Each
+    expression is parsed once into a tree of predicates.
+    The mask of every predicate, and of every prefix of an and/or chain, is
+    memoized, so refining a filter by one more condition only evaluates the
+    new one. Least recently used masks are evicted past ``max_bytes``.
+    Before a query runs, the columns it references are fingerprinted;
+    masks and indexes built from a column whose contents changed in place
+    are dropped.
+    """
+    
+    COMPARISONS = {
+        '==': operator.eq, '!=': operator.ne,
+        '<': operator.lt, '<=': operator.le,
+        '>': operator.gt, '>=': operator.ge,
+    }
+    OPERATORS = {
+        ast.Eq: '==', ast.NotEq: '!=', ast.Lt: '<', ast.LtE: '<=',
+        ast.Gt: '>', ast.GtE: '>=', ast.In: 'in', ast.NotIn: 'not in',
+    }
+    FLIPPED = {'==': '==', '!=': '!=', '<': '>', '<=': '>=', '>': '<', '>=': '<='}
+    
+    def __init__(self, df: pd.DataFrame, max_bytes: int = 256 * 1024 * 1024):
+        self.df = df
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._indexes = {}
+        self._versions = {}
+        self._compiled = {}
+        self._masks = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _columns_of(node) -> set:
+        """Columns a predicate tree reads"""
+        kind = node[0]
+        if kind in ('and', 'or'):
+            return set().union(*(FilterEngine._columns_of(child) for child in node[1]))
+        if kind == 'not':
+            return FilterEngine._columns_of(node[1])
+        if kind == 'columns':
+            return {node[1], node[3]}
+        return {node[1]}
+    
+    def _sync(self, columns):
+        """Drop indexes and masks built from columns edited since they were cached"""
+        stale = set()
+        for column in columns:
+            if column not in self.df.columns:
+                raise ValueError(f"Unknown column: {column}")
+            version = FigureCache.fingerprint(self.df[column])
+            with self._lock:
+                previous = self._versions.get(column)
+                self._versions[column] = version
+            if previous is not None and previous != version:
+                stale.add(column)
+        if not stale:
+            return
+        with self._lock:
+            for column in stale:
+                self._indexes.pop(column, None)
+            for node in [node for node in self._masks if not stale.isdisjoint(self._columns_of(node))]:
+                self._bytes -= self._masks.pop(node).nbytes
+    
+    def index(self, column) -> ColumnIndex:
+        """Lookup index for a column, built on first use and rebuilt after edits"""
+        self._sync((column,))
+        return self._index(column)
+    
+    def _index(self, column) -> ColumnIndex:
+        with self._lock:
+            if column not in self._indexes:
+                self._indexes[column] = ColumnIndex(self.df[column])
+            return self._indexes[column]
+    
+    def compile(self, expression: str) -> tuple:
+        """Parse an expression into a hashable predicate tree (cached per expression)"""
+        if expression not in self._compiled:
+            quoted = {}
+            
+            def quote(match):
+                name = f"__column_{len(quoted)}__"
+                quoted[name] = match.group(1)
+                return name
+            
+            source = re.sub(r'`([^`]*)`', quote, expression.strip())
+            try:
+                tree = ast.parse(source, mode='eval').body
+            except SyntaxError as e:
+                raise ValueError(f"Invalid filter expression: {e.msg}") from None
+            self._compiled[expression] = self._compile_node(tree, quoted, source)
+        return self._compiled[expression]
+    
+    def _column(self, node, quoted: Dict[str, str]):
+        """Column referenced by a name node, or None for anything else"""
+        if not isinstance(node, ast.Name):
+            return None
+        column = quoted.get(node.id, node.id)
+        if column not in self.df.columns:
+            raise ValueError(f"Unknown column: {column} (quote text values, e.g. '{column}')")
+        return column
+    
+    @staticmethod
+    def _text(node, source: str, quoted: Dict[str, str]) -> str:
+        """Expression text of a node for error messages, with backtick names restored"""
+        text = ast.get_source_segment(source, node) or ''
+        for name, column in quoted.items():
+            text = text.replace(name, f"`{column}`")
+        return text
+    
+    @staticmethod
+    def _literal(node, source: str, quoted: Dict[str, str]):
+        try:
+            return ast.literal_eval(node)
+        except ValueError:
+            raise ValueError(f"Expected a literal value, got: {FilterEngine._text(node, source, quoted)}") from None
+    
+    def _compile_comparison(self, left, op: str, right, quoted: Dict[str, str], source: str) -> tuple:
+        column = self._column(left, quoted)
+        if column is None:
+            # Literal on the left: 500 < amount
+            if op not in self.FLIPPED:
+                raise ValueError(f"Unsupported filter expression: {self._text(left, source, quoted)} "
+                                 f"{op} {self._text(right, source, quoted)}")
+            left, right, op = right, left, self.FLIPPED[op]
+            column = self._column(left, quoted)
+            if column is None:
+                raise ValueError("A comparison needs a column on one side")
+        other = self._column(right, quoted)
+        if other is not None:
+            if op not in self.COMPARISONS:
+                raise ValueError(f"'{op}' needs a list of values, not a column")
+            return ('columns', column, op, other)
+        value = self._literal(right, source, quoted)
+        if op in ('in', 'not in'):
+            if not isinstance(value, (list, tuple, set, frozenset)):
+                raise ValueError(f"'{op}' needs a list of values, e.g. {column} {op} [1, 2]")
+            # Order-insensitive key: [2, 3] and [3, 2] share a mask
+            return (op, column, tuple(sorted(set(value), key=repr)))
+        return ('compare', column, op, value)
+    
+    def _compile_node(self, node, quoted: Dict[str, str], source: str) -> tuple:
+        if isinstance(node, ast.BoolOp):
+            kind = 'and' if isinstance(node.op, ast.And) else 'or'
+            children = []
+            for value in node.values:
+                child = self._compile_node(value, quoted, source)
+                # Flatten nested chains of the same operator: (a and b) and c
+                children.extend(child[1] if child[0] == kind else [child])
+            return (kind, tuple(children))
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+            return ('not', self._compile_node(node.operand, quoted, source))
+        if isinstance(node, ast.Compare):
+            terms = [node.left] + node.comparators
+            predicates = []
+            for left, op, right in zip(terms, node.ops, terms[1:]):
+                if type(op) not in self.OPERATORS:
+                    raise ValueError(f"Unsupported operator in: {self._text(node, source, quoted)}")
+                predicates.append(self._compile_comparison(left, self.OPERATORS[type(op)], right, quoted, source))
+            # 10 < amount <= 20 is a chain of two predicates
+            return predicates[0] if len(predicates) == 1 else ('and', tuple(predicates))
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in ('contains', 'isna', 'notna'):
+            name = node.func.id
+            arity = 2 if name == 'contains' else 1
+            column = self._column(node.args[0], quoted) if len(node.args) == arity and not node.keywords else None
+            if column is None:
+                usage = f"{name}(column, 'text')" if name == 'contains' else f"{name}(column)"
+                raise ValueError(f"Usage: {usage}")
+            if name == 'contains':
+                return ('contains', column, str(self._literal(node.args[1], source, quoted)))
+            return (name, column)
+        column = self._column(node, quoted)
+        if column is not None:
+            # A bare column is a truth test: is_fraud and amount > 500
+            return ('compare', column, '==', True)
+        raise ValueError(f"Unsupported filter expression: {self._text(node, source, quoted)}")
+    
+    def _cached(self, node):
+        with self._lock:
+            mask = self._masks.get(node)
+            if mask is not None:
+                self._masks.move_to_end(node)
+                self.hits += 1
+            return mask
+    
+    def _store(self, node, mask: np.ndarray):
+        # Cached masks are shared between expressions, so freeze them
+        mask.flags.writeable = False
+        with self._lock:
+            if mask.nbytes > self.max_bytes or node in self._masks:
+                return
+            self._masks[node] = mask
+            self._bytes += mask.nbytes
+            while self._bytes > self.max_bytes:
+                _, evicted = self._masks.popitem(last=False)
+                self._bytes -= evicted.nbytes
+    
+    def _predicate(self, node) -> np.ndarray:
+        """Evaluate a single predicate to a boolean array"""
+        kind, column = node[0], node[1]
+        series = self.df[column]
+        if kind == 'contains':
+            mask = np.zeros(len(series), dtype=bool)
+            mask[self._index(column).contains(node[2])] = True
+            return mask
+        if kind in ('isna', 'notna'):
+            result = series.isna() if kind == 'isna' else series.notna()
+        elif kind in ('in', 'not in'):
+            result = series.isin(node[2])
+            if kind == 'not in':
+                result = ~result
+        else:
+            other = self.df[node[3]] if kind == 'columns' else node[3]
+            try:
+                result = self.COMPARISONS[node[2]](series, other)
+            except TypeError as e:
+                raise ValueError(f"Cannot compare {column} {node[2]} {node[3]!r}: {e}") from None
+        return result.to_numpy(dtype=bool, na_value=False)
+    
+    def _evaluate(self, node) -> np.ndarray:
+        mask = self._cached(node)
+        if mask is not None:
+            return mask
+        kind = node[0]
+        if kind in ('and', 'or'):
+            combine = np.logical_and if kind == 'and' else np.logical_or
+            children = node[1]
+            # Resume from the longest prefix of the chain already evaluated
+            done = len(children) - 1
+            while done > 1 and (kind, children[:done]) not in self._masks:
+                done -= 1
+            mask = self._evaluate((kind, children[:done]) if done > 1 else children[0])
+            for i in range(done, len(children)):
+                mask = combine(mask, self._evaluate(children[i]))
+                self._store((kind, children[:i + 1]), mask)
+            return mask
+        self.misses += 1
+        mask = ~self._evaluate(node[1]) if kind == 'not' else self._predicate(node)
+        self._store(node, mask)
+        return mask
+    
+    def mask(self, expression: str) -> np.ndarray:
+        """Read-only boolean row mask for an expression"""
+        node = self.compile(expression)
+        self._sync(self._columns_of(node))
+        return self._evaluate(node)
+    
+    def filter(self, expression: str) -> pd.DataFrame:
+        """Rows of the frame matching an expression"""
+        return self.df[self.mask(expression)]
+    
+    def clear(self):
+        """Drop memoized masks and indexes"""
+        with self._lock:
+            self._masks.clear()
+            self._bytes = 0
+            self._indexes.clear()
+            self._versions.clear()
+            self.hits = self.misses = 0
+
+
+class DataAnalysisUtils:
+    """Utility functions for common data analysis tasks"""
+    
+    # Strings treated as booleans by optimize_memory (compared case-insensitively)
+    BOOLEAN_STRINGS = {'yes': True, 'no': False, 'y': True, 'n': False,
+                       'true': True, 'false': False}
+    
+    # Contingency tables with more observed cells than this are returned in
+    # long form (a Series of non-zero counts) instead of as a dense grid
+    CONTINGENCY_MAX_CELLS = 10_000_000
+    
+    @staticmethod
+    def _optimize_column(series: pd.Series, category_threshold: float) -> pd.Series:
+        """Smallest lossless representation of one column"""
+        dtype = series.dtype
+        if pd.api.types.is_bool_dtype(dtype) or isinstance(dtype, pd.CategoricalDtype):
+            return series
+        
+        if pd.api.types.is_integer_dtype(dtype) and isinstance(dtype, np.dtype):
+            # Signed even for non-negative data, so differences can't wrap around
+            return pd.to_numeric(series, downcast='integer')
+        
+        if pd.api.types.is_float_dtype(dtype) and isinstance(dtype, np.dtype):
+            if dtype == np.float64:
+                narrowed = series.astype(np.float32)
+                # Only keep float32 when every value survives the round trip
+                same = (narrowed.astype(np.float64) == series) | (series.isnull() & narrowed.isnull())
+                if same.all():
+                    return narrowed
+            return series
+        
+        if dtype == object:
+            non_null = series.dropna()
+            if len(non_null) == 0:
+                return series
+            lowered = non_null.astype(str).str.strip().str.lower()
+            if lowered.isin(DataAnalysisUtils.BOOLEAN_STRINGS).all():
+                mapped = lowered.map(DataAnalysisUtils.BOOLEAN_STRINGS)
+                if len(non_null) == len(series):
+                    return mapped.astype(bool)
+                # Keep missing values with the nullable boolean dtype
+                return mapped.reindex(series.index).astype('boolean')
+            if non_null.nunique() <= category_threshold * len(non_null):
+                as_category = series.astype('category')
+                if as_category.memory_usage(deep=True) < series.memory_usage(deep=True):
+                    return as_category
+        return series
+    
+    @staticmethod
+    def optimize_memory(df, category_threshold: float = 0.5):
+        """
+        Shrink a DataFrame without losing any values.
+        
+        Integers are downcast to the smallest signed type that holds their
+        range, float64 becomes float32 only when every value round-trips
+        exactly, yes/no style strings become bool, and object columns whose
+        distinct values make up at most ``category_threshold`` of the rows
+        become category. Returns ``(optimized_df, report)`` where
+        the report lists deep memory usage per column before and after.
+        """
+        optimized = df.copy()
+        rows = []
+        for col in df.columns:
+            before = df[col]
+            after = DataAnalysisUtils._optimize_column(before, category_threshold)
+            optimized[col] = after
+            before_bytes = int(before.memory_usage(deep=True, index=False))
+            after_bytes = int(after.memory_usage(deep=True, index=False))
+            rows.append({
+                'Column': col,
+                'Before Type': str(before.dtype),
+                'After Type': str(after.dtype),
+                'Before (bytes)': before_bytes,
+                'After (bytes)': after_bytes,
+                'Saved (%)': round((1 - after_bytes / before_bytes) * 100, 1) if before_bytes else 0.0
+            })
+        
+        report = pd.DataFrame(rows)
+        total_before = report['Before (bytes)'].sum()
+        total_after = report['After (bytes)'].sum()
+        report.loc[len(report)] = {
+            'Column': 'TOTAL',
+            'Before Type': '',
+            'After Type': '',
+            'Before (bytes)': total_before,
+            'After (bytes)': total_after,
+            'Saved (%)': round((1 - total_after / total_before) * 100, 1) if total_before else 0.0
+        }
+        return optimized, report
+    
+    @staticmethod
+    def create_data_dictionary(df, approximate: bool = False, chunksize: int = 100_000,
+                               workers: int = None):
+        """
+        Create a data dictionary for a DataFrame.
+        
+        With ``approximate=True`` the profile is built in one streaming pass
+        with bounded memory (see StreamingProfiler), and ``df`` may also be a
+        CSV/Parquet path or an iterable of chunks. Null counts, mean and std
+        stay exact; unique counts are within ~1% and top values are
+        heavy-hitter estimates. ``workers`` sets the thread count used for
+        exact profiling of large frames.
+        """
+        if approximate:
+            profile = StreamingProfiler.profile(df, chunksize)
+        else:
+            profile = ColumnProfiler.profile(df, workers)
+        
+        data_dict = []
+        for row in profile.itertuples(index=False):
+            if row.numeric:
+                stats = f"Mean: {row.mean:.2f}, Std: {row.std:.2f}"
+            else:
+                top_value = row.top_value if row.has_top_value else "N/A"
                 stats = f"Top value: {top_value}"
             
             data_dict.append({
-                'Column': col,
-                'Data Type': dtype,
-                'Null Values': null_count,
-                'Unique Values': unique_count,
+                'Column': row.column,
+                'Data Type': row.dtype,
+                'Null Values': row.null_count,
+                'Unique Values': row.unique_count,
                 'Statistics': stats
             })
         
         return pd.DataFrame(data_dict)
     
     @staticmethod
-    def detect_outliers(df, column, method='iqr'):
-        """Detect outliers in a numeric column"""
+    def detect_outliers(df, column, method='iqr', approximate: bool = False):
+        """
+        Detect outliers in a numeric column.
+        
+        With ``approximate=True`` the IQR quartiles come from a t-digest built
+        in bounded memory instead of an exact sort (z-score moments are exact
+        either way).
+        """
+        if method not in ('iqr', 'zscore'):
+            raise ValueError("Method must be 'iqr' or 'zscore'")
+        
+        if approximate:
+            sketch = StreamingProfiler.sketch(df, columns=[column])[column]
+            if method == 'iqr':
+                Q1, Q3 = sketch.quantiles.quantile([0.25, 0.75])
+                IQR = Q3 - Q1
+                lower_bound = Q1 - 1.5 * IQR
+                upper_bound = Q3 + 1.5 * IQR
+            else:
+                lower_bound = sketch.mean - 3 * sketch.std
+                upper_bound = sketch.mean + 3 * sketch.std
+            return df[(df[column] < lower_bound) | (df[column] > upper_bound)]
+        
         if method == 'iqr':
             Q1 = df[column].quantile(0.25)
             Q3 = df[column].quantile(0.75)
@@ -608,25 +3680,279 @@ class DataAnalysisUtils:
             lower_bound = Q1 - 1.5 * IQR
             upper_bound = Q3 + 1.5 * IQR
             outliers = df[(df[column] < lower_bound) | (df[column] > upper_bound)]
-        elif method == 'zscore':
+        else:
             z_scores = np.abs((df[column] - df[column].mean()) / df[column].std())
             outliers = df[z_scores > 3]
-        else:
-            raise ValueError("Method must be 'iqr' or 'zscore'")
         
         return outliers
     
     @staticmethod
-    def analyze_categorical_column(df, column):
-        """Comprehensive analysis of a categorical column"""
-        analysis = {
-            'value_counts': df[column].value_counts(),
-            'unique_count': df[column].nunique(),
-            'mode': df[column].mode().iloc[0] if len(df[column].mode()) > 0 else None,
-            'null_count': df[column].isnull().sum(),
-            'null_percentage': (df[column].isnull().sum() / len(df)) * 100
-        }
-        return analysis
+    def _outlier_bounds(block, method):
+        """Per-column (lower, upper) outlier bounds for a 2-D float block"""
+        if method == 'iqr':
+            Q1, Q3 = np.nanquantile(block, [0.25, 0.75], axis=0)
+            IQR = Q3 - Q1
+            return Q1 - 1.5 * IQR, Q3 + 1.5 * IQR
+        if method == 'zscore':
+            # |z| > 3  <=>  value outside mean +/- 3 std
+            mean = np.nanmean(block, axis=0)
+            std = np.nanstd(block, axis=0, ddof=1)
+            return mean - 3 * std, mean + 3 * std
+        raise ValueError("Method must be 'iqr' or 'zscore'")
+    
+    @staticmethod
+    def _outlier_groups(df, by):
+        """Row positions per group of ``by`` (all rows when by is None)"""
+        if by is None:
+            return [(None, slice(None))]
+        codes, uniques = pd.factorize(df[by])
+        order = np.argsort(codes, kind='stable')
+        sorted_codes = codes[order]
+        # Rows with a missing group key are never flagged
+        starts = np.searchsorted(sorted_codes, np.arange(len(uniques)), side='left')
+        ends = np.searchsorted(sorted_codes, np.arange(len(uniques)), side='right')
+        return [(uniques[g], order[starts[g]:ends[g]]) for g in range(len(uniques))]
+    
+    @staticmethod
+    def outlier_bounds(df, columns: List[str] = None, method='iqr', by: str = None):
+        """
+        Lower and upper outlier bounds for many numeric columns at once.
+        
+        Returns a DataFrame indexed by column, or by (group, column) when
+        ``by`` names a grouping column such as 'merchant_category'.
+        """
+        if columns is None:
+            columns = [c for c, t in df.dtypes.items() if ColumnProfiler.is_numeric(t) and c != by]
+        block = df[columns].to_numpy(dtype='float64', na_value=np.nan)
+        
+        frames = []
+        for group, rows in DataAnalysisUtils._outlier_groups(df, by):
+            lower, upper = DataAnalysisUtils._outlier_bounds(block[rows], method)
+            frame = pd.DataFrame({'lower': lower, 'upper': upper}, index=pd.Index(columns, name='column'))
+            if by is not None:
+                frame = pd.concat({group: frame}, names=[by])
+            frames.append(frame)
+        return pd.concat(frames)
+    
+    @staticmethod
+    def detect_outlier_mask(df, columns: List[str] = None, method='iqr', by: str = None,
+                            as_indices: bool = False, batch_columns: int = 64):
+        """
+        Flag outliers in many numeric columns in one vectorized pass.
+        
+        Instead of a filtered copy per column, returns a boolean mask
+        DataFrame (rows x columns, 1 byte per cell), or with
+        ``as_indices=True`` a dict of positional row-index arrays per column.
+        With ``by``, IQR/z-score bounds are computed separately per group.
+        Columns are processed ``batch_columns`` at a time to bound the
+        temporary float copy.
+        """
+        if columns is None:
+            columns = [c for c, t in df.dtypes.items() if ColumnProfiler.is_numeric(t) and c != by]
+        if method not in ('iqr', 'zscore'):
+            raise ValueError("Method must be 'iqr' or 'zscore'")
+        
+        groups = DataAnalysisUtils._outlier_groups(df, by)
+        mask = np.zeros((len(df), len(columns)), dtype=bool)
+        for start in range(0, len(columns), batch_columns):
+            stop = start + batch_columns
+            block = df[columns[start:stop]].to_numpy(dtype='float64', na_value=np.nan)
+            for _, rows in groups:
+                values = block[rows]
+                lower, upper = DataAnalysisUtils._outlier_bounds(values, method)
+                mask[rows, start:stop] = (values < lower) | (values > upper)
+        
+        if as_indices:
+            return {col: np.flatnonzero(mask[:, j]) for j, col in enumerate(columns)}
+        return pd.DataFrame(mask, index=df.index, columns=columns)
+    
+    @staticmethod
+    def streaming_outlier_bounds(source, columns: List[str], method='iqr', chunksize: int = 100_000):
+        """
+        First pass of streaming outlier detection: bounds in bounded memory.
+        
+        IQR quartiles come from a t-digest and z-score bounds from exact
+        running moments, so ``source`` (a CSV/Parquet path, a DataFrame or an
+        iterable of chunks) is read once and never held in memory.
+        """
+        if method not in ('iqr', 'zscore'):
+            raise ValueError("Method must be 'iqr' or 'zscore'")
+        sketches = StreamingProfiler.sketch(source, chunksize, columns, track_top=False,
+                                            track_distinct=False,
+                                            track_quantiles=(method == 'iqr'))
+        
+        bounds = {}
+        for col in columns:
+            sketch = sketches[col]
+            if method == 'iqr':
+                Q1, Q3 = sketch.quantiles.quantile([0.25, 0.75])
+                IQR = Q3 - Q1
+                bounds[col] = (Q1 - 1.5 * IQR, Q3 + 1.5 * IQR)
+            else:
+                bounds[col] = (sketch.mean - 3 * sketch.std, sketch.mean + 3 * sketch.std)
+        return pd.DataFrame.from_dict(bounds, orient='index', columns=['lower', 'upper']).rename_axis('column')
+    
+    @staticmethod
+    def iter_outliers(source, columns: List[str], method='iqr', chunksize: int = 100_000,
+                      bounds: pd.DataFrame = None):
+        """
+        Two-pass streaming outlier detection over a chunked file.
+        
+        Pass one estimates bounds (unless ``bounds`` is given, e.g. from
+        streaming_outlier_bounds); pass two yields, per chunk, a DataFrame
+        with the global 0-based ``row`` offset, ``column`` and ``value`` of
+        every outlier. Memory stays bounded by the chunk size.
+        """
+        if bounds is None:
+            if iter(source) is source:
+                raise TypeError("A one-shot chunk iterator can't be read twice; pass a path or precomputed bounds")
+            bounds = DataAnalysisUtils.streaming_outlier_bounds(source, columns, method, chunksize)
+        lower = bounds.loc[columns, 'lower'].to_numpy()
+        upper = bounds.loc[columns, 'upper'].to_numpy()
+        
+        offset = 0
+        for chunk in iter_chunks(source, chunksize, columns):
+            values = chunk[columns].to_numpy(dtype='float64', na_value=np.nan)
+            rows, cols = np.nonzero((values < lower) | (values > upper))
+            if len(rows):
+                yield pd.DataFrame({
+                    'row': rows + offset,
+                    'column': np.asarray(columns, dtype=object)[cols],
+                    'value': values[rows, cols]
+                })
+            offset += len(chunk)
+    
+    @staticmethod
+    def stream_outliers(source, columns: List[str], output_path: str, method='iqr',
+                        chunksize: int = 100_000):
+        """
+        Write every outlier's row offset, column and value to a CSV file.
+        
+        Wraps iter_outliers for files too large to load, e.g. a 100M-row
+        transaction log. Returns the number of outliers found per column.
+        """
+        counts = pd.Series(0, index=columns, dtype=np.int64)
+        with open(output_path, 'w', newline='') as f:
+            f.write('row,column,value\n')
+            for found in DataAnalysisUtils.iter_outliers(source, columns, method, chunksize):
+                found.to_csv(f, header=False, index=False)
+                counts = counts.add(found['column'].value_counts(), fill_value=0).astype(np.int64)
+        return counts
+    
+    @staticmethod
+    def analyze_categorical_column(df, column, approximate: bool = False, top_k: int = 64):
+        """
+        Comprehensive analysis of a categorical column.
+        
+        With ``approximate=True`` a single bounded-memory pass is made (``df``
+        may also be a CSV/Parquet path or an iterable of chunks): value_counts
+        holds at most ``top_k`` heavy hitters with lower-bound counts, and
+        unique_count is a HyperLogLog estimate. Null counts stay exact.
+        """
+        if approximate:
+            sketch = StreamingProfiler.sketch(df, columns=[column], top_k=top_k, track_top=True)[column]
+            value_counts = sketch.top.top()
+            value_counts.name = column
+            return {
+                'value_counts': value_counts,
+                'unique_count': sketch.unique_count(),
+                'mode': value_counts.index[0] if len(value_counts) > 0 else None,
+                'null_count': sketch.null_count,
+                'null_percentage': (sketch.null_count / sketch.count) * 100 if sketch.count else np.nan
+            }
+        
+        def analyze():
+            return {
+                'value_counts': df[column].value_counts(),
+                'unique_count': df[column].nunique(),
+                'mode': df[column].mode().iloc[0] if len(df[column].mode()) > 0 else None,
+                'null_count': df[column].isnull().sum(),
+                'null_percentage': (df[column].isnull().sum() / len(df)) * 100
+            }
+        
+        return ColumnProfiler.cached(df, 'analyze_categorical_column', analyze, column=column)
+    
+    @staticmethod
+    def analyze_categorical_columns(df, columns: List[str] = None, pairs: List[Tuple[str, str]] = None):
+        """
+        Analyze many categorical columns with one factorization each.
+        
+        Every statistic of analyze_categorical_column (value_counts, unique
+        count, mode, nulls) is derived from the integer codes with
+        np.bincount, and the same codes give contingency tables for the
+        requested column ``pairs``. Returns
+        ``{'columns': {column: analysis}, 'contingency': {(a, b): table}}``;
+        a pair with more than CONTINGENCY_MAX_CELLS observed cells (e.g. two
+        ID columns) gets a Series of non-zero counts indexed by (a, b).
+        """
+        if columns is None:
+            columns = [c for c, t in df.dtypes.items() if not ColumnProfiler.is_numeric(t)]
+        pairs = [tuple(pair) for pair in pairs or []]
+        return ColumnProfiler.cached(
+            df, 'analyze_categorical_columns',
+            lambda: DataAnalysisUtils._analyze_categorical_columns(df, list(columns), pairs),
+            columns=list(columns), pairs=pairs)
+    
+    @staticmethod
+    def _analyze_categorical_columns(df, columns: List[str], pairs: List[Tuple[str, str]]):
+        needed = list(dict.fromkeys(list(columns) + [c for pair in pairs for c in pair]))
+        
+        factorized = {}
+        for col in needed:
+            codes, uniques = ColumnProfiler.factorize(df[col])
+            counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+            factorized[col] = (codes, uniques, counts)
+        
+        analyses = {}
+        for col in columns:
+            codes, uniques, counts = factorized[col]
+            is_categorical = isinstance(df[col].dtype, pd.CategoricalDtype)
+            # value_counts drops unseen values except for declared categories
+            order = np.argsort(-counts, kind='stable')
+            if not is_categorical:
+                order = order[counts[order] > 0]
+            value_counts = pd.Series(counts[order], index=uniques[order], name=col)
+            null_count = int((codes < 0).sum())
+            mode, _ = ColumnProfiler.mode_from_counts(uniques, counts, is_categorical)
+            
+            analyses[col] = {
+                'value_counts': value_counts,
+                'unique_count': int((counts > 0).sum()),
+                'mode': mode,
+                'null_count': null_count,
+                'null_percentage': (null_count / len(df)) * 100 if len(df) else np.nan
+            }
+        
+        tables = {}
+        for a, b in pairs:
+            codes_a, uniques_a, _ = factorized[a]
+            codes_b, uniques_b, _ = factorized[b]
+            valid = (codes_a >= 0) & (codes_b >= 0)
+            combined = codes_a[valid].astype(np.int64) * len(uniques_b) + codes_b[valid]
+            # Count only the combinations that occur: the full
+            # len(uniques_a) x len(uniques_b) grid can be far larger than the data
+            cells, counts = np.unique(combined, return_counts=True)
+            row_codes, col_codes = np.divmod(cells, len(uniques_b))
+            rows, row_pos = np.unique(row_codes, return_inverse=True)
+            cols, col_pos = np.unique(col_codes, return_inverse=True)
+            if len(rows) * len(cols) > DataAnalysisUtils.CONTINGENCY_MAX_CELLS:
+                table = pd.Series(counts, name='count', index=pd.MultiIndex.from_arrays(
+                    [uniques_a[row_codes], uniques_b[col_codes]], names=[a, b]))
+            else:
+                grid = np.zeros((len(rows), len(cols)), dtype=np.int64)
+                grid[row_pos, col_pos] = counts
+                # Same layout as pd.crosstab: no empty rows/columns, sorted labels
+                table = pd.DataFrame(grid, index=pd.Index(uniques_a[rows], name=a),
+                                     columns=pd.Index(uniques_b[cols], name=b))
+            try:
+                table = table.sort_index()
+                if isinstance(table, pd.DataFrame):
+                    table = table.sort_index(axis=1)
+            except TypeError:
+                pass
+            tables[(a, b)] = table
+        
+        return {'columns': analyses, 'contingency': tables}
 
 
 class BootcampEngagement:
@@ -14,6 +14,13 @@ import numpy as np
 from typing import Dict, List, Any, Callable
 import time
 import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from data_science_utils import (
+    ChunkedSource, ColumnIndex, ColumnProfiler, FilterEngine, InteractiveVisualizer,
+    PlottingUtils, ReservoirSampler, StratifiedSampler, StreamingProfiler
+)
 
 
 class InteractiveQuiz:
@@ -34,43 +41,79 @@ class InteractiveQuiz:
             'explanation': explanation
         })
     
-    def create_quiz(self):
-        """Create the interactive quiz widget"""
-        quiz_container = widgets.VBox()
-        question_widgets = []
+    def create_quiz(self, page_size: int = 10):
+        """Create the interactive quiz widget
         
-        for i, q in enumerate(self.questions):
+        Questions are shown one page at a time. A fixed set of ``page_size``
+        question slots is rebound as the student pages through, and answers
+        are kept in a plain list, so quizzes of any length open instantly.
+        """
+        total = len(self.questions)
+        page_count = max(1, -(-total // page_size))
+        answers = [None] * total
+        feedback = [''] * total
+        # 'binding' is set while slots are refilled, so those value changes
+        # aren't recorded as answers
+        state = {'page': 0, 'binding': False}
+        
+        # Navigation
+        prev_btn = widgets.Button(description='Previous', icon='arrow-left')
+        next_btn = widgets.Button(description='Next', icon='arrow-right')
+        page_label = widgets.HTML()
+        
+        def update_status():
+            answered = sum(a is not None for a in answers)
+            page_label.value = f"Page <b>{state['page'] + 1}</b> of {page_count} · {answered}/{total} answered"
+        
+        # Question slots for one page
+        slots = []
+        for position in range(min(page_size, total)):
             # Create radio buttons for options
             radio = widgets.RadioButtons(
-                options=q['options'],
+                options=[],
                 description='',
                 disabled=False,
                 layout=widgets.Layout(width='auto')
             )
             
             # Create question label
-            question_label = widgets.HTML(
-                value=f"<b>Question {i+1}:</b> {q['question']}"
-            )
+            question_label = widgets.HTML()
             
             # Feedback area
-            feedback = widgets.HTML(value="")
+            note = widgets.HTML(value="")
             
-            # Store widgets
-            question_widgets.append({
-                'radio': radio,
-                'feedback': feedback,
-                'correct': q['correct'],
-                'explanation': q['explanation']
-            })
+            def record(change, position=position):
+                if not state['binding']:
+                    answers[state['page'] * page_size + position] = change['new']
+                    update_status()
             
-            # Add to container
-            quiz_container.children += (
-                question_label,
-                radio,
-                feedback,
-                widgets.HTML(value="<hr>")
-            )
+            radio.observe(record, names='index')
+            slot = widgets.VBox([question_label, radio, note, widgets.HTML(value="<hr>")])
+            slots.append((slot, question_label, radio, note))
+        
+        def show_page(page):
+            page = min(max(page, 0), page_count - 1)
+            state['page'] = page
+            state['binding'] = True
+            start = page * page_size
+            for position, (slot, question_label, radio, note) in enumerate(slots):
+                i = start + position
+                if i >= total:
+                    slot.layout.display = 'none'
+                    continue
+                q = self.questions[i]
+                slot.layout.display = None
+                question_label.value = f"<b>Question {i+1}:</b> {q['question']}"
+                radio.options = q['options']
+                radio.index = answers[i]
+                note.value = feedback[i]
+            state['binding'] = False
+            prev_btn.disabled = page == 0
+            next_btn.disabled = page >= page_count - 1
+            update_status()
+        
+        prev_btn.on_click(lambda btn: show_page(state['page'] - 1))
+        next_btn.on_click(lambda btn: show_page(state['page'] + 1))
         
         # Submit button
         submit_btn = widgets.Button(
@@ -83,19 +126,21 @@ class InteractiveQuiz:
         score_display = widgets.HTML(value="")
         
         def on_submit(btn):
-            total = len(self.questions)
             correct = 0
             
-            for i, qw in enumerate(question_widgets):
-                selected = qw['radio'].index
+            for i, q in enumerate(self.questions):
+                selected = answers[i]
                 if selected is not None:
-                    if selected == qw['correct']:
+                    if selected == q['correct']:
                         correct += 1
-                        qw['feedback'].value = '<span style="color:green">✅ Correct!</span>'
+                        feedback[i] = '<span style="color:green">✅ Correct!</span>'
                     else:
-                        qw['feedback'].value = f'<span style="color:red">❌ Incorrect. {qw["explanation"]}</span>'
+                        feedback[i] = f'<span style="color:red">❌ Incorrect. {q["explanation"]}</span>'
             
-            self.score = (correct / total) * 100
+            self.user_answers = {i: a for i, a in enumerate(answers) if a is not None}
+            self.score = (correct / total) * 100 if total else 0
+            # Refresh the visible page so its feedback shows
+            show_page(state['page'])
             score_display.value = f"""
             <div style="padding:10px; background:#f0f0f0; border-radius:5px; margin-top:10px;">
                 <h3>Quiz Results</h3>
@@ -105,10 +150,77 @@ class InteractiveQuiz:
             """
         
         submit_btn.on_click(on_submit)
+        show_page(0)
         
-        quiz_container.children += (submit_btn, score_display)
+        navigation = widgets.HBox([prev_btn, page_label, next_btn])
+        if page_count == 1:
+            navigation.layout.display = 'none'
         
-        return quiz_container
+        return widgets.VBox([slot for slot, _, _, _ in slots] + [navigation, submit_btn, score_display])
+    
+    def grade_batch(self, answers, key=None, students: List[str] = None) -> Dict[str, pd.DataFrame]:
+        """
+        Grade a whole cohort at once and run an item analysis.
+        
+        ``answers`` is an integer matrix (students x questions) of chosen
+        option indices, with -1 for unanswered; ``key`` defaults to this
+        quiz's correct indices. Returns per-student scores and feedback,
+        per-question difficulty (share correct), upper-lower 27%
+        discrimination and rest-score point-biserial correlation, and the
+        share of students choosing each option.
+        """
+        answers = np.asarray(answers, dtype=np.int64)
+        key = np.asarray([q['correct'] for q in self.questions] if key is None else key, dtype=np.int64)
+        n_students, n_questions = answers.shape
+        if len(key) != n_questions:
+            raise ValueError(f"Answer key has {len(key)} entries for {n_questions} questions")
+        
+        correct = answers == key
+        scores = correct.sum(axis=1)
+        percent = 100.0 * scores / n_questions if n_questions else np.zeros(n_students)
+        
+        # Feedback bands, one _get_feedback_message call per band
+        thresholds = [50, 70, 90]
+        messages = np.array([self._get_feedback_message(score) for score in [0] + thresholds], dtype=object)
+        feedback = messages[np.digitize(percent, thresholds)]
+        
+        # Difficulty and discrimination
+        correct_f = correct.astype(np.float64)
+        difficulty = correct_f.mean(axis=0)
+        group = max(1, int(round(0.27 * n_students)))
+        ranked = np.argsort(scores, kind='stable')
+        discrimination = correct_f[ranked[-group:]].mean(axis=0) - correct_f[ranked[:group]].mean(axis=0)
+        rest = scores[:, None] - correct_f
+        item_dev = correct_f - difficulty
+        rest_dev = rest - rest.mean(axis=0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            point_biserial = (item_dev * rest_dev).mean(axis=0) / (item_dev.std(axis=0) * rest_dev.std(axis=0))
+        
+        # Option choice frequencies: one bincount over (question, option) pairs
+        answered = answers >= 0
+        n_options = int(max(answers.max(initial=-1), key.max(initial=-1))) + 1
+        columns = np.broadcast_to(np.arange(n_questions), answers.shape)
+        counts = np.bincount((columns[answered] * n_options + answers[answered]),
+                             minlength=n_questions * n_options).reshape(n_questions, n_options)
+        
+        question_index = pd.RangeIndex(1, n_questions + 1, name='question')
+        return {
+            'students': pd.DataFrame({
+                'score': scores,
+                'percent': percent,
+                'answered': answered.sum(axis=1),
+                'feedback': feedback
+            }, index=pd.Index(students if students is not None else range(n_students), name='student')),
+            'items': pd.DataFrame({
+                'key': key,
+                'difficulty': difficulty,
+                'discrimination': discrimination,
+                'point_biserial': point_biserial,
+                'omitted': 1 - answered.mean(axis=0) if n_students else np.zeros(n_questions)
+            }, index=question_index),
+            'distractors': pd.DataFrame(counts / max(n_students, 1), index=question_index,
+                                        columns=pd.RangeIndex(n_options, name='option'))
+        }
     
     def _get_feedback_message(self, score: float) -> str:
         """Get feedback message based on score"""
@@ -211,57 +323,341 @@ class CodePlayground:
         return container
 
 
-class DataExplorer:
-    """Interactive data exploration widget"""
+class DataGrid:
+    """
+    Paginated, sortable table view of a DataFrame.
     
-    def __init__(self, df: pd.DataFrame, name: str = "Dataset"):
+    Only the rows of the current page are sliced and rendered. Sorting goes
+    through a per-column argsort that is computed once and cached, so paging
+    through a large sorted frame stays proportional to the page size.
+    """
+    
+    PAGE_SIZES = [10, 20, 50, 100]
+    
+    def __init__(self, df: pd.DataFrame, page_size: int = 20, title: str = None):
         self.df = df
-        self.name = name
+        self.page_size = page_size
+        self.title = title
+        self.page = 0
+        self.sort_column = None
+        self.ascending = True
+        self._orders = {}
+        self._missing = {}
+        
+    @property
+    def page_count(self) -> int:
+        return max(1, -(-len(self.df) // self.page_size))
+    
+    def sort_order(self, column, ascending: bool = True) -> np.ndarray:
+        """Row positions of the frame sorted by column, missing values last (cached)"""
+        key = (column, ascending)
+        if key not in self._orders:
+            if ascending:
+                series = self.df[column]
+                if pd.api.types.is_numeric_dtype(series.dtype) and not pd.api.types.is_bool_dtype(series.dtype):
+                    # numpy places NaN at the end of a sort
+                    ranks = series.to_numpy(dtype=float, na_value=np.nan)
+                else:
+                    try:
+                        ranks, uniques = pd.factorize(series, sort=True)
+                    except TypeError:
+                        # Mixed types that cannot be compared directly
+                        ranks, uniques = pd.factorize(series.astype(str).where(series.notna()), sort=True)
+                    ranks = np.where(ranks < 0, len(uniques), ranks)
+                self._orders[key] = np.argsort(ranks, kind='stable')
+                self._missing[column] = int(series.isna().sum())
+            else:
+                # Reverse the ascending order, keeping missing values at the end
+                order = self.sort_order(column, True)
+                present = len(order) - self._missing[column]
+                self._orders[key] = np.concatenate([order[:present][::-1], order[present:]])
+        return self._orders[key]
+    
+    def get_page(self, page: int = None) -> pd.DataFrame:
+        """Rows of the requested page, in the current sort order"""
+        page = self.page if page is None else page
+        start = page * self.page_size
+        stop = min(start + self.page_size, len(self.df))
+        if self.sort_column is None:
+            return self.df.iloc[start:stop]
+        return self.df.iloc[self.sort_order(self.sort_column, self.ascending)[start:stop]]
+    
+    def create_grid(self):
+        """Create the paginated grid widget"""
+        output = widgets.Output()
+        
+        page_size_select = widgets.Dropdown(
+            options=sorted(set(self.PAGE_SIZES + [self.page_size])),
+            value=self.page_size,
+            description='Rows:',
+            layout=widgets.Layout(width='150px')
+        )
+        sort_select = widgets.Dropdown(
+            options=[('(none)', None)] + [(str(c), c) for c in self.df.columns],
+            value=self.sort_column,
+            description='Sort by:',
+        )
+        order_toggle = widgets.ToggleButtons(
+            options=[('Asc', True), ('Desc', False)],
+            value=self.ascending,
+            layout=widgets.Layout(width='auto')
+        )
+        prev_btn = widgets.Button(description='Previous', icon='arrow-left')
+        next_btn = widgets.Button(description='Next', icon='arrow-right')
+        page_label = widgets.HTML()
+        
+        def render():
+            page_label.value = f"Page <b>{self.page + 1}</b> of {self.page_count} ({len(self.df):,} rows)"
+            prev_btn.disabled = self.page == 0
+            next_btn.disabled = self.page >= self.page_count - 1
+            # Set outputs directly rather than capturing with `with output:`,
+            # so the grid can also be built from a background thread
+            output.outputs = ()
+            if self.title:
+                output.append_display_data(HTML(self.title))
+            output.append_display_data(self.get_page())
+        
+        def go_to(page):
+            self.page = min(max(page, 0), self.page_count - 1)
+            render()
+        
+        def on_page_size(change):
+            first_row = self.page * self.page_size
+            self.page_size = change['new']
+            go_to(first_row // self.page_size)
+        
+        def on_sort(change):
+            self.sort_column = sort_select.value
+            self.ascending = order_toggle.value
+            go_to(0)
+        
+        prev_btn.on_click(lambda btn: go_to(self.page - 1))
+        next_btn.on_click(lambda btn: go_to(self.page + 1))
+        page_size_select.observe(on_page_size, names='value')
+        sort_select.observe(on_sort, names='value')
+        order_toggle.observe(on_sort, names='value')
+        
+        render()
         
+        return widgets.VBox([
+            widgets.HBox([sort_select, order_toggle, page_size_select]),
+            output,
+            widgets.HBox([prev_btn, page_label, next_btn])
+        ])
+
+
+class DataExplorer:
+    """Interactive data exploration widget
+    
+    Besides a DataFrame, ``df`` may be a CSV/Parquet path or an iterable of
+    chunks. The data is then read once, when the explorer is first shown (or
+    ``df``/``sketches`` first accessed), to build a reservoir sample (used
+    for the preview and scatter/line plots) and per-column sketches
+    (statistics and info); filters and the remaining plots run as chunked
+    scans.
+    """
+    
+    # Seconds of typing inactivity before a live filter runs
+    LIVE_FILTER_DELAY = 0.3
+    # Most matching rows kept for display when filtering a chunked source
+    FILTER_ROW_LIMIT = 100_000
+    # Points drawn by scatter/box plots before switching to a seeded sample
+    PLOT_POINT_BUDGET = 10_000
+    PLOT_SEED = 0
+    # Most distinct values a column may have to be offered for grouping
+    MAX_PLOT_GROUPS = 20
+    
+    def __init__(self, df, name: str = "Dataset", chunksize: int = 100_000,
+                 sample_size: int = 10_000):
+        self.name = name
+        self.sample_size = sample_size
+        self.source = None
+        self._df = None
+        self._sketches = None
+        if isinstance(df, pd.DataFrame):
+            self._df = df
+        else:
+            self.source = ChunkedSource(df, chunksize)
+        self.filters = None
+        self._executor = None
+        self._futures = set()
+    
+    @property
+    def df(self) -> pd.DataFrame:
+        """The explored frame; for a chunked source, the reservoir sample"""
+        if self._df is None:
+            self._load()
+        return self._df
+    
+    @df.setter
+    def df(self, df: pd.DataFrame):
+        self._df = df
+    
+    @property
+    def sketches(self):
+        """Per-column sketches of a chunked source (None for a DataFrame)"""
+        if self.source is not None and self._sketches is None:
+            self._load()
+        return self._sketches
+    
+    def _load(self, progress=None):
+        """Initial pass over a chunked source: reservoir sample and column sketches"""
+        sampler = ReservoirSampler(self.sample_size)
+        self._sketches = StreamingProfiler.sketch(sampler.observe(self._scan(progress)))
+        self._df = sampler.sample()
+    
+    def _filter_engine(self) -> FilterEngine:
+        """Filter engine over the current frame, rebuilt if explorer.df was replaced"""
+        if self.filters is None or self.filters.df is not self.df:
+            self.filters = FilterEngine(self.df)
+        return self.filters
+        
+    def close(self):
+        """Stop the filter worker and delete any chunks spilled from a one-shot source"""
+        if self._executor is not None:
+            # Drop queued filters by hand: shutdown(cancel_futures=True) needs Python 3.9
+            for future in list(self._futures):
+                future.cancel()
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        if self.source is not None:
+            self.source.close()
+    
+    @staticmethod
+    def _progress_bar(label: str):
+        return widgets.HBox([
+            widgets.FloatProgress(value=0, min=0, max=1, description=label),
+            widgets.HTML()
+        ])
+    
+    def _scan(self, progress=None, columns: List[str] = None, cancelled: Callable = None):
+        """Chunks of one pass over the source, reporting progress as they are read"""
+        total = self.source.rows
+        done = 0
+        for chunk in self.source.scan(columns):
+            if cancelled is not None and cancelled():
+                return
+            done += len(chunk)
+            if progress is not None:
+                bar, text = progress.children
+                if total:
+                    bar.value = done / total
+                    text.value = f"{done:,} of {total:,} rows"
+                else:
+                    text.value = f"{done:,} rows"
+            yield chunk
+        if progress is not None:
+            progress.children[0].value = 1
+    
+    def _scan_filter(self, col, val, query, progress=None, cancelled: Callable = None):
+        """Rows matching a filter in a chunked scan (at most FILTER_ROW_LIMIT kept) and the match count"""
+        kept = []
+        matched = 0
+        room = self.FILTER_ROW_LIMIT
+        for chunk in self._scan(progress, cancelled=cancelled):
+            mask = FilterEngine(chunk).mask(query) if query else ColumnIndex.match(chunk[col], val)
+            matched += int(mask.sum())
+            if room > 0:
+                rows = chunk[mask].iloc[:room]
+                kept.append(rows)
+                room -= len(rows)
+        return (pd.concat(kept) if kept else self.df.iloc[:0]), matched
+    
+    def _filter_executor(self) -> ThreadPoolExecutor:
+        """Single background worker, so filtering never blocks the kernel"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='explorer-filter')
+        return self._executor
+    
     def create_explorer(self):
-        """Create interactive data explorer"""
+        """Create interactive data explorer
+        
+        Tabs are built the first time they are selected and kept afterwards,
+        so opening the explorer only pays for the preview.
+        """
+        if self.source is not None and self._sketches is None:
+            progress = self._progress_bar('Reading')
+            display(progress)
+            self._load(progress)
+            progress.close()
         
         # Tab widget for different views
         tab = widgets.Tab()
         
-        # Data preview
-        preview_output = widgets.Output()
-        with preview_output:
-            display(HTML(f"<h4>Dataset: {self.name}</h4>"))
-            display(self.df.head(10))
+        builders = [
+            ('Preview', self._create_preview_widget),
+            ('Statistics', self._create_statistics_widget),
+            ('Info', self._create_info_widget),
+            ('Filter', self._create_filter_widget),
+            ('Visualize', self._create_visualization_widget),
+        ]
+        
+        # Empty placeholders, filled in on first selection
+        tab.children = [widgets.VBox() for _ in builders]
+        for i, (title, _) in enumerate(builders):
+            tab.set_title(i, title)
+        
+        loaded = set()
+        
+        def load_tab(index):
+            if index is None or index in loaded:
+                return
+            title, build = builders[index]
+            try:
+                content = build()
+            except Exception as e:
+                # Leave the tab unloaded so selecting it again retries
+                content = widgets.Output()
+                content.append_stdout(f"❌ Error loading {title}: {e}\n")
+            else:
+                loaded.add(index)
+            tab.children[index].children = [content]
+        
+        tab.observe(lambda change: load_tab(change['new']), names='selected_index')
+        load_tab(tab.selected_index or 0)
         
-        # Statistics
+        return tab
+    
+    def _create_preview_widget(self):
+        """Create paginated data preview"""
+        title = f"<h4>Dataset: {self.name}</h4>"
+        if self.source is not None:
+            title += f"<i>Random sample of {len(self.df):,} of {self.source.rows:,} rows</i>"
+        return DataGrid(self.df, page_size=10, title=title).create_grid()
+    
+    def _create_statistics_widget(self):
+        """Create statistical summary output"""
         stats_output = widgets.Output()
         with stats_output:
             display(HTML("<h4>Statistical Summary</h4>"))
-            display(self.df.describe())
-        
-        # Info
+            if self.source is not None:
+                display(HTML("<i>Exact counts, means and spreads; quartiles estimated from streaming sketches</i>"))
+                display(StreamingProfiler.describe(self.sketches))
+            else:
+                display(ColumnProfiler.describe(self.df))
+        return stats_output
+    
+    def _create_info_widget(self):
+        """Create dataset information output"""
         info_output = widgets.Output()
         with info_output:
             display(HTML("<h4>Dataset Information</h4>"))
-            print(f"Shape: {self.df.shape}")
-            print(f"Columns: {list(self.df.columns)}")
-            print(f"\nData Types:")
-            print(self.df.dtypes)
-            print(f"\nMissing Values:")
-            print(self.df.isnull().sum())
-        
-        # Interactive filter
-        filter_container = self._create_filter_widget()
-        
-        # Visualization
-        viz_container = self._create_visualization_widget()
-        
-        # Set up tabs
-        tab.children = [preview_output, stats_output, info_output, filter_container, viz_container]
-        tab.set_title(0, 'Preview')
-        tab.set_title(1, 'Statistics')
-        tab.set_title(2, 'Info')
-        tab.set_title(3, 'Filter')
-        tab.set_title(4, 'Visualize')
-        
-        return tab
+            if self.source is not None:
+                # Counted over the whole source in the initial pass
+                print(f"Shape: {(self.source.rows, len(self.sketches))}")
+                print(f"Columns: {list(self.sketches)}")
+                print(f"\nData Types:")
+                print(pd.Series({col: sketch.dtype for col, sketch in self.sketches.items()}))
+                print(f"\nMissing Values:")
+                print(pd.Series({col: sketch.null_count for col, sketch in self.sketches.items()}))
+            else:
+                print(f"Shape: {self.df.shape}")
+                print(f"Columns: {list(self.df.columns)}")
+                print(f"\nData Types:")
+                print(self.df.dtypes)
+                print(f"\nMissing Values:")
+                print(ColumnProfiler.null_counts(self.df))
+        return info_output
     
     def _create_filter_widget(self):
         """Create interactive filter widget"""
@@ -277,11 +673,18 @@ class DataExplorer:
         
         # Value input
         value_input = widgets.Text(
-            placeholder='Enter filter value',
+            placeholder='Text, number, range (10..20) or comparison (>5)',
             description='Value:',
             disabled=False,
         )
         
+        # Compound expression, takes precedence over column/value
+        query_input = widgets.Text(
+            placeholder="e.g. amount > 500 and location_risk == 'High' and hour in [2, 3, 4]",
+            description='Query:',
+            layout=widgets.Layout(width='90%')
+        )
+        
         # Filter button
         filter_btn = widgets.Button(
             description='Apply Filter',
@@ -289,40 +692,252 @@ class DataExplorer:
             icon='filter'
         )
         
+        # Re-run the filter as the inputs change
+        live_toggle = widgets.Checkbox(
+            value=False,
+            description='Live filter',
+            indent=False
+        )
+        
         # Results area
+        status = widgets.HTML()
+        progress = self._progress_bar('Scanning')
+        progress.layout.display = 'none'
         results_output = widgets.Output()
         
+        # Only the latest query (highest generation) may render its result
+        state = {'generation': 0, 'timer': None, 'future': None}
+        lock = threading.Lock()
+        
+        def render(generation, filtered=None, error=None, elapsed=0.0, matched=None):
+            # Called from the worker thread, so write the Output widget's
+            # outputs directly instead of capturing with a context manager
+            with lock:
+                if generation != state['generation']:
+                    return
+                results_output.outputs = ()
+                if error is not None:
+                    status.value = ''
+                    results_output.append_stdout(f"Error: {error}\n")
+                elif filtered is None:
+                    status.value = ''
+                else:
+                    count = len(filtered) if matched is None else matched
+                    status.value = f"<i>{count:,} rows in {elapsed * 1000:.0f} ms</i>"
+                    title = f"<b>Filtered Results ({len(filtered)} rows):</b>"
+                    if matched is not None and matched > len(filtered):
+                        title = f"<b>Filtered Results ({matched:,} rows, showing the first {len(filtered):,}):</b>"
+                    grid = DataGrid(filtered, page_size=20, title=title)
+                    results_output.append_display_data(grid.create_grid())
+        
+        def run_filter(generation, col, val, query):
+            if generation != state['generation']:
+                return
+            start = time.time()
+            matched = None
+            try:
+                if not query and val == '':
+                    filtered = None
+                elif self.source is not None:
+                    # Chunked scan, abandoned as soon as a newer query arrives
+                    progress.layout.display = None
+                    filtered, matched = self._scan_filter(
+                        col, val, query, progress,
+                        cancelled=lambda: generation != state['generation'])
+                elif query:
+                    filtered = self._filter_engine().filter(query)
+                else:
+                    # Numeric columns take a value or range, others a substring
+                    filtered = self.df.iloc[self._filter_engine().index(col).query(val)]
+            except Exception as e:
+                render(generation, error=e)
+                return
+            render(generation, filtered, elapsed=time.time() - start, matched=matched)
+        
+        def submit():
+            with lock:
+                if state['timer'] is not None:
+                    state['timer'].cancel()
+                    state['timer'] = None
+                state['generation'] += 1
+                # Drop a queued query that hasn't started; a running one is ignored on completion
+                if state['future'] is not None:
+                    state['future'].cancel()
+                status.value = '<i>Filtering...</i>'
+                state['future'] = self._filter_executor().submit(
+                    run_filter, state['generation'], column_select.value,
+                    value_input.value, query_input.value.strip())
+                self._futures.add(state['future'])
+                state['future'].add_done_callback(self._futures.discard)
+        
+        def schedule(change):
+            if not live_toggle.value:
+                return
+            with lock:
+                if state['timer'] is not None:
+                    state['timer'].cancel()
+                state['timer'] = threading.Timer(self.LIVE_FILTER_DELAY, submit)
+                state['timer'].daemon = True
+                state['timer'].start()
+        
         def apply_filter(btn):
-            with results_output:
-                clear_output()
-                try:
-                    col = column_select.value
-                    val = value_input.value
-                    
-                    # Try to convert to appropriate type
-                    if self.df[col].dtype in ['int64', 'float64']:
-                        val = float(val)
-                        filtered = self.df[self.df[col] == val]
-                    else:
-                        filtered = self.df[self.df[col].astype(str).str.contains(val, case=False)]
-                    
-                    display(HTML(f"<b>Filtered Results ({len(filtered)} rows):</b>"))
-                    display(filtered.head(20))
-                except Exception as e:
-                    print(f"Error: {e}")
+            submit()
         
         filter_btn.on_click(apply_filter)
+        for control in (column_select, value_input, query_input, live_toggle):
+            control.observe(schedule, names='value')
         
         container = widgets.VBox([
             widgets.HTML("<h4>Interactive Filter</h4>"),
             column_select,
             value_input,
-            filter_btn,
+            widgets.HTML("<i>or combine conditions in a query:</i>"),
+            query_input,
+            widgets.HBox([filter_btn, live_toggle]),
+            progress,
+            status,
             results_output
         ])
         
         return container
     
+    def _scan_figure(self, chart, x, numeric_cols, progress=None):
+        """Histogram, bar and correlation figures over the whole chunked source"""
+        if chart == 'correlation':
+            corr = StreamingProfiler.corr(self._scan(progress, numeric_cols), numeric_cols)
+            return px.imshow(corr, title='Correlation Matrix',
+                             labels=dict(color="Correlation"))
+        sketch = self.sketches[x]
+        if not sketch.numeric and sketch.count > sketch.null_count:
+            # Text, boolean and category columns: count each value, as px.histogram does
+            counts = StreamingProfiler.value_counts(self._scan(progress, [x]), x)
+            shown = counts.head(50)
+            kind = 'Histogram' if chart == 'histogram' else 'Bar Chart'
+            return px.bar(x=shown.index.astype(str), y=shown.values,
+                          labels={'x': x, 'y': 'Count'},
+                          title=f'{kind} of {x}' + (f' (top {len(shown)})' if len(shown) < len(counts) else ''))
+        if not sketch.n:
+            return None
+        digest = sketch.quantiles
+        counts, edges = StreamingProfiler.histogram(self._scan(progress, [x]), x,
+                                                    value_range=(digest.min, digest.max))
+        fig = go.Figure(go.Bar(x=(edges[:-1] + edges[1:]) / 2, y=counts, width=np.diff(edges)))
+        fig.update_layout(title=f'Histogram of {x}' if chart == 'histogram' else f'Bar Chart of {x}',
+                          xaxis_title=x, yaxis_title='count', bargap=0)
+        return fig
+    
+    def _plot_sample(self, by: str = None, progress=None):
+        """Seeded plotting sample within PLOT_POINT_BUDGET and the full row count per group"""
+        budget = self.PLOT_POINT_BUDGET
+        if by is None:
+            total = len(self.df) if self.source is None else self.source.rows
+            # A chunked source's in-memory frame is already a uniform reservoir sample
+            sample = self.df if len(self.df) <= budget else self.df.sample(budget, random_state=self.PLOT_SEED)
+            return sample, {None: total}
+        sampler = StratifiedSampler(by, budget, seed=self.PLOT_SEED)
+        for chunk in ([self.df] if self.source is None else self._scan(progress)):
+            sampler.update(chunk)
+        return sampler.sample(budget), sampler.counts
+    
+    @staticmethod
+    def _box_summary(values: pd.Series) -> Dict[str, float]:
+        """Exact box statistics with Tukey whiskers, as px.box would draw them"""
+        v = values.to_numpy(dtype=np.float64, na_value=np.nan)
+        v = v[~np.isnan(v)]
+        q1, median, q3 = np.quantile(v, [0.25, 0.5, 0.75])
+        iqr = q3 - q1
+        return {'n': len(v), 'q1': q1, 'median': median, 'q3': q3,
+                'lowerfence': v[v >= q1 - 1.5 * iqr].min(), 'upperfence': v[v <= q3 + 1.5 * iqr].max(),
+                'mean': v.mean(), 'sd': v.std(ddof=1) if len(v) > 1 else 0.0}
+    
+    def _sampled_figure(self, chart, x, y=None, by=None, progress=None):
+        """
+        Scatter or box plot drawn from a seeded uniform (or, with ``by``,
+        stratified) sample, with statistics over every row overlaid. Legend
+        entries state how many points are drawn out of how many rows.
+        Non-numeric columns get no numeric overlay: scatter plots show the
+        sampled points only, and box plots fall back to px.box.
+        """
+        def numeric(column):
+            return ColumnProfiler.is_numeric(self.df[column].dtype)
+        
+        if chart == 'box' and not numeric(x):
+            # Nothing to summarize; plot every in-memory row as before, or the sample
+            data = self.df if self.source is None else self._plot_sample(progress=progress)[0]
+            return px.box(data, y=x, title=f'Box Plot of {x}')
+        
+        sample, totals = self._plot_sample(by, progress)
+        fig = go.Figure()
+        
+        if chart == 'scatter':
+            groups = [(None, sample)] if by is None else sample.groupby(by, sort=True, dropna=False, observed=True)
+            for key, group in groups:
+                label = 'Sample' if by is None else str(key)
+                fig.add_trace(InteractiveVisualizer.scatter_trace(
+                    group[x], group[y], mode='markers', marker=dict(size=4, opacity=0.6),
+                    name=f"{label}: {len(group):,} of {totals.get(key, len(group)):,} rows"))
+            fig.update_layout(title=f'{x} vs {y}', xaxis_title=x, yaxis_title=y)
+            if not (numeric(x) and numeric(y)):
+                return fig
+            
+            stats = StreamingProfiler.pair_stats(
+                self.df if self.source is None else self._scan(progress, [x, y]), x, y)
+            if np.isfinite(stats['slope']):
+                ends = np.array([stats['min_x'], stats['max_x']])
+                fig.add_trace(go.Scatter(x=ends, y=stats['intercept'] + stats['slope'] * ends, mode='lines',
+                                         line=dict(color='black', dash='dash'),
+                                         name=f"Least-squares fit (all {stats['n']:,} rows)"))
+            fig.add_trace(go.Scatter(x=[stats['mean_x']], y=[stats['mean_y']], mode='markers',
+                                     marker=dict(symbol='x', size=12, color='black'),
+                                     name='Mean (all rows)'))
+            fig.add_annotation(
+                xref='paper', yref='paper', x=0.01, y=0.99, showarrow=False, align='left',
+                bgcolor='rgba(255,255,255,0.8)',
+                text=(f"All {stats['n']:,} rows: r = {stats['r']:.3f}<br>"
+                      f"{y} = {stats['intercept']:.4g} + {stats['slope']:.4g} × {x}"))
+            return fig
+        
+        # Box: exact quartiles and whiskers for in-memory frames; for chunked
+        # sources counts, means and extremes are exact and quartiles come
+        # from per-group digests
+        if self.source is None:
+            groups = [(None, self.df[x])] if by is None else self.df[x].groupby(self.df[by], sort=True, dropna=False, observed=True)
+            summary = {key: self._box_summary(values) for key, values in groups if values.notna().any()}
+        else:
+            summary = {}
+            columns = [x] if by is None else [x, by]
+            sketches = StreamingProfiler.sketch_by(self._scan(progress, columns), x, by)
+            for key, sketch in sorted(sketches.items(), key=lambda item: str(item[0])):
+                if not sketch.n:
+                    continue
+                digest = sketch.quantiles
+                q1, median, q3 = digest.quantile([0.25, 0.5, 0.75])
+                iqr = q3 - q1
+                summary[None if by is None else key] = {
+                    'n': sketch.n, 'q1': q1, 'median': median, 'q3': q3,
+                    'lowerfence': max(digest.min, q1 - 1.5 * iqr), 'upperfence': min(digest.max, q3 + 1.5 * iqr),
+                    'mean': sketch.mean, 'sd': sketch.std}
+        
+        labels = {str(key): x if by is None else f"{key} (n={s['n']:,})" for key, s in summary.items()}
+        fig.add_trace(go.Box(
+            x=list(labels.values()), name=f"All rows ({sum(s['n'] for s in summary.values()):,})",
+            boxpoints=False, boxmean='sd',
+            **{field: [s[field] for s in summary.values()]
+               for field in ('q1', 'median', 'q3', 'lowerfence', 'upperfence', 'mean', 'sd')}))
+        if by is None:
+            points, point_labels = sample[x], [x] * len(sample)
+        else:
+            keys = sample[by].astype(str)
+            points, point_labels = sample[x][keys.isin(labels.keys())], keys.map(labels).dropna()
+        fig.add_trace(go.Box(
+            x=point_labels, y=points,
+            name=f"Sample ({len(points):,} rows)", boxpoints='all', jitter=0.4, pointpos=0,
+            fillcolor='rgba(0,0,0,0)', line=dict(color='rgba(0,0,0,0)'),
+            marker=dict(size=3, opacity=0.4), hoveron='points'))
+        title = f'Box Plot of {x}' + ('' if self.source is None else ' (quartiles estimated)')
+        fig.update_layout(title=title, boxmode='overlay', yaxis_title=x)
+        return fig
+    
     def _create_visualization_widget(self):
         """Create interactive visualization widget"""
         viz_output = widgets.Output()
@@ -332,7 +947,7 @@ class DataExplorer:
         
         # Chart type selector
         chart_type = widgets.Dropdown(
-            options=['histogram', 'scatter', 'bar', 'box', 'correlation'],
+            options=['histogram', 'scatter', 'line', 'bar', 'box', 'correlation'],
             description='Chart Type:',
             disabled=False,
         )
@@ -351,6 +966,15 @@ class DataExplorer:
             disabled=False,
         )
         
+        # Colour / stratify scatter and box plots by a low-cardinality column
+        group_cols = [c for c in categorical_cols if self.df[c].nunique() <= self.MAX_PLOT_GROUPS]
+        group_column = widgets.Dropdown(
+            options=['None'] + group_cols,
+            value='None',
+            description='Group by:',
+            disabled=False,
+        )
+        
         # Plot button
         plot_btn = widgets.Button(
             description='Create Plot',
@@ -359,6 +983,8 @@ class DataExplorer:
         )
         
         # Plot area
+        progress = self._progress_bar('Scanning')
+        progress.layout.display = 'none' if self.source is None else None
         plot_output = widgets.Output()
         
         def create_plot(btn):
@@ -368,11 +994,37 @@ class DataExplorer:
                     chart = chart_type.value
                     x = x_column.value
                     y = y_column.value if y_column.value != 'None' else None
+                    by = group_column.value if group_column.value != 'None' else None
+                    
+                    # Re-clicking with unchanged data and settings reuses the stored figure
+                    cache = PlottingUtils.figure_cache
+                    cache_key = None
+                    if cache is not None and cache.enabled and chart != 'line' and self.source is None:
+                        cache_key = cache.make_key(chart, self.df, x=x, y=y, by=by)
+                        cached = cache.get(cache_key)
+                        if cached is not None:
+                            InteractiveVisualizer.show_figure(cached)
+                            return
                     
-                    if chart == 'histogram':
+                    # Large frames: seeded sample with exact full-data overlays
+                    oversized = self.source is not None or len(self.df) > self.PLOT_POINT_BUDGET
+                    if oversized and (chart == 'box' or (chart == 'scatter' and y)):
+                        fig = self._sampled_figure(chart, x, y, by, progress)
+                    elif self.source is not None and chart in ('histogram', 'bar', 'correlation'):
+                        fig = self._scan_figure(chart, x, numeric_cols, progress)
+                        if fig is None:
+                            print("Please select appropriate columns for this chart type")
+                            return
+                    elif chart == 'histogram':
                         fig = px.histogram(self.df, x=x, title=f'Histogram of {x}')
                     elif chart == 'scatter' and y:
-                        fig = px.scatter(self.df, x=x, y=y, title=f'{x} vs {y}')
+                        render_mode = 'webgl' if len(self.df) > InteractiveVisualizer.WEBGL_THRESHOLD else 'svg'
+                        fig = px.scatter(self.df, x=x, y=y, color=by, title=f'{x} vs {y}',
+                                         render_mode=render_mode)
+                    elif chart == 'line' and y:
+                        # Zoomable, LTTB-downsampled widget (e.g. date vs temperature)
+                        display(InteractiveVisualizer.create_time_series(self.df, x, y))
+                        return
                     elif chart == 'bar':
                         if x in categorical_cols:
                             counts = self.df[x].value_counts()
@@ -382,7 +1034,7 @@ class DataExplorer:
                         else:
                             fig = px.histogram(self.df, x=x, title=f'Bar Chart of {x}')
                     elif chart == 'box':
-                        fig = px.box(self.df, y=x, title=f'Box Plot of {x}')
+                        fig = px.box(self.df, x=by, y=x, title=f'Box Plot of {x}')
                     elif chart == 'correlation':
                         corr = self.df[numeric_cols].corr()
                         fig = px.imshow(corr, title='Correlation Matrix',
@@ -391,7 +1043,9 @@ class DataExplorer:
                         print("Please select appropriate columns for this chart type")
                         return
                     
-                    fig.show()
+                    if cache_key is not None:
+                        cache.put(cache_key, fig)
+                    InteractiveVisualizer.show_figure(fig)
                 except Exception as e:
                     print(f"Error creating plot: {e}")
         
@@ -402,7 +1056,9 @@ class DataExplorer:
             chart_type,
             x_column,
             y_column,
+            group_column,
             plot_btn,
+            progress,
             plot_output
         ])
         
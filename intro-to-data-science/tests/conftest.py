@@ -0,0 +1,8 @@
+import os
+import sys
+
+import matplotlib
+
+# Modules live next to the notebooks, not in an installed package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+matplotlib.use('Agg')
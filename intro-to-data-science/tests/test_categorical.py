@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_science_utils import DataAnalysisUtils
+
+
+@pytest.fixture
+def orders():
+    rng = np.random.default_rng(0)
+    n = 10_000
+    df = pd.DataFrame({
+        'city': rng.choice(['Oslo', 'Lima', 'Pune', 'Kyiv'], n),
+        'channel': pd.Categorical(rng.choice(['web', 'app'], n), categories=['web', 'app', 'phone']),
+        'status': rng.choice(['new', 'paid', 'sent', None], n),
+    })
+    return df
+
+
+def test_categorical_analysis_matches_pandas(orders):
+    result = DataAnalysisUtils.analyze_categorical_columns(orders, pairs=[('city', 'status')])
+    for col in orders.columns:
+        analysis = result['columns'][col]
+        assert list(analysis['value_counts'].items()) == list(orders[col].value_counts().items())
+        assert analysis['unique_count'] == orders[col].nunique()
+        assert analysis['mode'] == orders[col].mode().iloc[0]
+        assert analysis['null_count'] == orders[col].isnull().sum()
+
+    expected = pd.crosstab(orders['city'], orders['status'])
+    pd.testing.assert_frame_equal(result['contingency'][('city', 'status')], expected, check_names=False)
+
+
+def test_high_cardinality_pairs_only_count_observed_cells(monkeypatch):
+    n = 200_000
+    # A dense grid would need n * n cells
+    ids = pd.DataFrame({'user': np.arange(n).astype(str), 'session': (np.arange(n) * 7).astype(str)})
+    monkeypatch.setattr(DataAnalysisUtils, 'CONTINGENCY_MAX_CELLS', 1_000_000)
+    table = DataAnalysisUtils.analyze_categorical_columns(ids, [], pairs=[('user', 'session')])['contingency'][('user', 'session')]
+    assert isinstance(table, pd.Series)
+    assert len(table) == n and (table == 1).all()
+    assert table.index.names == ['user', 'session']
+    assert table.loc[('3', '21')] == 1
@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_science_utils import ColumnProfiler, ProfileCache
+
+
+@pytest.fixture
+def wide_frame():
+    rng = np.random.default_rng(0)
+    n = 5_000
+    df = pd.DataFrame({f'f{i}': rng.normal(size=n) for i in range(12)})
+    df['i'] = rng.integers(0, 50, n)
+    df['nullable'] = pd.array(rng.integers(0, 9, n), dtype='Int64')
+    df['city'] = rng.choice(['Oslo', 'Lima', None], n)
+    df['flag'] = rng.random(n) > 0.5
+    df.loc[::13, 'f3'] = np.nan
+    df.loc[::17, 'nullable'] = pd.NA
+    return df
+
+
+@pytest.fixture
+def no_cache(monkeypatch):
+    monkeypatch.setattr(ColumnProfiler, 'cache', None)
+
+
+def test_threaded_profile_matches_single_thread_and_pandas(wide_frame, no_cache):
+    single = ColumnProfiler.profile(wide_frame, workers=1)
+    threaded = ColumnProfiler.profile(wide_frame, workers=4)
+    pd.testing.assert_frame_equal(threaded, single)
+
+    assert list(single['column']) == list(wide_frame.columns)
+    assert list(single['null_count']) == list(wide_frame.isnull().sum())
+    assert list(single['unique_count']) == list(wide_frame.nunique())
+    numeric = single[single['numeric']].set_index('column')
+    np.testing.assert_allclose(numeric['mean'], wide_frame[numeric.index].astype(float).mean())
+    np.testing.assert_allclose(numeric['std'], wide_frame[numeric.index].astype(float).std())
+    assert single.set_index('column').loc['city', 'top_value'] == wide_frame['city'].mode().iloc[0]
+
+
+def test_threaded_null_counts_and_describe_match_pandas(wide_frame, no_cache):
+    pd.testing.assert_series_equal(ColumnProfiler.null_counts(wide_frame, workers=4), wide_frame.isnull().sum())
+    expected = wide_frame.describe().astype(float)
+    pd.testing.assert_frame_equal(ColumnProfiler.describe(wide_frame, workers=3)[expected.columns], expected)
+
+
+def test_profile_cache_serves_repeats_and_honours_invalidate(monkeypatch):
+    cache = ProfileCache()
+    monkeypatch.setattr(ColumnProfiler, 'cache', cache)
+    df = pd.DataFrame({'a': np.arange(50_000, dtype=float), 'b': np.arange(50_000) % 7})
+    first = ColumnProfiler.describe(df)
+    assert ColumnProfiler.describe(df).equals(first)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # An in-place edit to an unsampled row is only seen after invalidate()
+    df.loc[3, 'a'] = 1e9
+    cache.invalidate(df)
+    assert ColumnProfiler.describe(df).loc['max', 'a'] == 1e9
+    # A new frame with equal shape and dtypes gets its own entry
+    assert ColumnProfiler.describe(df.copy()).loc['max', 'a'] == 1e9
+    assert cache.misses == 3
+
+
+def test_profile_cache_lookup_does_not_hash_every_row(monkeypatch):
+    cache = ProfileCache(sample_rows=64)
+    hashed = []
+    original = pd.util.hash_pandas_object
+    monkeypatch.setattr(pd.util, 'hash_pandas_object', lambda obj, **kw: hashed.append(len(obj)) or original(obj, **kw))
+    cache.fingerprint(pd.DataFrame({'a': np.arange(1_000_000)}))
+    assert hashed == [64]
+
+
+def test_null_counts_are_not_cached(monkeypatch):
+    cache = ProfileCache()
+    monkeypatch.setattr(ColumnProfiler, 'cache', cache)
+    df = pd.DataFrame({'a': np.arange(5_000, dtype=float)})
+    df.loc[7, 'a'] = np.nan
+    assert ColumnProfiler.null_counts(df)['a'] == 1
+    df.loc[7, 'a'] = 1.0
+    assert ColumnProfiler.null_counts(df)['a'] == 0
+    assert cache.hits == cache.misses == 0
@@ -0,0 +1,226 @@
+import os
+import time
+
+import ipywidgets as widgets
+import numpy as np
+import pandas as pd
+import pytest
+
+import interactive_components
+from interactive_components import DataExplorer, DataGrid
+
+
+@pytest.fixture
+def sales():
+    rng = np.random.default_rng(0)
+    n = 2_000
+    return pd.DataFrame({
+        'amount': rng.lognormal(3, 1, n).round(2),
+        'hour': rng.integers(0, 24, n),
+        'region': rng.choice(['north', 'south', 'east'], n),
+    })
+
+
+def test_failed_tab_shows_error_and_retries(sales):
+    explorer = DataExplorer(sales)
+    calls = []
+
+    def flaky_statistics():
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError('profiling failed')
+        return widgets.HTML('stats')
+
+    explorer._create_statistics_widget = flaky_statistics
+    tab = explorer.create_explorer()
+    tab.selected_index = 1
+    error = tab.children[1].children[0]
+    assert isinstance(error, widgets.Output)
+    assert 'profiling failed' in error.outputs[0]['text']
+
+    tab.selected_index = 0
+    tab.selected_index = 1
+    assert tab.children[1].children[0].value == 'stats'
+    tab.selected_index = 0
+    tab.selected_index = 1
+    assert len(calls) == 2
+
+
+@pytest.mark.parametrize('column', ['amount', 'region'])
+@pytest.mark.parametrize('ascending', [True, False])
+def test_grid_pages_match_sort_values(sales, column, ascending):
+    sales = sales.copy()
+    sales.loc[::9, column] = None
+    grid = DataGrid(sales, page_size=50)
+    grid.sort_column, grid.ascending = column, ascending
+    expected = sales.sort_values(column, ascending=ascending, kind='stable', na_position='last')
+    pages = pd.concat([grid.get_page(page) for page in range(grid.page_count)])
+    # Ties may come in either order; the values must not
+    assert pages[column].fillna('NA').tolist() == expected[column].fillna('NA').tolist()
+    assert len(pages) == len(sales)
+
+
+def test_grid_widget_pages_and_resizes(sales):
+    grid = DataGrid(sales, page_size=20)
+    controls, output, nav = grid.create_grid().children
+    prev_btn, label, next_btn = nav.children
+    assert prev_btn.disabled and 'of 100' in label.value
+    next_btn.click()
+    next_btn.click()
+    assert grid.page == 2
+    assert output.outputs[-1]['data']['text/plain'] == repr(sales.iloc[40:60])
+    # Changing the page size keeps the first visible row on screen
+    controls.children[2].value = 50
+    assert (grid.page, grid.page_count) == (0, 40)
+    grid.page = grid.page_count - 1
+    next_btn.click()
+    assert grid.page == 39 and next_btn.disabled
+
+
+def wait_for(condition, timeout=10.0):
+    deadline = time.time() + timeout
+    while not condition():
+        assert time.time() < deadline, 'timed out waiting for the filter worker'
+        time.sleep(0.01)
+
+
+def filter_controls(explorer):
+    children = explorer._create_filter_widget().children
+    button, live = children[5].children
+    return children[1], children[2], children[4], button, live, children[7], children[8]
+
+
+def test_filter_runs_on_worker_and_renders_result(sales, monkeypatch):
+    grids = []
+    monkeypatch.setattr(interactive_components, 'DataGrid',
+                        lambda df, **kwargs: grids.append(df) or DataGrid(df, **kwargs))
+    explorer = DataExplorer(sales)
+    column, value, query, button, live, status, results = filter_controls(explorer)
+    try:
+        query.value = "amount > 50 and region == 'north'"
+        button.click()
+        # The status line is set just before the grid is appended
+        wait_for(lambda: len(results.outputs) == 1)
+        expected = sales[(sales['amount'] > 50) & (sales['region'] == 'north')]
+        assert status.value.startswith(f"<i>{len(expected):,} rows")
+        assert grids[-1].equals(expected)
+        assert 'application/vnd.jupyter.widget-view+json' in results.outputs[0]['data']
+
+        query.value = "amount >"
+        button.click()
+        wait_for(lambda: any(out.get('name') == 'stdout' for out in results.outputs))
+        assert 'Invalid filter expression' in results.outputs[0]['text']
+    finally:
+        explorer.close()
+
+
+def test_live_filter_debounces_to_the_latest_query(sales, monkeypatch):
+    monkeypatch.setattr(DataExplorer, 'LIVE_FILTER_DELAY', 0.05)
+    explorer = DataExplorer(sales)
+    column, value, query, button, live, status, results = filter_controls(explorer)
+    submitted = []
+    executor = explorer._filter_executor()
+    original = executor.submit
+    monkeypatch.setattr(executor, 'submit', lambda *args: submitted.append(args[4]) or original(*args))
+    try:
+        live.value = True
+        for text in ['hour', 'hour <', 'hour < 3']:
+            query.value = text
+        wait_for(lambda: 'rows in' in status.value)
+        assert submitted == ['hour < 3']
+        assert status.value.startswith(f"<i>{(sales['hour'] < 3).sum():,} rows")
+    finally:
+        explorer.close()
+
+
+@pytest.fixture
+def big_sales(tmp_path):
+    rng = np.random.default_rng(2)
+    n = 30_000
+    df = pd.DataFrame({
+        'amount': rng.lognormal(3, 1, n).round(2),
+        'hour': rng.integers(0, 24, n),
+        'region': rng.choice(['north', 'south', 'east', None], n),
+    })
+    path = tmp_path / 'sales.csv'
+    df.to_csv(path, index=False)
+    return df, str(path)
+
+
+def test_chunked_source_explorer_samples_and_scans_every_row(big_sales):
+    df, path = big_sales
+    explorer = DataExplorer(path, chunksize=4_000, sample_size=1_000)
+    try:
+        assert len(explorer.df) == 1_000 and explorer.source.rows == len(df)
+        assert {col: s.null_count for col, s in explorer.sketches.items()} == df.isnull().sum().to_dict()
+        assert explorer.sketches['amount'].mean == pytest.approx(df['amount'].mean())
+
+        filtered, matched = explorer._scan_filter(None, None, "amount > 100 and hour < 6")
+        expected = df[(df['amount'] > 100) & (df['hour'] < 6)]
+        assert matched == len(expected)
+        assert filtered['amount'].tolist() == expected['amount'].tolist()
+
+        fig = explorer._scan_figure('bar', 'region', ['amount', 'hour'])
+        assert dict(zip(fig.data[0].x, fig.data[0].y)) == df['region'].value_counts().to_dict()
+        fig = explorer._scan_figure('histogram', 'amount', ['amount', 'hour'])
+        assert sum(fig.data[0].y) == df['amount'].notna().sum()
+    finally:
+        explorer.close()
+
+
+def test_one_shot_chunk_iterator_is_spilled_and_cleaned_up(big_sales, tmp_path):
+    df, _ = big_sales
+    chunks = (df.iloc[i:i + 5_000] for i in range(0, len(df), 5_000))
+    explorer = DataExplorer(chunks, sample_size=500)
+    explorer.create_explorer()
+    assert explorer.source.rows == len(df)
+    filtered, matched = explorer._scan_filter('region', 'north', '')
+    assert matched == (df['region'] == 'north').sum()
+    spill_dir = explorer.source.spill_dir
+    assert os.listdir(spill_dir)
+    explorer.close()
+    assert not os.path.exists(spill_dir)
+
+
+@pytest.fixture
+def many_sales(monkeypatch):
+    monkeypatch.setattr(DataExplorer, 'PLOT_POINT_BUDGET', 1_000)
+    rng = np.random.default_rng(3)
+    n = 20_000
+    amount = rng.lognormal(3, 1, n)
+    return pd.DataFrame({
+        'amount': amount,
+        'tip': amount * 0.15 + rng.normal(size=n),
+        'region': rng.choice(['north', 'south', 'east'], n),
+    })
+
+
+def test_sampled_scatter_overlays_fit_over_all_rows(many_sales):
+    fig = DataExplorer(many_sales)._sampled_figure('scatter', 'amount', 'tip')
+    sample, fit = fig.data[0], fig.data[1]
+    assert len(sample.x) == 1_000 and sample.name == 'Sample: 1,000 of 20,000 rows'
+    slope, intercept = np.polyfit(many_sales['amount'], many_sales['tip'], 1)
+    ends = np.array([many_sales['amount'].min(), many_sales['amount'].max()])
+    np.testing.assert_allclose(fit.y, intercept + slope * ends)
+
+
+def test_sampled_figures_accept_categorical_columns(many_sales):
+    explorer = DataExplorer(many_sales)
+    fig = explorer._sampled_figure('scatter', 'region', 'amount')
+    # Sampled points only: no fit line or mean marker for a text axis
+    assert len(fig.data) == 1 and len(fig.data[0].x) == 1_000
+    assert set(fig.data[0].x) == {'north', 'south', 'east'}
+
+    fig = explorer._sampled_figure('box', 'region')
+    assert fig.data[0].type == 'box' and len(fig.data[0].y) == len(many_sales)
+
+
+def test_sampled_box_uses_exact_quartiles_per_group(many_sales):
+    fig = DataExplorer(many_sales)._sampled_figure('box', 'amount', by='region')
+    summary = fig.data[0]
+    expected = many_sales.groupby('region')['amount'].quantile([0.25, 0.5, 0.75]).unstack()
+    np.testing.assert_allclose(summary.q1, expected[0.25])
+    np.testing.assert_allclose(summary.median, expected[0.5])
+    np.testing.assert_allclose(summary.q3, expected[0.75])
+    counts = many_sales['region'].value_counts()
+    assert list(summary.x) == [f"{key} (n={counts[key]:,})" for key in expected.index]
@@ -0,0 +1,114 @@
+import re
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_science_utils import ColumnIndex, FilterEngine
+
+
+@pytest.fixture
+def df():
+    rng = np.random.default_rng(1)
+    n = 5_000
+    frame = pd.DataFrame({
+        'amount': rng.gamma(2, 200, n).round(2),
+        'hour': rng.integers(0, 24, n),
+        'location_risk': rng.choice(['Low', 'Medium', 'High'], n),
+        'merchant': rng.choice(['Acme Corp', 'Beta LLC', 'acme outlet', 'Gamma.io'], n),
+        'is_fraud': rng.random(n) < 0.05,
+        'card type': rng.choice(['visa', 'amex'], n),
+    })
+    frame.loc[::50, 'amount'] = np.nan
+    return frame
+
+
+def test_column_index_ranges_match_masks(df):
+    index = ColumnIndex(df['amount'])
+    for text in ['>500', '<=100', '100..200', '=0']:
+        rows = index.query(text)
+        assert np.array_equal(rows, np.flatnonzero(ColumnIndex.match(df['amount'], text)))
+        assert np.all(np.diff(rows) > 0)
+    assert ColumnIndex.parse_range('10..20') == (10.0, 20.0, True, True)
+    assert ColumnIndex.parse_range('>5') == (5.0, None, False, True)
+    with pytest.raises(ValueError):
+        ColumnIndex.parse_range('abc')
+
+
+def test_column_index_contains_and_equality(df):
+    index = ColumnIndex(df['merchant'])
+    assert np.array_equal(index.contains('ACME'), np.flatnonzero(df['merchant'].str.contains('acme', case=False)))
+    assert np.array_equal(index.query('Beta LLC'), np.flatnonzero(df['merchant'] == 'Beta LLC'))
+
+
+@pytest.mark.parametrize('expression, query', [
+    ("amount > 500", "amount > 500"),
+    ("500 < amount", "amount > 500"),
+    ("10 < amount <= 20", "10 < amount <= 20"),
+    ("amount > 500 and location_risk == 'High' and hour in [2, 3, 4]",
+     "amount > 500 and location_risk == 'High' and hour in [2, 3, 4]"),
+    ("hour not in [1, 2] or not is_fraud", "hour not in [1, 2] or not is_fraud"),
+    ("`card type` == 'amex'", "`card type` == 'amex'"),
+    ("amount > hour", "amount > hour"),
+])
+def test_mask_matches_pandas_query(df, expression, query):
+    engine = FilterEngine(df)
+    assert np.array_equal(engine.mask(expression), df.eval(query).to_numpy(dtype=bool))
+
+
+def test_isna_and_bare_column(df):
+    engine = FilterEngine(df)
+    assert np.array_equal(engine.mask("isna(amount)"), df['amount'].isna().to_numpy())
+    assert np.array_equal(engine.mask("notna(amount) and is_fraud"),
+                          (df['amount'].notna() & df['is_fraud']).to_numpy())
+
+
+def test_contains_is_case_insensitive_and_accepts_regex(df):
+    engine = FilterEngine(df)
+    assert np.array_equal(engine.mask("contains(merchant, 'ACME')"),
+                          df['merchant'].str.contains('acme', case=False).to_numpy())
+    assert np.array_equal(engine.mask("contains(merchant, '^acme|llc$')"),
+                          df['merchant'].str.contains('^acme|llc$', case=False).to_numpy())
+    # A dot is a regex wildcard, as with str.contains
+    assert np.array_equal(engine.mask("contains(merchant, 'a.io')"),
+                          df['merchant'].str.contains('a.io', case=False).to_numpy())
+
+
+@pytest.mark.parametrize('expression, message', [
+    ("amount >", "Invalid filter expression"),
+    ("price > 5", "Unknown column: price"),
+    ("foo(amount)", "Unsupported filter expression: foo(amount)"),
+    ("amount @ 3", "Unsupported filter expression: amount @ 3"),
+    ("amount > `hour` + 1", "Expected a literal value, got: `hour` + 1"),
+    ("1 < 2", "needs a column"),
+    ("hour in 3", "needs a list of values"),
+    ("hour in amount", "needs a list of values"),
+    ("contains(merchant)", "Usage: contains(column, 'text')"),
+    ("contains(merchant, '(')", "Invalid pattern"),
+])
+def test_invalid_expressions_raise_value_error(df, expression, message):
+    with pytest.raises(ValueError, match=re.escape(message)):
+        FilterEngine(df).mask(expression)
+
+
+def test_masks_are_memoized_and_read_only(df):
+    engine = FilterEngine(df)
+    first = engine.mask("amount > 500 and hour < 6")
+    misses = engine.misses
+    refined = engine.mask("amount > 500 and hour < 6 and is_fraud")
+    # Only the new predicate is evaluated
+    assert engine.misses == misses + 1
+    assert np.array_equal(refined, first & df['is_fraud'].to_numpy())
+    with pytest.raises(ValueError):
+        first[0] = True
+
+
+def test_in_place_edits_invalidate_masks_and_indexes(df):
+    engine = FilterEngine(df)
+    assert not engine.mask("amount > 1e6").any()
+    assert len(engine.index('merchant').contains('zeta')) == 0
+    df.loc[3, 'amount'] = 2e6
+    df.loc[5, 'merchant'] = 'Zeta'
+    assert np.flatnonzero(engine.mask("amount > 1e6")).tolist() == [3]
+    assert engine.index('merchant').contains('zeta').tolist() == [5]
+    assert engine.mask("contains(merchant, 'zeta')").sum() == 1
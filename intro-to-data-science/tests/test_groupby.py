@@ -0,0 +1,25 @@
+import numpy as np
+import pandas as pd
+
+from data_science_utils import ChunkedGroupBy
+
+
+def test_chunked_groupby_matches_pandas_and_ignores_stale_spills(tmp_path):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({'key': rng.integers(0, 3_000, 60_000), 'v': rng.normal(size=60_000)})
+    # A leftover spill file from another run must not leak into the result
+    pd.DataFrame({'v__sum': [1e9]}, index=pd.Index([0], name='key')).to_pickle(tmp_path / 'part000.pkl')
+    result = ChunkedGroupBy('key', {'v': ['sum', 'count', 'min', 'max']}, max_keys=500,
+                            spill_dir=str(tmp_path)).run(df, chunksize=5_000).sort_index()
+    expected = df.groupby('key')['v'].agg(['sum', 'count', 'min', 'max']).add_prefix('v_')
+    np.testing.assert_allclose(result[expected.columns].to_numpy(dtype=float), expected.to_numpy(dtype=float))
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['part000.pkl']
+
+
+def test_chunked_groupby_without_spilling_matches_mean(tmp_path):
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame({'key': rng.choice(['a', 'b', 'c'], 10_000), 'v': rng.normal(size=10_000)})
+    result = ChunkedGroupBy('key', {'v': ['mean']}, spill_dir=str(tmp_path)).run(df, chunksize=1_000)
+    expected = df.groupby('key')['v'].mean()
+    np.testing.assert_allclose(result.sort_index()['v_mean'], expected)
+    assert not list(tmp_path.iterdir())
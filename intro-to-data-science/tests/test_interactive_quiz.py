@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+
+from interactive_components import InteractiveQuiz
+
+
+@pytest.fixture
+def quiz():
+    quiz = InteractiveQuiz('Arithmetic')
+    for i in range(25):
+        quiz.add_question(f'{i} + 1 = ?', [str(i), str(i + 1), str(i + 2)], 1, explanation=f'It is {i + 1}.')
+    return quiz
+
+
+def test_paged_quiz_keeps_answers_across_pages(quiz):
+    widget = quiz.create_quiz(page_size=10)
+    *slots, navigation, submit, score = widget.children
+    prev_btn, label, next_btn = navigation.children
+    radios = [slot.children[1] for slot in slots]
+    assert len(slots) == 10 and prev_btn.disabled
+    assert 'Page <b>1</b> of 3' in label.value
+
+    radios[0].index = 1
+    next_btn.click()
+    assert slots[0].children[0].value == '<b>Question 11:</b> 10 + 1 = ?'
+    assert radios[0].index is None
+    radios[0].index = 0
+    next_btn.click()
+    # The last page only uses 5 of the 10 slots
+    assert [slot.layout.display for slot in slots].count('none') == 5 and next_btn.disabled
+    radios[4].index = 1
+    assert '3/25 answered' in label.value
+
+    prev_btn.click()
+    prev_btn.click()
+    assert radios[0].index == 1
+
+    submit.click()
+    assert quiz.user_answers == {0: 1, 10: 0, 24: 1}
+    assert quiz.score == pytest.approx(8.0)
+    assert 'Correct' in slots[0].children[2].value
+    assert '2/25' in score.value
+
+
+def test_single_page_quiz_hides_navigation():
+    quiz = InteractiveQuiz()
+    quiz.add_question('Pick b', ['a', 'b'], 1)
+    widget = quiz.create_quiz()
+    assert widget.children[1].layout.display == 'none'
+    widget.children[0].children[1].index = 0
+    widget.children[2].click()
+    assert quiz.score == 0 and 'Incorrect' in widget.children[0].children[2].value
+
+
+def test_grade_batch_matches_per_student_loops(quiz):
+    rng = np.random.default_rng(0)
+    answers = rng.integers(-1, 3, (200, 25))
+    result = quiz.grade_batch(answers, students=[f's{i}' for i in range(200)])
+    key = np.ones(25, dtype=int)
+
+    students = result['students']
+    assert students.index[0] == 's0'
+    for i in [0, 57, 199]:
+        score = int((answers[i] == key).sum())
+        assert students['score'].iloc[i] == score
+        assert students['answered'].iloc[i] == (answers[i] >= 0).sum()
+        assert students['feedback'].iloc[i] == quiz._get_feedback_message(100 * score / 25)
+
+    items = result['items']
+    np.testing.assert_allclose(items['difficulty'], (answers == key).mean(axis=0))
+    np.testing.assert_allclose(items['omitted'], (answers < 0).mean(axis=0))
+    q = 4
+    rest = (answers == key).sum(axis=1) - (answers[:, q] == key[q])
+    assert items['point_biserial'].iloc[q] == pytest.approx(np.corrcoef(answers[:, q] == key[q], rest)[0, 1])
+    distractors = result['distractors']
+    assert distractors.loc[q + 1].tolist() == pytest.approx([(answers[:, q] == o).mean() for o in range(3)])
+
+
+def test_grade_batch_discrimination_and_key_check(quiz):
+    key = np.ones(25, dtype=int)
+    # Strong students get question 1 right, weak ones don't
+    answers = np.tile(key, (100, 1))
+    answers[50:, :10] = 0
+    answers[50:, 0] = 2
+    items = quiz.grade_batch(answers)['items']
+    assert items.loc[1, 'discrimination'] == pytest.approx(1.0)
+    assert items.loc[20, 'discrimination'] == 0 and np.isnan(items.loc[20, 'point_biserial'])
+    with pytest.raises(ValueError, match='Answer key has 3 entries for 25 questions'):
+        quiz.grade_batch(answers, key=[1, 1, 1])
+    percent = quiz.grade_batch(answers)['students']['percent']
+    assert percent.iloc[0] == 100 and percent.iloc[-1] == 60
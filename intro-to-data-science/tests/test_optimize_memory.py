@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+
+from data_science_utils import DataAnalysisUtils
+
+
+def test_optimize_memory_is_lossless_and_smaller():
+    rng = np.random.default_rng(0)
+    n = 10_000
+    df = pd.DataFrame({
+        'small_int': rng.integers(0, 100, n),
+        'big_int': rng.integers(-2**40, 2**40, n),
+        'halves': rng.integers(0, 200, n) / 2,
+        'precise': rng.normal(size=n),
+        'answer': rng.choice(['Yes', 'no ', 'YES'], n),
+        'maybe': rng.choice(['y', 'n', None], n),
+        'city': rng.choice(['Oslo', 'Lima', 'Pune'], n),
+        'id': [f'id-{i}' for i in range(n)],
+    })
+    optimized, report = DataAnalysisUtils.optimize_memory(df)
+
+    types = optimized.dtypes.astype(str).to_dict()
+    assert types == {
+        'small_int': 'int8', 'big_int': 'int64', 'halves': 'float32', 'precise': 'float64',
+        'answer': 'bool', 'maybe': 'boolean', 'city': 'category', 'id': 'object',
+    }
+    for col in ['small_int', 'big_int', 'halves', 'precise', 'city', 'id']:
+        pd.testing.assert_series_equal(optimized[col].astype(df[col].dtype), df[col])
+    assert optimized['answer'].tolist() == df['answer'].str.strip().str.lower().eq('yes').tolist()
+    assert optimized['maybe'].isna().tolist() == df['maybe'].isna().tolist()
+
+    total = report.set_index('Column').loc['TOTAL']
+    assert total['After (bytes)'] == optimized.memory_usage(deep=True, index=False).sum()
+    assert total['After (bytes)'] < total['Before (bytes)'] / 2
+    # The input frame is left untouched
+    assert df['small_int'].dtype == np.int64
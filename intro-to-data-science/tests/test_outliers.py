@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_science_utils import DataAnalysisUtils
+
+
+@pytest.fixture
+def transactions():
+    rng = np.random.default_rng(0)
+    n = 20_000
+    df = pd.DataFrame({
+        'amount': rng.lognormal(3, 1, n),
+        'items': rng.poisson(3, n).astype('int64'),
+        'score': rng.normal(size=n),
+        'category': rng.choice(['food', 'travel', 'tech'], n),
+    })
+    df.loc[::97, 'score'] = np.nan
+    return df
+
+
+@pytest.mark.parametrize('method', ['iqr', 'zscore'])
+def test_outlier_mask_matches_per_column_detection(transactions, method):
+    columns = ['amount', 'items', 'score']
+    mask = DataAnalysisUtils.detect_outlier_mask(transactions, method=method, batch_columns=2)
+    assert list(mask.columns) == columns
+    assert mask.dtypes.eq(bool).all()
+    for col in columns:
+        expected = DataAnalysisUtils.detect_outliers(transactions, col, method)
+        assert mask.index[mask[col]].equals(expected.index)
+
+    indices = DataAnalysisUtils.detect_outlier_mask(transactions, method=method, as_indices=True)
+    for col in columns:
+        np.testing.assert_array_equal(indices[col], np.flatnonzero(mask[col]))
+
+
+def test_outlier_mask_by_group_uses_group_bounds(transactions):
+    mask = DataAnalysisUtils.detect_outlier_mask(transactions, ['amount'], by='category')
+    bounds = DataAnalysisUtils.outlier_bounds(transactions, ['amount'], by='category')
+    for category, part in transactions.groupby('category'):
+        expected = DataAnalysisUtils.detect_outliers(part, 'amount')
+        assert mask.index[mask['amount'] & (transactions['category'] == category)].equals(expected.index)
+        q1, q3 = part['amount'].quantile([0.25, 0.75])
+        assert tuple(bounds.loc[(category, 'amount')]) == pytest.approx((q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1)))
+
+
+def test_outlier_mask_rejects_unknown_method(transactions):
+    with pytest.raises(ValueError):
+        DataAnalysisUtils.detect_outlier_mask(transactions, method='mad')
+
+
+def test_streaming_zscore_outliers_match_in_memory(transactions, tmp_path):
+    columns = ['amount', 'items', 'score']
+    path = tmp_path / 'transactions.csv'
+    transactions.to_csv(path, index=False)
+    found = pd.concat(DataAnalysisUtils.iter_outliers(str(path), columns, 'zscore', chunksize=3_000))
+
+    mask = DataAnalysisUtils.detect_outlier_mask(transactions, columns, method='zscore')
+    rows, cols = np.nonzero(mask.to_numpy())
+    expected = pd.DataFrame({
+        'row': rows,
+        'column': np.asarray(columns, dtype=object)[cols],
+        'value': transactions[columns].to_numpy(dtype=float)[rows, cols]
+    })
+    key = ['row', 'column']
+    pd.testing.assert_frame_equal(found.sort_values(key).reset_index(drop=True),
+                                  expected.sort_values(key).reset_index(drop=True), check_dtype=False)
+
+
+def test_stream_outliers_writes_csv_close_to_exact_iqr(transactions, tmp_path):
+    path = tmp_path / 'transactions.csv'
+    transactions.to_csv(path, index=False)
+    counts = DataAnalysisUtils.stream_outliers(str(path), ['amount'], str(tmp_path / 'out.csv'), chunksize=4_000)
+    written = pd.read_csv(tmp_path / 'out.csv')
+    assert counts['amount'] == len(written)
+    exact = len(DataAnalysisUtils.detect_outliers(transactions, 'amount'))
+    # t-digest quartiles are approximate
+    assert abs(counts['amount'] - exact) <= 0.05 * exact
+
+
+def test_iter_outliers_refuses_one_shot_iterators(transactions):
+    chunks = (transactions.iloc[i:i + 5_000] for i in range(0, len(transactions), 5_000))
+    with pytest.raises(TypeError):
+        next(DataAnalysisUtils.iter_outliers(chunks, ['amount']))
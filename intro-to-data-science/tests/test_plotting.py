@@ -0,0 +1,119 @@
+import base64
+import os
+
+import numpy as np
+import matplotlib.pyplot as plt
+import pandas as pd
+import plotly.graph_objects as go
+import pytest
+
+from data_science_utils import FigureCache, InteractiveVisualizer, PlottingUtils
+
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(0)
+
+
+def decode(encoded):
+    return np.frombuffer(base64.b64decode(encoded['bdata']), dtype=encoded['dtype'])
+
+
+def test_lttb_keeps_endpoints_and_extremes(rng):
+    x = np.arange(10_000)
+    y = rng.normal(size=10_000)
+    y[4_321] = 50
+    keep = InteractiveVisualizer.lttb_downsample(x, y, 500)
+    assert len(keep) == 500
+    assert keep[0] == 0 and keep[-1] == len(x) - 1
+    assert np.all(np.diff(keep) > 0)
+    assert 4_321 in keep
+    assert len(InteractiveVisualizer.lttb_downsample(x[:10], y[:10], 500)) == 10
+
+
+def test_encode_figure_round_trips_numeric_arrays(rng, monkeypatch):
+    monkeypatch.setattr(InteractiveVisualizer, 'BINARY_ARRAYS', True)
+    y = rng.normal(size=1_000)
+    fig = go.Figure(go.Scatter(x=np.arange(1_000), y=y, text=['a'] * 1_000))
+    trace = InteractiveVisualizer.encode_figure(fig)['data'][0]
+    np.testing.assert_array_equal(decode(trace['y']), y)
+    # int64 is narrowed to int32, which plotly.js can decode
+    assert trace['x']['dtype'] == 'i4'
+    np.testing.assert_array_equal(decode(trace['x']), np.arange(1_000))
+    assert trace['text'] == ['a'] * 1_000
+
+
+def test_encode_figure_falls_back_to_lists_for_old_plotly(monkeypatch):
+    monkeypatch.setattr(InteractiveVisualizer, 'BINARY_ARRAYS', False)
+    fig = go.Figure(go.Scatter(x=np.arange(3), y=np.array([0.5, 1.5, 2.5])))
+    trace = InteractiveVisualizer.encode_figure(fig)['data'][0]
+    assert trace['x'] == [0, 1, 2]
+    assert trace['y'] == [0.5, 1.5, 2.5]
+
+
+def test_time_series_downsamples_and_uses_webgl(rng):
+    n = 50_000
+    df = pd.DataFrame({'t': pd.date_range('2024-01-01', periods=n, freq='min'),
+                       'v': rng.normal(size=n).cumsum()})
+    fig = InteractiveVisualizer.create_time_series(df, 't', 'v', max_points=2_000)
+    assert len(fig.data[0].x) == 2_000
+    assert fig.data[0].x[0] == df['t'].iloc[0] and fig.data[0].x[-1] == df['t'].iloc[-1]
+    assert isinstance(InteractiveVisualizer.scatter_trace(np.arange(n), np.arange(n)), go.Scattergl)
+    assert isinstance(InteractiveVisualizer.scatter_trace(np.arange(10), np.arange(10)), go.Scatter)
+
+
+@pytest.fixture
+def figure_cache(tmp_path, monkeypatch):
+    cache = FigureCache(str(tmp_path / 'figures'), enabled=True)
+    monkeypatch.setattr(PlottingUtils, 'figure_cache', cache)
+    yield cache
+    plt.close('all')
+
+
+def test_figure_cache_is_opt_in_and_per_user(monkeypatch, tmp_path):
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path))
+    cache = FigureCache()
+    assert not cache.enabled
+    assert cache.cache_dir == os.path.join(str(tmp_path), 'ds_bootcamp', 'figures')
+
+
+def test_figure_cache_serves_matplotlib_hits_as_images(figure_cache):
+    data = {'a': 3, 'b': 5}
+    PlottingUtils.create_bar_chart(data, title='Counts')
+    assert (figure_cache.hits, figure_cache.misses) == (0, 1)
+    assert os.stat(figure_cache.cache_dir).st_mode & 0o777 == 0o700
+    assert [p.rsplit('.', 1)[1] for p in os.listdir(figure_cache.cache_dir)] == ['png']
+
+    plt.rcParams['font.size'] = 7
+    fig, ax = PlottingUtils.create_bar_chart(data, title='Counts')
+    assert figure_cache.hits == 1
+    assert isinstance(fig, plt.Figure) and ax.images
+    # The helper's styling side effect still runs on a hit
+    assert plt.rcParams['font.size'] == 12
+
+
+def test_figure_cache_round_trips_plotly_figures(figure_cache):
+    fig = go.Figure(go.Bar(x=['a', 'b'], y=[1, 2]))
+    key = figure_cache.make_key('bar', pd.Series([1, 2]))
+    figure_cache.put(key, fig)
+    assert figure_cache.get(key).data[0].y == (1, 2)
+
+
+@pytest.mark.skipif(not hasattr(os, 'getuid'), reason='POSIX permissions')
+def test_figure_cache_refuses_shared_directory(figure_cache):
+    key = figure_cache.make_key('bar', pd.Series([1, 2]))
+    figure_cache.put(key, go.Figure(go.Bar(y=[1, 2])))
+    os.chmod(figure_cache.cache_dir, 0o777)
+    assert figure_cache.get(key) is None
+    with pytest.warns(UserWarning, match='Figure cache disabled'):
+        figure_cache.put(figure_cache.make_key('bar', pd.Series([3])), go.Figure())
+    assert len(os.listdir(figure_cache.cache_dir)) == 1
+
+
+def test_figure_cache_refuses_symlinked_directory(figure_cache, tmp_path):
+    target = tmp_path / 'elsewhere'
+    target.mkdir(mode=0o700)
+    os.symlink(target, figure_cache.cache_dir)
+    with pytest.warns(UserWarning, match='Figure cache disabled'):
+        figure_cache.put(figure_cache.make_key('bar', pd.Series([1])), go.Figure())
+    assert not list(target.iterdir())
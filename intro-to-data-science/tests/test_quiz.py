@@ -0,0 +1,56 @@
+import json
+import time
+
+import pytest
+
+from data_science_utils import QuizGenerator
+
+
+@pytest.fixture
+def quiz():
+    generator = QuizGenerator()
+    for i in range(5_000):
+        generator.add_question(f"What is {i} + 1?", [str(i), str(i + 1), '<b>none</b>'], 1)
+    return generator
+
+
+def test_widgets_reuse_the_bank_hash_until_it_changes(quiz, monkeypatch):
+    dumps = []
+    original = json.dumps
+    monkeypatch.setattr(json, 'dumps', lambda *args, **kwargs: dumps.append(1) or original(*args, **kwargs))
+    start = time.perf_counter()
+    for i in range(500):
+        html = quiz.create_quiz_widget(i)
+    assert time.perf_counter() - start < 1.0
+    assert len(dumps) == 1
+    assert 'What is 499 + 1?' in html and '&lt;b&gt;none&lt;/b&gt;' in html
+
+    quiz.add_question('New?', ['a', 'b'], 0)
+    assert 'New?' in quiz.create_quiz_widget(5_000)
+    assert len(dumps) == 2
+
+
+def test_direct_bank_edits_are_picked_up(quiz):
+    first = quiz.render_bank(title='Bank')
+    assert quiz.render_bank(title='Bank') is first
+
+    quiz.questions[0] = {'question': 'Replaced?', 'options': ['x', 'y'], 'correct': 0}
+    assert 'Replaced?' in quiz.create_quiz_widget(0)
+    del quiz.questions[1:]
+    assert 'Question 2' not in quiz.render_bank(title='Bank')
+
+    quiz.questions[0]['question'] = 'Edited in place?'
+    quiz.touch()
+    assert 'Edited in place?' in quiz.render_bank(title='Bank')
+
+    quiz.questions = [{'question': 'Fresh bank?', 'options': ['a'], 'correct': 0}]
+    assert 'Fresh bank?' in quiz.create_quiz_widget(0)
+
+
+def test_bank_hash_matches_for_equal_banks(quiz):
+    other = QuizGenerator()
+    other.questions = list(quiz.questions)
+    assert other.bank_hash() == quiz.bank_hash() == quiz.bank_hash(list(quiz.questions))
+    answers = quiz.render_bank(seed=3, include_answers=True)
+    assert answers == other.render_bank(seed=3, include_answers=True)
+    assert answers.count('<li>') == 5_000
@@ -0,0 +1,112 @@
+import sqlite3
+
+import pytest
+
+from data_science_utils import QuizGenerator, QuizStore
+
+
+QUESTIONS = [
+    {'question': 'What does df.head() show?', 'options': ['First rows', 'Last rows'], 'correct': 0,
+     'topic': 'pandas', 'difficulty': 1},
+    {'question': 'Which plot shows a distribution?', 'options': ['Pie', 'Histogram'], 'correct': 1,
+     'topic': 'viz', 'difficulty': 2, 'explanation': 'Histograms bin values'},
+    {'question': 'What does NaN mean?', 'options': ['Not a Number', 'Null and None'], 'correct': 0},
+]
+
+
+@pytest.fixture
+def store(tmp_path):
+    with QuizStore(str(tmp_path / 'quiz.db'), batch_size=2) as quiz_store:
+        yield quiz_store
+
+
+def test_round_trip(store):
+    ids = store.import_questions(QUESTIONS, topic='basics')
+    assert len(set(ids)) == 3
+    stored = store.get_questions(ids[::-1])
+    assert [q['question'] for q in stored] == [q['question'] for q in QUESTIONS[::-1]]
+    assert stored[1]['options'] == ['Pie', 'Histogram']
+    assert stored[1]['explanation'] == 'Histograms bin values'
+    assert stored[0]['topic'] == 'basics'
+    assert dict(zip(store.topics()['topic'], store.topics()['questions'])) == {'basics': 1, 'pandas': 1, 'viz': 1}
+
+    quiz_id = store.create_quiz('Week 1', question_ids=ids)
+    generator = QuizGenerator()
+    assert store.load_into(generator, quiz_id) == ids
+    assert [q['question'] for q in generator.questions] == [q['question'] for q in QUESTIONS]
+
+
+def test_import_without_topic_is_rejected(store):
+    with pytest.raises(ValueError, match='No topic'):
+        store.import_questions(QUESTIONS)
+
+
+def test_ids_stay_correct_with_a_second_writer(store, tmp_path):
+    first = store.import_questions(QUESTIONS[:1])
+    with QuizStore(str(tmp_path / 'quiz.db')) as other:
+        theirs = other.import_questions(QUESTIONS[1:2])
+    mine = store.import_questions(QUESTIONS[2:], topic='basics')
+    assert len({*first, *theirs, *mine}) == 3
+    assert store.get_questions(mine)[0]['question'] == QUESTIONS[2]['question']
+
+
+def test_attempts_are_graded_and_batched(store):
+    ids = store.import_questions(QUESTIONS, topic='basics')
+    quiz_id = store.create_quiz('Week 1', question_ids=ids)
+    assert store.record_answers(quiz_id, 'alice', {0: 0, 1: 1, 2: 1}) == 3
+    store.add_attempt('bob', ids[0], 0, quiz_id=quiz_id)
+    # Unanswered counts as wrong
+    store.add_attempt('bob', ids[1], quiz_id=quiz_id)
+    scores = store.student_scores(quiz_id).set_index('student')
+    assert scores.loc['alice', 'correct'] == 2
+    assert scores.loc['bob', 'attempts'] == 2 and scores.loc['bob', 'correct'] == 1
+    stats = store.question_stats(quiz_id).set_index('question_id')
+    assert stats.loc[ids[0], 'p_correct'] == 1.0
+
+
+def test_unknown_questions_are_reported(store):
+    ids = store.import_questions(QUESTIONS, topic='basics')
+    with pytest.raises(ValueError, match='9999'):
+        store.record_attempts([('carol', ids[0], 0), ('carol', 9999, 1)])
+    assert store.student_scores().empty
+
+    store.add_attempt('alice', ids[0], 0)
+    with pytest.raises(ValueError, match='9999.*no attempts were written'):
+        # Reaches batch_size, so the queue is flushed
+        store.add_attempt('eve', 9999, 1)
+    # The whole batch was rejected, not half-applied
+    assert store.conn.execute("SELECT COUNT(*) FROM attempts").fetchone()[0] == 0
+    # The valid attempt stays queued and the store is not stuck
+    store.flush()
+    assert store.student_scores()['student'].tolist() == ['alice']
+
+
+def test_close_writes_valid_attempts_and_reports_unknown(tmp_path):
+    path = str(tmp_path / 'quiz.db')
+    store = QuizStore(path)
+    ids = store.import_questions(QUESTIONS, topic='basics')
+    store.add_attempt('alice', ids[0], 0)
+    store.add_attempt('eve', 9999, 1)
+    with pytest.raises(ValueError, match='9999'):
+        store.close()
+    with QuizStore(path) as reopened:
+        assert reopened.student_scores()['student'].tolist() == ['alice']
+
+
+def test_default_database_is_per_user(tmp_path, monkeypatch):
+    monkeypatch.setenv('XDG_DATA_HOME', str(tmp_path))
+    monkeypatch.chdir(tmp_path)
+    with QuizStore() as store:
+        store.import_questions(QUESTIONS, topic='basics')
+    assert (tmp_path / 'ds_bootcamp' / 'quiz_bank.db').exists()
+    assert not (tmp_path / 'quiz_bank.db').exists()
+
+
+def test_store_survives_reopening(tmp_path):
+    path = str(tmp_path / 'quiz.db')
+    with QuizStore(path) as store:
+        ids = store.import_questions(QUESTIONS, topic='basics')
+        store.add_attempt('alice', ids[0], 0)
+    with QuizStore(path) as store:
+        assert store.student_scores()['correct'].tolist() == [1]
+        assert sqlite3.connect(path).execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_science_utils import HyperLogLog, MisraGries, StreamingProfiler, TDigest
+
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(0)
+
+
+def chunks(df, size):
+    return [df.iloc[i:i + size] for i in range(0, len(df), size)]
+
+
+@pytest.mark.parametrize('distinct', [100, 10_000, 200_000])
+def test_hyperloglog_within_error_bound(rng, distinct):
+    sketch = HyperLogLog(precision=14)
+    sketch.update(rng.permutation(np.repeat(np.arange(distinct), 3)))
+    # 4 standard errors of 1.04 / sqrt(2**14)
+    assert abs(sketch.count() - distinct) / distinct < 4 * 1.04 / np.sqrt(2 ** 14)
+
+
+def test_hyperloglog_merge_matches_single_sketch(rng):
+    values = rng.integers(0, 50_000, 100_000)
+    whole, left, right = HyperLogLog(12), HyperLogLog(12), HyperLogLog(12)
+    whole.update(values)
+    left.update(values[:60_000])
+    right.update(values[60_000:])
+    assert left.merge(right).count() == whole.count()
+    with pytest.raises(ValueError):
+        left.merge(HyperLogLog(10))
+
+
+def test_tdigest_quantiles_within_one_percent_rank(rng):
+    values = rng.lognormal(size=200_000)
+    digest = TDigest()
+    for part in np.array_split(values, 20):
+        digest.update(part)
+    qs = np.array([0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99])
+    estimates = digest.quantile(qs)
+    ranks = np.searchsorted(np.sort(values), estimates) / len(values)
+    assert np.all(np.abs(ranks - qs) < 0.01)
+    assert digest.quantile(0) == values.min() and digest.quantile(1) == values.max()
+
+
+def test_tdigest_merge_and_nan_handling(rng):
+    values = rng.normal(size=50_000)
+    a, b = TDigest(), TDigest()
+    a.update(np.r_[values[:25_000], np.nan])
+    b.update(values[25_000:])
+    merged = a.merge(b)
+    assert merged.count == len(values)
+    assert abs(merged.quantile(0.5) - np.median(values)) < 0.02
+    assert np.isnan(TDigest().quantile(0.5))
+
+
+def test_misra_gries_keeps_heavy_hitters_within_bound(rng):
+    heavy = np.repeat(['a', 'b', 'c'], [30_000, 20_000, 10_000])
+    noise = rng.integers(0, 100_000, 40_000).astype(str)
+    values = rng.permutation(np.r_[heavy, noise])
+    sketch = MisraGries(k=16)
+    for part in np.array_split(values, 7):
+        sketch.update(part)
+    exact = pd.Series(values).value_counts()
+    top = sketch.top(3)
+    assert list(top.index) == ['a', 'b', 'c']
+    for value, count in top.items():
+        assert exact[value] - sketch.error_bound() <= count <= exact[value]
+
+
+def test_streaming_profile_matches_pandas(rng):
+    df = pd.DataFrame({
+        'x': rng.normal(10, 3, 30_000),
+        'k': rng.choice(list('abcde'), 30_000),
+    })
+    df.loc[::97, 'x'] = np.nan
+    parts = chunks(df, 4_000)
+    sketches = StreamingProfiler.sketch(parts)
+    assert sketches['x'].null_count == df['x'].isna().sum()
+    assert sketches['x'].mean == pytest.approx(df['x'].mean())
+    assert sketches['x'].std == pytest.approx(df['x'].std())
+    assert sketches['k'].unique_count() == 5
+
+    counts, edges = StreamingProfiler.histogram(parts, 'x', bins=20)
+    expected, _ = np.histogram(df['x'].dropna(), bins=edges)
+    assert np.array_equal(counts, expected)
+    pd.testing.assert_series_equal(
+        StreamingProfiler.value_counts(parts, 'k').sort_index(),
+        df['k'].value_counts().sort_index(), check_names=False)
@@ -0,0 +1,168 @@
+import json
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import pytest
+
+from data_science_utils import ExerciseValidator
+
+
+def test_scalar_answers_keep_old_behaviour():
+    assert ExerciseValidator.check_answer(3.004, 3)
+    assert not ExerciseValidator.check_answer(3.1, 3)
+    assert ExerciseValidator.check_answer('mean', 'mean')
+
+
+def test_array_mismatches_are_located():
+    expected = np.linspace(0, 1, 1_000_000)
+    got = expected.copy()
+    got[[5, 77]] += 1
+    ok, message = ExerciseValidator.compare_answer(got, expected)
+    assert not ok
+    assert message.startswith('❌ 2 of 1,000,000 values differ')
+    assert '[5] expected' in message and '[77] expected' in message
+    assert ExerciseValidator.check_answer(expected + 0.001, expected)
+
+
+def test_values_count_by_default_not_dtypes_or_names():
+    assert ExerciseValidator.check_answer(np.array([1, 2, 3]), np.array([1, 2, 3.001]))
+    assert ExerciseValidator.check_answer([0, 1, 2, 3], np.arange(4, dtype=float))
+    assert ExerciseValidator.check_answer(pd.Series([1, 2], name='n'), pd.Series([1.0, 2.0], name='total'))
+    assert not ExerciseValidator.check_answer(np.array(['1', '2']), np.array([1.0, 2.0]))
+
+
+@pytest.mark.parametrize('got, fragment', [
+    (np.arange(4), 'Wrong dtype'),
+    (np.zeros(3), 'Shape differs'),
+    ([0.0, 1.0, 2.0, 3.0], None),
+])
+def test_array_shape_and_strict_dtype_checks(got, fragment):
+    ok, message = ExerciseValidator.compare_answer(got, np.arange(4, dtype=float), check_dtype=True)
+    assert ok is (fragment is None)
+    if fragment:
+        assert fragment in message
+
+
+def test_dataframe_report_and_alignment():
+    expected = pd.DataFrame({'x': [1, 2, 3], 'y': ['a', 'b', 'c'], 'z': [0.5, np.nan, 1.5]})
+    got = expected.copy()
+    got.loc[1, 'y'] = 'B'
+    ok, message = ExerciseValidator.compare_answer(got, expected)
+    assert not ok and "[1, 'y'] expected 'b', got 'B'" in message
+
+    shuffled = expected[['z', 'x', 'y']].iloc[::-1]
+    assert not ExerciseValidator.compare_answer(shuffled, expected)[0]
+    assert ExerciseValidator.compare_answer(shuffled, expected, check_order=False)[0]
+
+    as_float = expected.assign(x=expected['x'] * 1.0)
+    assert ExerciseValidator.compare_answer(as_float, expected)[0]
+    ok, message = ExerciseValidator.compare_answer(as_float, expected, check_dtype=True)
+    assert not ok and 'Wrong dtype: x' in message
+
+
+def test_hash_path_and_value_path_agree():
+    expected = pd.Series([1.0, 2.0, 3.0], name='total')
+    key = ExerciseValidator.content_hash(expected)
+    assert ExerciseValidator.compare_answer(expected.copy(), expected, correct_hash=key) == \
+        (True, '✅ Correct! Exact match.')
+    renamed = expected.rename('sum')
+    for correct_hash in (None, key):
+        # A renamed Series misses the hash and is accepted on its values
+        assert ExerciseValidator.compare_answer(renamed, expected, correct_hash=correct_hash) == (True, '✅ Correct!')
+        ok, message = ExerciseValidator.compare_answer(renamed, expected, check_names=True,
+                                                       correct_hash=correct_hash)
+        assert not ok and 'name differs' in message
+    # Within tolerance but not identical: hash misses, value path accepts
+    assert ExerciseValidator.check_answer(expected + 0.001, expected, correct_hash=key)
+
+
+def test_validate_code_ignores_comments_and_strings():
+    code = (
+        "import pandas as pd\n"
+        "# df.groupby('a') would go here\n"
+        "label = 'for each plt.plot('\n"
+        "def clean(df):\n"
+        "    return df.dropna().mean()\n"
+        "for x in range(3):\n"
+        "    df = pd.read_csv('f.csv', sep=',')\n"
+    )
+    ok, message = ExerciseValidator.validate_code(
+        code, ['import pandas', 'def clean', 'for', '.mean()', 'pd.read_csv(', 'sep=', 'dropna'])
+    assert ok, message
+    ok, message = ExerciseValidator.validate_code(code, ['groupby', 'plt.plot(', 'while'])
+    assert message == '❌ Missing elements: groupby, plt.plot(, while'
+    ok, message = ExerciseValidator.validate_code('x = (', ['x'])
+    assert not ok and 'Syntax error on line 1' in message
+
+
+@pytest.mark.parametrize('code, fragment', [
+    ("result = df[df['x'] > 5]", 'df['),
+    ("df['y'] = df['x'].apply(lambda v: v*2)", '.apply(lambda'),
+    ("df.loc[df['x'] > 0, 'y']", 'df.loc['),
+    ("total = sum(x for x in range(10))", 'sum(x for'),
+    ('print(f"rows: {len(df)}")', 'len(df)'),
+    ('print(f"{df.shape[0]:>{width}} rows")', 'df.shape[0]'),
+])
+def test_partial_fragments_match_tokens(code, fragment):
+    ok, message = ExerciseValidator.validate_code(code, [fragment])
+    assert ok, message
+
+
+@pytest.mark.parametrize('code, fragment', [
+    ('print("rows: {len(df)}")', 'len(df)'),
+    ("# df[df['x'] > 5]\nresult = df", 'df['),
+    ("df['x'].map(lambda v: v)", '.apply(lambda'),
+])
+def test_fragments_in_plain_strings_and_comments_do_not_match(code, fragment):
+    assert not ExerciseValidator.validate_code(code, [fragment])[0]
+
+
+def test_validate_folder(tmp_path):
+    (tmp_path / 'good.py').write_text("import numpy as np\nprint(np.mean([1, 2]))\n")
+    (tmp_path / 'bad.py').write_text("# import numpy as np\n")
+    notebook = {'cells': [{'cell_type': 'code', 'source': ['%matplotlib inline\n', 'import numpy as np\n']}]}
+    (tmp_path / 'nb.ipynb').write_text(json.dumps(notebook))
+    result = ExerciseValidator.validate_folder(str(tmp_path), ['import numpy'], workers=1)
+    passed = dict(zip(result['file'].str.rsplit('/', n=1).str[-1], result['passed']))
+    assert passed == {'bad.py': False, 'good.py': True, 'nb.ipynb': True}
+
+
+def test_figure_json_matches_live_grading():
+    labelled = px.scatter(x=[1, 2], y=[3, 4], title='T', labels={'x': 'a', 'y': 'b'})
+    for fig in (labelled, go.Figure()):
+        assert ExerciseValidator.grade_figure_json(json.loads(fig.to_json())) == \
+            ExerciseValidator.grade_visualization(fig)
+    assert ExerciseValidator.grade_figure_json({'data': [{}], 'layout': {'title': 'short form'}})[0] == 50
+
+
+def test_malformed_figures_do_not_abort_the_batch(tmp_path):
+    px.bar(x=['a'], y=[1], title='ok').write_json(str(tmp_path / 'ok.json'))
+    for i, doc in enumerate([{'data': 5}, {'layout': 'x'}, {'layout': {'xaxis': 3}}]):
+        (tmp_path / f'bad{i}.json').write_text(json.dumps(doc))
+    (tmp_path / 'broken.json').write_text('{')
+    result = ExerciseValidator.grade_visualizations(str(tmp_path), workers=2)
+    assert len(result) == 5
+    bad = result[~result['file'].str.endswith('ok.json')]
+    assert (bad['score'] == 0).all()
+    assert bad['feedback'].map(lambda f: f[0].startswith('✗ Could not read figure')).all()
+    assert result.loc[result['file'].str.endswith('ok.json'), 'score'].item() == 100
+
+
+def test_every_plotly_output_of_a_notebook_is_graded(tmp_path):
+    figures = [px.line(x=[1, 2], y=[2, 1], title='Trend', labels={'x': 'day', 'y': 'sales'}), go.Figure()]
+    outputs = [{'output_type': 'display_data', 'data': {ExerciseValidator.PLOTLY_MIME: json.loads(fig.to_json())}}
+               for fig in figures]
+    notebook = {'cells': [
+        {'cell_type': 'code', 'source': 'fig.show()', 'outputs': outputs},
+        {'cell_type': 'code', 'source': 'print(1)', 'outputs': [{'output_type': 'stream', 'text': '1'}]},
+        {'cell_type': 'markdown', 'source': 'notes'},
+    ]}
+    (tmp_path / 'plots.ipynb').write_text(json.dumps(notebook))
+    (tmp_path / 'empty.ipynb').write_text(json.dumps({'cells': []}))
+    result = ExerciseValidator.grade_visualizations(str(tmp_path), workers=1)
+    plots = result[result['file'].str.endswith('plots.ipynb')]
+    assert plots['figure'].tolist() == [0, 1]
+    assert plots['score'].tolist() == [ExerciseValidator.grade_visualization(fig)[0] for fig in figures]
+    assert result.loc[result['file'].str.endswith('empty.ipynb'), 'feedback'].item() == ['✗ No figure found']